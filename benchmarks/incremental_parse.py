@@ -0,0 +1,67 @@
+"""Reparse time after editing one function, with and without a FormCache.
+
+Builds a contract of ``--functions`` functions, parses it once through a
+FormCache, then edits one function in the middle (adding a line, so every
+later form moves) and times ``parse_src`` of the edited source with no cache
+and with the warm cache.
+
+Run from the repository root, so ``dasy`` is importable:
+
+    python -m benchmarks.incremental_parse [--functions 200] [--number 5]
+"""
+
+import argparse
+import timeit
+
+from dasy.parser import parse_src
+from dasy.parser.context import ParseContext
+from dasy.parser.incremental import FormCache
+
+FUNCTION = """
+(defn f{i} [:uint256 x] :uint256 :external
+  (defvar acc :uint256 x)
+  (for [j (range 8)]
+    (if (> acc {i})
+      (set acc (- acc 1))
+      (+= acc j)))
+  (return (* acc 2)))
+"""
+
+
+def contract(functions: int, edited: int = -1) -> str:
+    parts = ["(defvar total :uint256)\n"]
+    for i in range(functions):
+        body = FUNCTION.format(i=i)
+        if i == edited:
+            body = body.replace("(return", "\n  (+= acc 1)\n  (return")
+        parts.append(body)
+    return "".join(parts)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--functions", type=int, default=200)
+    ap.add_argument("--number", type=int, default=5)
+    args = ap.parse_args()
+
+    src = contract(args.functions)
+    edited = contract(args.functions, edited=args.functions // 2)
+    cache = FormCache()
+    parse_src(src, context=ParseContext(form_cache=cache))
+
+    def parse(form_cache=None):
+        parse_src(edited, context=ParseContext(form_cache=form_cache))
+
+    full = timeit.timeit(parse, number=args.number) / args.number
+    incremental = timeit.timeit(lambda: parse(cache), number=args.number)
+    incremental /= args.number
+    lines = edited.count("\n")
+    print(f"{lines} lines, {args.functions} functions, one edited")
+    print(f"  full parse        {full * 1000:8.1f} ms")
+    print(
+        f"  incremental parse {incremental * 1000:8.1f} ms ({full / incremental:.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
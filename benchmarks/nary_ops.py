@@ -0,0 +1,63 @@
+"""Lowering cost of n-ary arithmetic and chained comparisons.
+
+``(+ x1 ... xn)`` used to be rewritten into nested two-operand expressions,
+copying every suffix of the operand list, and reparsed level by level;
+``(< x1 ... xn)`` was rewritten into an ``and`` form and reparsed. Both are
+now lowered to Vyper nodes in one pass over the operands. This times the old
+suffix-copying rewrite on its own next to the full parse of each expression.
+
+Run from the repository root, so ``dasy`` is importable:
+
+    python -m benchmarks.nary_ops [--sizes 1000 10000]
+"""
+
+import argparse
+import time
+
+from hy import models
+
+from dasy.parser import parse_src
+
+
+def suffix_copy_chain(expr):
+    """The rewrite ``chain_binops`` performed before direct lowering.
+
+    It recursed once per operand, copying the remaining operands into a new
+    expression each time; the copies are reproduced here without recursion.
+    """
+    op = expr[0]
+    suffixes = [models.Expression((op, *expr[i:])) for i in range(1, len(expr) - 1)]
+    subtree = suffixes[-1]
+    for suffix in reversed(suffixes[:-1]):
+        subtree = models.Expression((op, suffix[1], subtree))
+    return subtree
+
+
+def contract(op: str, n: int, ret: str) -> str:
+    operands = " ".join(["x"] * n)
+    return f"(defn f [:uint256 x] {ret} :external (return ({op} {operands})))"
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000])
+    args = ap.parse_args()
+
+    parse_src(contract("+", 2, ":uint256"))  # load the builtin macros
+    print(f"{'operands':>10}{'rewrite':>12}{'(+ ...)':>12}{'(< ...)':>12}")
+    for n in args.sizes:
+        expr = models.Expression([models.Symbol("+")] + [models.Symbol("x")] * n)
+        rewrite = timed(lambda: suffix_copy_chain(expr))
+        arith = timed(lambda: parse_src(contract("+", n, ":uint256")))
+        compare = timed(lambda: parse_src(contract("<", n, ":bool")))
+        print(f"{n:>10}{rewrite:>11.3f}s{arith:>11.3f}s{compare:>11.3f}s")
+
+
+if __name__ == "__main__":
+    main()
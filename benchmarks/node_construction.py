@@ -0,0 +1,80 @@
+"""Vyper node construction throughput through ``build_node``.
+
+``build_node`` used to call the node class with the fields as keyword
+arguments and then walk the field values to link children. It now goes
+through a constructor built once per node class. This times the previous
+scheme, reproduced below, next to the current ``build_node`` for a few
+representative node shapes.
+
+Run from the repository root, so ``dasy`` is importable:
+
+    python -m benchmarks.node_construction [--number 20000]
+"""
+
+import argparse
+import timeit
+
+from vyper.ast import nodes as vy_nodes
+
+from dasy.parser.utils import build_node, next_nodeid
+
+
+def set_parent_children(parent, children):
+    for n in children:
+        if isinstance(n, list):
+            set_parent_children(parent, n)
+        elif isinstance(n, vy_nodes.VyperNode):
+            parent._children.append(n)
+            n._parent = parent
+    return parent
+
+
+def old_build_node(node_class, **kwargs):
+    """What ``build_node`` did before per-class constructors."""
+    node_id = kwargs.pop("node_id", next_nodeid())
+    node = node_class(node_id=node_id, ast_type=node_class.__name__, **kwargs)
+    return set_parent_children(node, kwargs.values())
+
+
+SHAPES = {
+    "Name": lambda build: build(vy_nodes.Name, id="x"),
+    "BinOp": lambda build: build(
+        vy_nodes.BinOp,
+        left=build(vy_nodes.Name, id="a"),
+        op=build(vy_nodes.Add),
+        right=build(vy_nodes.Int, value=1),
+    ),
+    "Call": lambda build: build(
+        vy_nodes.Call,
+        func=build(vy_nodes.Name, id="f"),
+        args=[build(vy_nodes.Name, id="a"), build(vy_nodes.Name, id="b")],
+        keywords=[],
+    ),
+    "If": lambda build: build(
+        vy_nodes.If,
+        test=build(vy_nodes.Name, id="c"),
+        body=[build(vy_nodes.Pass)],
+        orelse=[],
+    ),
+}
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--number", type=int, default=20000)
+    args = ap.parse_args()
+
+    print(f"{'shape':>8} {'before':>12} {'after':>12} {'speedup':>8}  (nodes/s)")
+    for shape, make in SHAPES.items():
+        count = len(list(make(build_node).get_descendants(include_self=True)))
+        before = timeit.timeit(lambda: make(old_build_node), number=args.number)
+        after = timeit.timeit(lambda: make(build_node), number=args.number)
+        rate = count * args.number
+        print(
+            f"{shape:>8} {rate / before:>12,.0f} {rate / after:>12,.0f}"
+            f" {before / after:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Per-expression dispatch overhead of ``parse_expr``.
+
+Compares the handler-table lookup against the previous scheme, which built a
+``parse_<head>`` name and probed four modules with ``hasattr`` for every
+expression, and times parsing a large synthetic contract end to end.
+
+Run from the repository root, so ``dasy`` is importable:
+
+    python -m benchmarks.parse_dispatch [--functions N]
+"""
+
+import argparse
+import time
+import timeit
+
+from hy import models
+
+from dasy.builtin import functions
+from dasy.parser import core, macros, nodes, parse
+from dasy.parser.reader import iter_forms
+
+
+def synthetic_contract(n_functions: int) -> str:
+    parts = ["(defvars counter (public :uint256) owner (public :address))"]
+    for i in range(n_functions):
+        parts.append(f"""
+(defn f{i} [:uint256 x] :uint256 :external
+  (def y :uint256 (+ x {i}))
+  (if (> y 10) (set self/counter y) (pass))
+  (for [j :uint256 (range 4)] (+= y j))
+  (assert (!= msg/sender (empty :address)))
+  (return (* y 2)))""")
+    return "\n".join(parts)
+
+
+def probe_lookup(cmd_str):
+    """The lookup parse_expr used to perform before calling a handler."""
+    if cmd_str in nodes.handlers:
+        return nodes.handlers[cmd_str]
+    node_fn = f"parse_{cmd_str}"
+    for ns in [nodes, core, macros, functions]:
+        if hasattr(ns, node_fn):
+            return getattr(ns, node_fn)
+    return None
+
+
+def table_lookup(cmd_str):
+    return parse.EXPR_HANDLERS.get(cmd_str)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--functions", type=int, default=300)
+    args = ap.parse_args()
+
+    src = synthetic_contract(args.functions)
+    heads = []
+
+    def collect(form):
+        if isinstance(form, models.Expression) and form:
+            heads.append(str(form[0]))
+            for sub in form:
+                collect(sub)
+
+    for form in iter_forms(src):
+        collect(form)
+    heads = [parse.ALIASES.get(h, h) for h in heads]
+    # operators are handled before the handler lookup
+    heads = [h for h in heads if not parse.is_op(h)]
+
+    n = 20
+    for name, fn in (("probe", probe_lookup), ("table", table_lookup)):
+        seconds = timeit.timeit(lambda: [fn(h) for h in heads], number=n)
+        per_expr = seconds / (n * len(heads)) * 1e9
+        print(f"{name:<6} lookup: {per_expr:8.1f} ns/expression")
+
+    parse.parse_src(synthetic_contract(1))  # load the builtin macros
+    start = time.perf_counter()
+    parse.parse_src(src)
+    elapsed = time.perf_counter() - start
+    print(f"parse_src: {args.functions} functions in {elapsed:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
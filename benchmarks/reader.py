@@ -0,0 +1,67 @@
+"""Reading time of the native reader against Hy's reader.
+
+Reads every example contract and a large synthetic contract with both
+readers and reports the best of several runs.
+
+Run from the repository root, so ``dasy`` is importable:
+
+    python -m benchmarks.reader [--functions N] [--repeat N]
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+from dasy.parser.reader import read_many
+
+EXAMPLES = Path(__file__).resolve().parent.parent / "examples"
+
+
+def synthetic_contract(n_functions: int) -> str:
+    parts = ["(defvars counter (public :uint256) owner (public :address))"]
+    for i in range(n_functions):
+        parts.append(f"""
+;; function {i}
+(defn f{i} [:uint256 x] :uint256 :external
+  (def y :uint256 (+ x {i}))
+  (if (> y 10) (set self/counter y) (pass))
+  (for [j :uint256 (range 4)] (+= y j))
+  (assert (!= msg/sender (empty :address)) "not allowed")
+  (return (* y 2)))""")
+    return "\n".join(parts)
+
+
+def best_of(repeat, fn):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--functions", type=int, default=500)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    sources = {
+        "examples": [p.read_text() for p in sorted(EXAMPLES.glob("*.dasy"))],
+        f"{args.functions} functions": [synthetic_contract(args.functions)],
+    }
+    print(f"{'input':<16}{'hy':>10}{'native':>10}{'speedup':>10}")
+    for label, srcs in sources.items():
+        times = {}
+        for reader in ("hy", "native"):
+            times[reader] = best_of(
+                args.repeat, lambda: [read_many(s, reader=reader) for s in srcs]
+            )
+        print(
+            f"{label:<16}{times['hy'] * 1000:>8.1f}ms{times['native'] * 1000:>8.1f}ms"
+            f"{times['hy'] / times['native']:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Scaling of parse_src on long operator chains and long conditionals.
+
+``(+ x x ...)`` lowers to a right-nested BinOp chain and ``(cond ...)`` to an
+if/else chain as deep as it has clauses, both of which used to be parsed by
+recursion. Each size is timed and the per-element cost reported, which should
+stay flat as the sizes grow.
+
+Run from the repository root, so ``dasy`` is importable:
+
+    python -m benchmarks.stress_nesting [--operands N] [--clauses N]
+"""
+
+import argparse
+import time
+
+from dasy.parser import parse_src
+
+
+def operator_chain(n: int) -> str:
+    return (
+        "(defn f [:uint256 x] :uint256 :external\n"
+        f"  (return (+ {' '.join(['x'] * n)})))"
+    )
+
+
+def cond_chain(n: int) -> str:
+    clauses = " ".join(f"(== x {i}) {i}" for i in range(n))
+    return (
+        "(defn f [:uint256 x] :uint256 :external\n"
+        f"  (return (cond {clauses} :else 0)))"
+    )
+
+
+def run(label, build, sizes):
+    for n in sizes:
+        src = build(n)
+        start = time.perf_counter()
+        parse_src(src)
+        elapsed = time.perf_counter() - start
+        print(f"{label:<10}{n:>8}{elapsed:>10.3f}s{elapsed / n * 1e6:>10.1f} us/elem")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--operands", type=int, default=10_000)
+    ap.add_argument("--clauses", type=int, default=1_000)
+    args = ap.parse_args()
+
+    parse_src(operator_chain(2))  # load the builtin macros
+    run("operands", operator_chain, [args.operands // 10, args.operands])
+    run("clauses", cond_chain, [args.clauses // 10, args.clauses])
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,52 @@
-import hy
-from hy import read, read_many
-from dasy.compiler import compile, compile_file
-from dasy.main import main
-from dasy.parser.output import get_external_interface
-from .parser import parse
-from .parser.parse import parse_src, parse_node
-from .parser.compat import parse_node_compat, parse_expr_compat
-
-# Provide backwards-compatible versions at the module level
-parse_node_legacy = parse_node_compat
-parse_expr_legacy = parse_expr_compat
+"""Dasy: a lisp for the EVM, compiled through Vyper.
+
+The public API is resolved lazily (PEP 562) so that ``import dasy`` does not
+pull in hy, vyper or the parser until one of these names is first used.
+"""
+
+import importlib
 
 __version__ = "0.1.29"
+
+# public name -> (module, attribute); attribute None means the module itself
+_LAZY_ATTRS = {
+    "hy": ("hy", None),
+    "read": ("hy", "read"),
+    "read_many": ("hy", "read_many"),
+    "compile": ("dasy.compiler", "compile"),
+    "compile_file": ("dasy.compiler", "compile_file"),
+    "compile_many": ("dasy.build", "compile_many"),
+    "compile_async": ("dasy.aio", "compile_async"),
+    "compile_file_async": ("dasy.aio", "compile_file_async"),
+    "AsyncCompiler": ("dasy.aio", "AsyncCompiler"),
+    "main": ("dasy.main", "main"),
+    "get_external_interface": ("dasy.parser.output", "get_external_interface"),
+    "parse": ("dasy.parser.parse", None),
+    "parse_src": ("dasy.parser.parse", "parse_src"),
+    "parse_src_iter": ("dasy.parser.parse", "parse_src_iter"),
+    "parse_node": ("dasy.parser.parse", "parse_node"),
+    "FormCache": ("dasy.parser.incremental", "FormCache"),
+    "parse_node_compat": ("dasy.parser.compat", "parse_node_compat"),
+    "parse_expr_compat": ("dasy.parser.compat", "parse_expr_compat"),
+    # Provide backwards-compatible versions at the module level
+    "parse_node_legacy": ("dasy.parser.compat", "parse_node_compat"),
+    "parse_expr_legacy": ("dasy.parser.compat", "parse_expr_compat"),
+}
+
+
+def __getattr__(name):
+    # submodules, e.g. dasy.compiler, resolve without importing them first
+    module_name, attr = _LAZY_ATTRS.get(name, (f"dasy.{name}", None))
+    try:
+        module = importlib.import_module(module_name)
+    except ModuleNotFoundError as e:
+        if name in _LAZY_ATTRS or e.name != module_name:
+            raise
+        raise AttributeError(f"module 'dasy' has no attribute '{name}'") from None
+    value = module if attr is None else getattr(module, attr)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
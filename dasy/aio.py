@@ -0,0 +1,200 @@
+"""Asyncio front end to the compiler.
+
+Compilations run on an executor, so awaiting them never blocks the event
+loop:
+
+    artifacts = await dasy.compile_async(src, formats=("abi", "bytecode"))
+
+    async with AsyncCompiler(executor="process", max_concurrency=4) as c:
+        results = await asyncio.gather(*(c.compile_file(p) for p in paths))
+
+Cancelling the awaiting task, or running past ``timeout``, also stops the
+worker: queued work is dropped and a running compilation raises at its next
+step (see dasy.cancellation), freeing the thread or process for the next
+request. ``max_concurrency`` bounds the compilations in flight; further
+requests wait for a slot holding nothing but their arguments.
+
+Results are the requested output formats, as from
+``dasy.compiler.compile_artifacts``, so they can come back from a worker
+process.
+"""
+
+import asyncio
+import os
+import time
+import weakref
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional, Sequence, Union
+
+from dasy.cancellation import StopToken, stop_token
+from dasy.exceptions import DasyUsageError
+
+
+def _compile_worker(
+    token: StopToken,
+    src: Optional[str],
+    name: Optional[str],
+    filepath: Optional[str],
+    formats: Optional[Sequence[str]],
+    use_cache: bool,
+) -> dict:
+    from dasy import compiler
+    from dasy.cache import ArtifactCache
+
+    with stop_token(token):
+        token.check()
+        if src is None:
+            src = Path(filepath).read_text()
+        return compiler.compile_artifacts(
+            src,
+            name=name or (Path(filepath).stem if filepath else "DasyContract"),
+            filepath=filepath,
+            formats=tuple(formats or compiler.CACHED_FORMATS),
+            cache=ArtifactCache() if use_cache else None,
+        )
+
+
+class AsyncCompiler:
+    """Compiles on an executor without blocking the event loop.
+
+    ``executor`` is ``"thread"``, ``"process"`` or an Executor. Pools created
+    here have ``max_workers`` workers and are shut down by ``close()``; a
+    given Executor is left to its owner, and is taken to run work in this
+    process unless it is a ProcessPoolExecutor. ``max_concurrency``
+    defaults to the number of workers.
+    """
+
+    def __init__(
+        self,
+        executor: Union[str, Executor] = "thread",
+        max_workers: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+        use_cache: bool = False,
+    ):
+        if isinstance(executor, Executor):
+            self._executor = executor
+            self._owns_executor = False
+        elif executor in ("thread", "process"):
+            max_workers = max_workers or os.cpu_count() or 1
+            pool = ThreadPoolExecutor if executor == "thread" else ProcessPoolExecutor
+            self._executor = pool(max_workers=max_workers)
+            self._owns_executor = True
+        else:
+            raise DasyUsageError(
+                f"executor must be 'thread', 'process' or an Executor, not {executor!r}"
+            )
+        self._in_process = not isinstance(self._executor, ProcessPoolExecutor)
+        self.max_concurrency = max_concurrency or max_workers or os.cpu_count() or 1
+        self.use_cache = use_cache
+        self._manager = None
+        # asyncio primitives belong to one event loop
+        self._slots = weakref.WeakKeyDictionary()
+
+    def _slot(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        slot = self._slots.get(loop)
+        if slot is None:
+            slot = self._slots[loop] = asyncio.Semaphore(self.max_concurrency)
+        return slot
+
+    def _new_event(self):
+        if self._in_process:
+            import threading
+
+            return threading.Event()
+        if self._manager is None:
+            import multiprocessing
+
+            self._manager = multiprocessing.Manager()
+        return self._manager.Event()
+
+    async def _run(self, timeout, *args) -> dict:
+        deadline = None if timeout is None else time.time() + timeout
+        async with self._slot():
+            token = StopToken(self._new_event(), deadline)
+            future = self._executor.submit(_compile_worker, token, *args)
+            try:
+                return await asyncio.wrap_future(future)
+            except asyncio.CancelledError:
+                # dropped if still queued, otherwise stops at its next step
+                future.cancel()
+                token.cancel()
+                raise
+
+    async def compile(
+        self,
+        src: str,
+        name: str = "DasyContract",
+        filepath: Optional[str] = None,
+        formats: Optional[Sequence[str]] = None,
+        timeout: Optional[float] = None,
+    ) -> dict:
+        """Compile ``src`` into ``formats`` (default: the cached formats).
+
+        Raises ``asyncio.TimeoutError`` once ``timeout`` seconds, counted
+        from this call, have passed.
+        """
+        return await asyncio.wait_for(
+            self._run(timeout, src, name, filepath, formats, self.use_cache), timeout
+        )
+
+    async def compile_file(
+        self,
+        filepath: str,
+        formats: Optional[Sequence[str]] = None,
+        timeout: Optional[float] = None,
+    ) -> dict:
+        """Compile the file at ``filepath``; it is read by the worker."""
+        return await asyncio.wait_for(
+            self._run(timeout, None, None, str(filepath), formats, self.use_cache),
+            timeout,
+        )
+
+    def close(self, wait: bool = True) -> None:
+        if self._owns_executor:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+        if self._manager is not None:
+            self._manager.shutdown()
+            self._manager = None
+
+    async def __aenter__(self) -> "AsyncCompiler":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
+
+
+_default_compiler: Optional[AsyncCompiler] = None
+
+
+def default_compiler() -> AsyncCompiler:
+    """The thread-pool AsyncCompiler used when none is given."""
+    global _default_compiler
+    if _default_compiler is None:
+        _default_compiler = AsyncCompiler()
+    return _default_compiler
+
+
+async def compile_async(
+    src: str,
+    name: str = "DasyContract",
+    filepath: Optional[str] = None,
+    formats: Optional[Sequence[str]] = None,
+    timeout: Optional[float] = None,
+    compiler: Optional[AsyncCompiler] = None,
+) -> dict:
+    """Compile ``src`` off the event loop; see ``AsyncCompiler.compile``."""
+    compiler = compiler or default_compiler()
+    return await compiler.compile(src, name, filepath, formats, timeout)
+
+
+async def compile_file_async(
+    filepath: str,
+    formats: Optional[Sequence[str]] = None,
+    timeout: Optional[float] = None,
+    compiler: Optional[AsyncCompiler] = None,
+) -> dict:
+    """Compile the file at ``filepath`` off the event loop."""
+    compiler = compiler or default_compiler()
+    return await compiler.compile_file(filepath, formats, timeout)
@@ -0,0 +1,330 @@
+"""Batch compilation of many contracts (``dasy build`` and ``compile_many``).
+
+Sources are discovered from directories, files or glob patterns and compiled
+across a process pool. Each worker imports the compiler once and keeps its
+include!/interface! caches warm for every contract it handles.
+
+``compile_many`` is the Python entry point: it streams results back in
+completion order and keeps its worker processes alive between calls, so a
+script compiling batch after batch only pays for warming them once.
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import threading
+import time
+from collections.abc import Mapping
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    as_completed,
+    wait,
+)
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+from dasy.exceptions import DasyUsageError
+
+SOURCE_SUFFIXES = (".dasy", ".vy")
+
+DEFAULT_BUILD_FORMATS = (
+    "bytecode",
+    "bytecode_runtime",
+    "abi",
+    "layout",
+    "external_interface",
+)
+
+
+@dataclass
+class BuildResult:
+    path: str
+    ok: bool
+    seconds: float
+    output: Optional[str] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class CompileResult:
+    key: Any
+    ok: bool
+    seconds: float
+    outputs: Optional[dict] = None
+    error: Optional[str] = None
+
+
+def discover_sources(patterns: Iterable[str], missing_ok: bool = False) -> List[Path]:
+    """Expand directories and glob patterns into a list of source files.
+
+    A pattern that matches nothing is an error unless ``missing_ok``.
+    """
+    found = []
+    for pattern in patterns:
+        p = Path(pattern)
+        if p.is_dir():
+            candidates = sorted(
+                c for suffix in SOURCE_SUFFIXES for c in p.rglob(f"*{suffix}")
+            )
+        elif p.is_file():
+            candidates = [p]
+        else:
+            candidates = sorted(Path(g) for g in glob.glob(pattern, recursive=True))
+            if not candidates and not missing_ok:
+                raise DasyUsageError(f"No sources match '{pattern}'")
+        found.extend(c for c in candidates if c.suffix in SOURCE_SUFFIXES)
+    # drop duplicates while keeping discovery order
+    return list(dict.fromkeys(found))
+
+
+def artifact_path(source: Path, out_dir: Path) -> Path:
+    return out_dir / f"{source.name}.json"
+
+
+def write_artifacts(source: Path, out_dir: Path, artifacts: dict) -> Path:
+    target = artifact_path(source, out_dir)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_text(json.dumps(artifacts, indent=2, default=str))
+    return target
+
+
+def format_result(result: BuildResult) -> str:
+    if result.ok:
+        return f"ok    {result.path} ({result.seconds:.2f}s)"
+    return f"FAIL  {result.path} ({result.seconds:.2f}s): {result.error}"
+
+
+def build_one(
+    path: str,
+    out_dir: str,
+    formats: Sequence[str],
+    use_cache: bool = True,
+    form_cache=None,
+    dependencies: Optional[set] = None,
+) -> BuildResult:
+    """Compile one file and write its artifacts. Never raises."""
+    start = time.perf_counter()
+    result = compile_one(path, None, path, formats, use_cache, form_cache, dependencies)
+    if not result.ok:
+        return BuildResult(path, False, time.perf_counter() - start, error=result.error)
+    try:
+        target = write_artifacts(Path(path), Path(out_dir), result.outputs)
+    except Exception as e:
+        return BuildResult(
+            path, False, time.perf_counter() - start, error=f"{type(e).__name__}: {e}"
+        )
+    return BuildResult(path, True, time.perf_counter() - start, output=str(target))
+
+
+def build_project(
+    sources: Sequence[Path],
+    out_dir: str,
+    formats: Sequence[str] = DEFAULT_BUILD_FORMATS,
+    jobs: Optional[int] = None,
+    use_cache: bool = True,
+) -> Iterable[BuildResult]:
+    """Compile ``sources`` into ``out_dir``, yielding results as they finish.
+
+    ``jobs`` defaults to the number of CPUs; ``jobs=1`` compiles in-process.
+    """
+    targets = {}
+    for src in sources:
+        target = artifact_path(src, Path(out_dir))
+        other = targets.setdefault(target, src)
+        if other != src:
+            raise DasyUsageError(f"{src} and {other} would both write {target}")
+
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(sources) <= 1:
+        for src in sources:
+            yield build_one(str(src), out_dir, formats, use_cache)
+        return
+
+    with ProcessPoolExecutor(max_workers=min(jobs, len(sources))) as pool:
+        futures = [
+            pool.submit(build_one, str(src), out_dir, formats, use_cache)
+            for src in sources
+        ]
+        for fut in as_completed(futures):
+            yield fut.result()
+
+
+def compile_one(
+    key: Any,
+    src: Optional[str],
+    filepath: Optional[str],
+    formats: Sequence[str],
+    use_cache: bool = True,
+    form_cache=None,
+    dependencies: Optional[set] = None,
+) -> CompileResult:
+    """Compile ``src``, or the file at ``filepath`` if it is None. Never raises.
+
+    ``form_cache`` and ``dependencies`` are passed on to
+    :func:`dasy.compiler.compile_artifacts`.
+    """
+    from dasy import compiler
+    from dasy.cache import ArtifactCache
+
+    start = time.perf_counter()
+    try:
+        if src is None:
+            src = Path(filepath).read_text()
+        outputs = compiler.compile_artifacts(
+            src,
+            name=Path(filepath).stem if filepath else "DasyContract",
+            filepath=filepath,
+            formats=tuple(formats),
+            cache=ArtifactCache() if use_cache else None,
+            form_cache=form_cache,
+            dependencies=dependencies,
+        )
+    except Exception as e:
+        return CompileResult(
+            key, False, time.perf_counter() - start, error=f"{type(e).__name__}: {e}"
+        )
+    return CompileResult(key, True, time.perf_counter() - start, outputs=outputs)
+
+
+_pools: Dict[int, ProcessPoolExecutor] = {}
+_pools_lock = threading.Lock()
+
+
+def _worker_pool(workers: int) -> ProcessPoolExecutor:
+    """A process pool of ``workers`` workers, kept for later batches."""
+    with _pools_lock:
+        pool = _pools.get(workers)
+        if pool is None or getattr(pool, "_broken", False):
+            pool = _pools[workers] = ProcessPoolExecutor(max_workers=workers)
+        return pool
+
+
+def shutdown_workers() -> None:
+    """Stop the worker processes kept by ``compile_many``."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown(cancel_futures=True)
+
+
+def _jobs(items) -> Iterator[tuple]:
+    """(key, src, filepath) for each item given to ``compile_many``."""
+    if isinstance(items, Mapping):
+        for key, src in items.items():
+            yield key, src, None
+        return
+    for index, item in enumerate(items):
+        if isinstance(item, tuple):
+            key, src = item
+            yield key, src, None
+        elif isinstance(item, os.PathLike) or (
+            "\n" not in item and item.endswith(SOURCE_SUFFIXES)
+        ):
+            yield item, None, os.fspath(item)
+        else:
+            yield index, item, None
+
+
+def compile_many(
+    items: Union[Iterable[Union[str, os.PathLike, tuple]], Mapping],
+    workers: Optional[int] = None,
+    formats: Sequence[str] = DEFAULT_BUILD_FORMATS,
+    use_cache: bool = True,
+) -> Iterator[CompileResult]:
+    """Compile every item, yielding a CompileResult for each as it finishes.
+
+    An item is a path (a ``Path``, or a one-line string ending in ``.dasy``
+    or ``.vy``), whose key is the item itself; source text, keyed by its
+    position in ``items``; or a ``(key, source)`` pair. A mapping of keys to
+    sources is also accepted. Failures are reported on their result rather
+    than raised.
+
+    ``items`` is consumed as workers free up, so it can be a generator.
+    ``workers`` defaults to the number of CPUs; ``workers=1`` compiles
+    in-process, in order. Worker processes outlive the call and are reused
+    by the next one with as many workers; ``shutdown_workers`` stops them.
+    """
+    from dasy.main import resolve_formats
+
+    formats = resolve_formats(formats)
+    workers = workers or os.cpu_count() or 1
+    jobs = _jobs(items)
+    if workers == 1:
+        for job in jobs:
+            yield compile_one(*job, formats, use_cache)
+        return
+
+    pool = _worker_pool(workers)
+    pending = set()
+    try:
+        for job in jobs:
+            # keep every worker busy without queueing the whole input
+            if len(pending) >= 2 * workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    yield fut.result()
+            pending.add(pool.submit(compile_one, *job, formats, use_cache))
+        for fut in as_completed(pending):
+            pending.discard(fut)
+            yield fut.result()
+    except BrokenProcessPool:
+        with _pools_lock:
+            if _pools.get(workers) is pool:
+                del _pools[workers]
+        raise
+    finally:
+        for fut in pending:
+            fut.cancel()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    from dasy.main import resolve_formats
+
+    parser = argparse.ArgumentParser(
+        prog="dasy build", description="Compile many contracts in parallel"
+    )
+    parser.add_argument(
+        "paths", nargs="+", help="Directories, files or glob patterns to compile"
+    )
+    parser.add_argument(
+        "-o", "--output-dir", default="out", help="Directory for artifacts"
+    )
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=None, help="Worker processes (default: CPUs)"
+    )
+    parser.add_argument(
+        "-f",
+        "--format",
+        default=",".join(DEFAULT_BUILD_FORMATS),
+        help="Comma-separated output formats to write per contract",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Do not use the artifact cache"
+    )
+    args = parser.parse_args(argv)
+
+    formats = resolve_formats(args.format.split(","))
+    sources = discover_sources(args.paths)
+    if not sources:
+        raise DasyUsageError("No .dasy or .vy sources found")
+
+    start = time.perf_counter()
+    failed = 0
+    for result in build_project(
+        sources, args.output_dir, formats, args.jobs, not args.no_cache
+    ):
+        print(format_result(result))
+        if not result.ok:
+            failed += 1
+    total = time.perf_counter() - start
+    print(
+        f"{len(sources) - failed} succeeded, {failed} failed in {total:.2f}s",
+        file=sys.stderr,
+    )
+    return 1 if failed else 0
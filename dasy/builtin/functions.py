@@ -1,7 +1,7 @@
 from vyper.ast import Call, Expr
 import vyper.ast
 
-from dasy import parser
+import dasy
 
 
 def parse_vyper(expr):
@@ -14,7 +14,7 @@ def wrap_calls(nodes):
     new_nodes = []
     for call_node in nodes:
         if isinstance(call_node, Call):
-            expr_node = parser.build_node(Expr, value=call_node)
+            expr_node = dasy.parser.build_node(Expr, value=call_node)
             new_nodes.append(expr_node)
         else:
             new_nodes.append(call_node)
@@ -22,5 +22,5 @@ def wrap_calls(nodes):
 
 
 def parse_splice(expr):
-    return_val = wrap_calls([parser.parse_node_legacy(n) for n in expr[1:]])
+    return_val = wrap_calls([dasy.parser.parse_node_legacy(n) for n in expr[1:]])
     return return_val
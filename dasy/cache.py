@@ -0,0 +1,199 @@
+"""Persistent, content-addressed cache of compiled artifacts.
+
+Entries are keyed by a hash of the contract source, its path and name, and
+the dasy/vyper/hy versions. Each entry also records the content hash of every
+file pulled in through ``include!`` or ``interface!``; a hit is only served
+when all of those files are unchanged.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from importlib.metadata import version as pkg_version, PackageNotFoundError
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Bump when the on-disk entry layout changes
+CACHE_FORMAT_VERSION = 1
+
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+
+_ENTRY_SUFFIX = ".json"
+
+
+def default_cache_dir() -> Path:
+    """Return the cache directory from ``DASY_CACHE_DIR`` or the XDG default."""
+    env_dir = os.environ.get("DASY_CACHE_DIR")
+    if env_dir:
+        return Path(env_dir)
+    xdg = os.environ.get("XDG_CACHE_HOME")
+    base = Path(xdg) if xdg else Path.home() / ".cache"
+    return base / "dasy"
+
+
+def _dist_version(name: str) -> str:
+    try:
+        return pkg_version(name)
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def toolchain_versions() -> Dict[str, str]:
+    """Versions of the packages whose behaviour determines compiler output."""
+    return {name: _dist_version(name) for name in ("dasy", "vyper", "hy")}
+
+
+def hash_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_file(path: str) -> Optional[str]:
+    """Return the sha256 of a file's contents, or None if it cannot be read."""
+    try:
+        with open(path, "rb") as f:
+            return hash_bytes(f.read())
+    except OSError:
+        return None
+
+
+class ArtifactCache:
+    """Size-bounded on-disk LRU cache of compiler artifacts.
+
+    Writes go to a temporary file that is atomically renamed into place, so
+    concurrent builds sharing a cache directory never observe partial entries.
+    Recency is tracked through file modification times.
+    """
+
+    def __init__(
+        self, cache_dir: Optional[os.PathLike] = None, max_size: int = DEFAULT_MAX_SIZE
+    ):
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir()
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+
+    def key(
+        self,
+        src: str,
+        name: str = "DasyContract",
+        filepath: Optional[str] = None,
+        settings: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        material = {
+            "format": CACHE_FORMAT_VERSION,
+            "versions": toolchain_versions(),
+            "name": name,
+            # relative include!/interface! paths resolve against this
+            "path": str(Path(filepath).absolute() if filepath else Path.cwd()),
+            "settings": {k: str(v) for k, v in sorted((settings or {}).items())},
+            "source": hash_bytes(src.encode()),
+        }
+        return hash_bytes(json.dumps(material, sort_keys=True).encode())
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}{_ENTRY_SUFFIX}"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached artifacts for ``key``, or None on a miss.
+
+        Entries whose recorded dependencies have changed are discarded.
+        """
+        path = self._entry_path(key)
+        try:
+            with path.open() as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+
+        for dep, digest in entry.get("dependencies", {}).items():
+            if hash_file(dep) != digest:
+                logger.debug(f"cache entry {key[:12]} stale: {dep} changed")
+                self._remove(path)
+                self.misses += 1
+                return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return entry["artifacts"]
+
+    def put(
+        self, key: str, artifacts: Dict[str, Any], dependencies: Iterable[str] = ()
+    ) -> None:
+        """Store ``artifacts`` under ``key`` and evict old entries if needed."""
+        deps = {}
+        for dep in sorted(set(dependencies)):
+            digest = hash_file(dep)
+            if digest is None:
+                # an unreadable dependency can never be validated; don't cache
+                return
+            deps[dep] = digest
+        entry = {"key": key, "dependencies": deps, "artifacts": artifacts}
+
+        path = self._entry_path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(
+                dir=path.parent, prefix=".tmp-", suffix=_ENTRY_SUFFIX
+            )
+            try:
+                with os.fdopen(fd, "w") as f:
+                    json.dump(entry, f)
+                os.replace(tmp, path)
+            except BaseException:
+                self._remove(Path(tmp))
+                raise
+        except OSError as e:
+            logger.warning(f"Could not write cache entry {path}: {e}")
+            return
+        self.evict()
+
+    def _entries(self):
+        if not self.cache_dir.is_dir():
+            return []
+        entries = []
+        for sub in self.cache_dir.iterdir():
+            if not sub.is_dir():
+                continue
+            for p in sub.iterdir():
+                if p.name.startswith(".tmp-") or p.suffix != _ENTRY_SUFFIX:
+                    continue
+                try:
+                    st = p.stat()
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, p))
+        return entries
+
+    def size(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self) -> None:
+        """Remove least recently used entries until under ``max_size``."""
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_size:
+            return
+        for _, size, p in sorted(entries, key=lambda e: e[0]):
+            self._remove(p)
+            total -= size
+            if total <= self.max_size:
+                break
+
+    def clear(self) -> None:
+        for _, _, p in self._entries():
+            self._remove(p)
+
+    @staticmethod
+    def _remove(path: Path) -> None:
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
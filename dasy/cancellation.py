@@ -0,0 +1,57 @@
+"""Cooperative stopping of a compilation running on a worker.
+
+Python threads can't be killed, so a compilation that may need to stop early
+carries a ``StopToken`` and checks it between steps: before each top-level
+form is read, expanded and parsed, and before each Vyper pipeline stage.
+Nothing is checked unless a token is active on the current thread:
+
+    with stop_token(StopToken(deadline=time.time() + 5)):
+        compiler.compile_artifacts(src)
+
+The token is picklable (given a picklable event, e.g. one from a
+``multiprocessing.Manager``), so the same scheme works in worker processes.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+
+from dasy.exceptions import DasyCompileInterrupted
+
+_thread_local = threading.local()
+
+
+class StopToken:
+    def __init__(self, event: Any = None, deadline: Optional[float] = None):
+        # anything with is_set(): threading.Event or a manager Event proxy
+        self.event = event
+        # time.time() based, so it means the same thing in another process
+        self.deadline = deadline
+
+    def cancel(self) -> None:
+        self.event.set()
+
+    def check(self) -> None:
+        if self.event is not None and self.event.is_set():
+            raise DasyCompileInterrupted("compilation cancelled")
+        if self.deadline is not None and time.time() >= self.deadline:
+            raise DasyCompileInterrupted("compilation timed out")
+
+
+@contextmanager
+def stop_token(token: StopToken) -> Iterator[StopToken]:
+    """Make ``token`` the one checked by compilations on this thread."""
+    previous = getattr(_thread_local, "token", None)
+    _thread_local.token = token
+    try:
+        yield token
+    finally:
+        _thread_local.token = previous
+
+
+def check_stop() -> None:
+    """Raise DasyCompileInterrupted if this thread's compilation should stop."""
+    token = getattr(_thread_local, "token", None)
+    if token is not None:
+        token.check()
@@ -1,4 +1,7 @@
+import json
 import logging
+import threading
+from functools import cached_property
 from pathlib import Path
 from vyper.compiler.output import (
     build_abi_output,
@@ -11,23 +14,73 @@ from vyper.compiler.output import (
     build_layout_output,
     build_opcodes_output,
 )
+from vyper.compiler import OUTPUT_FORMATS as VYPER_OUTPUT_FORMATS
 from vyper.compiler.settings import Settings, anchor_settings
+from dasy.macro.syntax import ExpansionLimits
 from dasy.parser import parse_src
+from dasy.parser.context import ParseContext
+from dasy.parser.incremental import FormCache
+from dasy.parser.reader import default_reader
+from dasy.parser.output import get_external_interface
 from dasy.parser.utils import filename_to_contract_name
+from dasy.cancellation import check_stop
+from dasy.timings import phase
 from vyper.compiler.input_bundle import FileInput
 from vyper.compiler.phases import CompilerData as VyperCompilerData
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+OUTPUT_FORMATS = VYPER_OUTPUT_FORMATS.copy()
+
+OUTPUT_FORMATS["vyper_interface"] = OUTPUT_FORMATS["external_interface"]
+OUTPUT_FORMATS["external_interface"] = get_external_interface
+
+# Formats stored by the artifact cache (see dasy.cache)
+CACHED_FORMATS = (
+    "bytecode",
+    "bytecode_runtime",
+    "abi",
+    "layout",
+    "external_interface",
+    "vyper_interface",
+)
+
 
 from vyper.compiler.phases import CompilerData as VyperCompilerData
 
+# Vyper keeps process-global state while compiling (the settings anchored by
+# anchor_settings, the NodeMetadata journal), so its pipeline stages run one
+# at a time. Dasy's own parsing needs no lock and runs concurrently.
+VYPER_LOCK = threading.RLock()
+
+
+def _timed_phase(name, prop):
+    # wrap one of Vyper's cached pipeline stages so it reports to dasy.timings
+    def wrapped(self):
+        with VYPER_LOCK:
+            check_stop()
+            with phase(name):
+                return prop.func(self)
+
+    wrapped.__name__ = prop.attrname
+    return cached_property(wrapped)
+
 
 class CompilerData(VyperCompilerData):
     def __init__(self, *args, **kwargs):
         VyperCompilerData.__init__(self, *args, **kwargs)
 
+    _resolve_imports = _timed_phase("vyper_imports", VyperCompilerData._resolve_imports)
+    _annotate = _timed_phase("typecheck", VyperCompilerData._annotate)
+    compilation_target = _timed_phase("typecheck", VyperCompilerData.compilation_target)
+    storage_layout = _timed_phase("layout", VyperCompilerData.storage_layout)
+    _ir_output = _timed_phase("ir", VyperCompilerData._ir_output)
+    assembly = _timed_phase("assembly", VyperCompilerData.assembly)
+    assembly_runtime = _timed_phase("assembly", VyperCompilerData.assembly_runtime)
+    bytecode = _timed_phase("bytecode", VyperCompilerData.bytecode)
+    bytecode_runtime = _timed_phase("bytecode", VyperCompilerData.bytecode_runtime)
+
     @property
     def runtime_bytecode(self):
         runtime_bytecode = build_bytecode_runtime_output(self)
@@ -106,30 +159,49 @@ class CompilerData(VyperCompilerData):
         return self._source_map
 
 
+def module_shape(module) -> dict:
+    """Outline of a parsed module: its top-level nodes and their statements.
+
+    ``generate_compiler_data`` logs this at DEBUG level, as JSON in the
+    message and as the ``module_shape`` attribute of the log record.
+    """
+
+    def statement(node):
+        entry = {"type": type(node).__name__}
+        value = getattr(node, "value", None)
+        if value is not None:
+            entry["value"] = type(value).__name__
+        return entry
+
+    return {
+        "type": type(module).__name__,
+        "body": [
+            {
+                "type": type(node).__name__,
+                "name": getattr(node, "name", None),
+                "body": [
+                    statement(child) for child in getattr(node, "body", None) or ()
+                ],
+            }
+            for node in getattr(module, "body", ())
+        ],
+    }
+
+
 def generate_compiler_data(
-    src: str, name="DasyContract", filepath: str = None
+    src: str,
+    name="DasyContract",
+    filepath: str = None,
+    context: ParseContext = None,
 ) -> CompilerData:
-    logger.debug(f"generate_compiler_data: name={name}, filepath={filepath}")
-    (ast, settings) = parse_src(src, filepath)
-
-    # Log AST structure
-    logger.debug(f"Parsed AST type: {type(ast).__name__}")
-    logger.debug(
-        f"AST body length: {len(ast.body) if hasattr(ast, 'body') else 'no body'}"
-    )
-    if hasattr(ast, "body"):
-        for i, node in enumerate(ast.body):
-            logger.debug(
-                f"  Body[{i}]: {type(node).__name__} - {getattr(node, 'name', 'N/A')}"
-            )
-            if hasattr(node, "body") and node.body:
-                for j, child in enumerate(node.body):
-                    logger.debug(f"    Child[{j}]: {type(child).__name__}")
-                    if hasattr(child, "value"):
-                        logger.debug(f"      Value type: {type(child.value).__name__}")
+    ast, settings = parse_src(src, filepath, context=context)
+    if logger.isEnabledFor(logging.DEBUG):
+        shape = module_shape(ast)
+        logger.debug(
+            "Parsed %s: %s", name, json.dumps(shape), extra={"module_shape": shape}
+        )
 
     settings = Settings(**settings)
-    logger.debug(f"Settings: {settings}")
 
     # Create a FileInput object for Vyper 0.4.3
     path = filepath or f"{name}.dasy"
@@ -140,32 +212,53 @@ def generate_compiler_data(
         resolved_path=path,
     )
 
-    logger.debug(f"Created FileInput: path={file_input.path}")
-
-    with anchor_settings(settings):
+    with VYPER_LOCK, anchor_settings(settings):
+        data = CompilerData(file_input, settings=settings)
+        # Override the vyper_module with our parsed AST
+        data.__dict__["vyper_module"] = ast
         try:
-            data = CompilerData(file_input, settings=settings)
-            # Override the vyper_module with our parsed AST
-            data.__dict__["vyper_module"] = ast
-            logger.debug("CompilerData created, attempting to compile bytecode...")
             _ = data.bytecode
-            logger.debug("Bytecode compilation successful")
-            return data
-        except Exception as e:
-            logger.error(f"Compilation error: {type(e).__name__}: {str(e)}")
-            import traceback
-
-            logger.error(f"Traceback:\n{traceback.format_exc()}")
+        except Exception:
+            logger.debug("Compiling %s failed", name, exc_info=True)
             raise
+        return data
 
 
 def compile(
-    src: str, name="DasyContract", include_abi=True, filepath: str = None
+    src: str,
+    name="DasyContract",
+    include_abi=True,
+    filepath: str = None,
+    expansion_limits: ExpansionLimits = None,
+    form_cache: FormCache = None,
 ) -> CompilerData:
-    data = generate_compiler_data(src, name, filepath)
+    """Compile ``src`` into CompilerData.
+
+    With a :class:`dasy.parser.incremental.FormCache`, top-level forms that
+    are unchanged since an earlier compile through the same cache are not
+    expanded or parsed again.
+    """
+    context = None
+    if expansion_limits is not None or form_cache is not None:
+        context = ParseContext(
+            source_path=filepath,
+            source_code=src,
+            expansion_limits=expansion_limits,
+            form_cache=form_cache,
+        )
+    data = generate_compiler_data(src, name, filepath, context=context)
     return data
 
 
+def generate_vyper_compiler_data(src: str, filepath: str) -> CompilerData:
+    """Build CompilerData for a plain Vyper source file."""
+    path = Path(filepath)
+    file_input = FileInput(
+        contents=src, source_id=0, path=path, resolved_path=path.resolve()
+    )
+    return CompilerData(file_input)
+
+
 def compile_file(filepath: str) -> CompilerData:
     path = Path(filepath)
     name = path.stem
@@ -173,9 +266,87 @@ def compile_file(filepath: str) -> CompilerData:
     with path.open() as f:
         src = f.read()
         if filepath.endswith(".vy"):
-            return CompilerData(src, contract_name=filename_to_contract_name(filepath))
+            return generate_vyper_compiler_data(src, filepath)
         return compile(src, name=name, filepath=filepath)
 
 
 def generate_abi(src: str) -> list:
     return compile(src).abi
+
+
+def build_artifacts(data: CompilerData, formats=CACHED_FORMATS) -> dict:
+    """Render each of ``formats`` from ``data``."""
+    with VYPER_LOCK, phase("output"):
+        return {fmt: OUTPUT_FORMATS[fmt](data) for fmt in formats}
+
+
+def cache_settings(
+    expansion_limits: ExpansionLimits = None, reader: str = None
+) -> dict:
+    """Options that change the result of a compile but are not in its source.
+
+    Pragmas are part of the hashed source, so only the expansion limits and
+    the reader are left; the defaults are omitted to keep keys stable.
+    """
+    settings = {}
+    if expansion_limits is not None and expansion_limits != ExpansionLimits():
+        settings["expansion_limits"] = expansion_limits
+    reader = reader or default_reader()
+    if reader != "native":
+        settings["reader"] = reader
+    return settings
+
+
+def compile_artifacts(
+    src: str,
+    name="DasyContract",
+    filepath: str = None,
+    formats=CACHED_FORMATS,
+    cache=None,
+    expansion_limits: ExpansionLimits = None,
+    form_cache: FormCache = None,
+    dependencies: set = None,
+    reader: str = None,
+) -> dict:
+    """Compile ``src`` and return the requested output formats.
+
+    When an :class:`dasy.cache.ArtifactCache` is given and all ``formats`` are
+    cacheable, a warm entry is returned without running the compiler. On a
+    miss every cacheable format is built and stored.
+
+    ``dependencies`` receives the files the compilation read, even when it
+    fails; it is left untouched by a warm cache hit. ``reader`` is "native"
+    or "hy", as for :class:`dasy.parser.context.ParseContext`.
+    """
+    cacheable = cache is not None and set(formats) <= set(CACHED_FORMATS)
+    if cacheable:
+        with phase("cache"):
+            key = cache.key(
+                src, name, filepath, cache_settings(expansion_limits, reader)
+            )
+            artifacts = cache.get(key)
+        if artifacts is not None and set(formats) <= set(artifacts):
+            return {fmt: artifacts[fmt] for fmt in formats}
+
+    context = ParseContext(
+        source_path=filepath,
+        source_code=src,
+        expansion_limits=expansion_limits,
+        reader=reader,
+        form_cache=form_cache,
+    )
+    try:
+        if filepath and filepath.endswith(".vy"):
+            data = generate_vyper_compiler_data(src, filepath)
+        else:
+            data = generate_compiler_data(src, name, filepath, context=context)
+    finally:
+        if dependencies is not None:
+            dependencies.update(context.dependencies)
+    if not cacheable:
+        return build_artifacts(data, formats)
+
+    # round-trip through JSON so cold and warm results have the same shape
+    artifacts = json.loads(json.dumps(build_artifacts(data, CACHED_FORMATS)))
+    cache.put(key, artifacts, context.dependencies)
+    return {fmt: artifacts[fmt] for fmt in formats}
@@ -68,6 +68,29 @@ class DasyCircularDependencyError(DasyCompilationError):
         self.stack = stack
 
 
+class DasyCompileInterrupted(DasyCompilationError):
+    """Raised inside a compilation that was cancelled or ran past its deadline.
+
+    See dasy.cancellation.
+    """
+
+    pass
+
+
+class DasyMacroExpansionError(DasyException):
+    """Raised when macro expansion exceeds its budget.
+
+    Examples:
+    - A syntax-rules macro that expands to itself
+    - Expansion nested deeper than the configured limit
+    """
+
+    def __init__(self, message, macro=None, location=None):
+        super().__init__(message)
+        self.macro = macro
+        self.location = location
+
+
 class DasyNotImplementedError(DasyException):
     """Raised when using features not yet implemented.
 
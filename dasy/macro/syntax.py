@@ -41,10 +41,27 @@ def gensym(prefix: str = "g__") -> models.Symbol:
     return models.Symbol(f"{prefix}{next(_gens)}")
 
 
+@dataclass(frozen=True)
+class ExpansionLimits:
+    """Budget for expanding the macros of one module.
+
+    ``max_steps`` bounds the number of macro calls expanded, ``max_depth``
+    the number of expansions nested along one path of the tree, and
+    ``max_size`` the number of node visits made while expanding. Each node
+    is visited once, plus once more per macro call that rewrites it, so
+    this grows with the expanded output but is not its node count.
+    """
+
+    max_steps: int = 100_000
+    max_depth: int = 10_000
+    max_size: int = 1_000_000
+
+
 class MacroEnv:
-    def __init__(self):
+    def __init__(self, limits: ExpansionLimits | None = None):
         # stack of {str(name) -> transformer}
         self.frames: list[dict[str, Callable]] = [{}]
+        self.limits = limits or ExpansionLimits()
 
     def define(self, name: str, transformer: Callable):
         self.frames[-1][name] = transformer
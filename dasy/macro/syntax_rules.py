@@ -6,7 +6,6 @@ from hy import models
 
 from .syntax import Syntax
 
-
 ELLIPSIS = models.Symbol("...")
 
 
@@ -22,69 +21,193 @@ def _to_syntax(x: Any, scopes) -> Syntax:
     return Syntax(x, scopes)
 
 
+class Bindings:
+    """Pattern variable bindings with an undo log for backtracking.
+
+    ``env`` maps each variable to the syntax objects it matched, in match
+    order. Rather than copying ``env`` before every trial, matchers record a
+    ``mark()`` and ``undo()`` back to it when a trial fails.
+    """
+
+    __slots__ = ("env", "_log")
+
+    def __init__(self):
+        self.env: dict[str, list[Syntax]] = {}
+        self._log: list[str] = []
+
+    def bind(self, name: str, value: Syntax) -> None:
+        self.env.setdefault(name, []).append(value)
+        self._log.append(name)
+
+    def mark(self) -> int:
+        return len(self._log)
+
+    def undo(self, mark: int) -> None:
+        log, env = self._log, self.env
+        while len(log) > mark:
+            name = log.pop()
+            values = env[name]
+            values.pop()
+            if not values:
+                del env[name]
+
+
+# Compiled pattern matchers. ``match`` may leave partial bindings behind when
+# it fails; callers that go on to try alternatives undo to a mark first.
+
+
+class _Var:
+    __slots__ = ("name",)
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def match(self, d, scopes, binds: Bindings) -> bool:
+        binds.bind(self.name, Syntax(d, scopes))
+        return True
+
+
+class _Literal:
+    __slots__ = ("name",)
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def match(self, d, scopes, binds: Bindings) -> bool:
+        return isinstance(d, models.Symbol) and str(d) == self.name
+
+
+class _Atom:
+    __slots__ = ("pattern",)
+
+    def __init__(self, pattern):
+        self.pattern = pattern
+
+    def match(self, d, scopes, binds: Bindings) -> bool:
+        return self.pattern == d
+
+
+class _Seq:
+    """Expression or list pattern, ``items`` being (matcher, repeated) pairs.
+
+    With at most one ellipsis the fixed prefix and suffix lengths determine
+    exactly how many elements the repeated item consumes, so matching is a
+    single left-to-right pass. Patterns with several ellipses fall back to
+    greedy backtracking.
+    """
+
+    __slots__ = (
+        "pattern",
+        "seq_type",
+        "items",
+        "min_len",
+        "max_len",
+        "prefix",
+        "repeat",
+        "suffix",
+    )
+
+    def __init__(self, pattern, seq_type, items):
+        self.pattern = pattern
+        self.seq_type = seq_type
+        self.items = items
+        repeats = [i for i, (_, repeated) in enumerate(items) if repeated]
+        self.min_len = len(items) - len(repeats)
+        self.max_len = None if repeats else self.min_len
+        self.prefix = self.repeat = self.suffix = None
+        if len(repeats) <= 1:
+            split = repeats[0] if repeats else len(items)
+            self.prefix = [m for m, _ in items[:split]]
+            self.repeat = items[split][0] if repeats else None
+            self.suffix = [m for m, _ in items[split + 1 :]]
+
+    def accepts(self, n: int) -> bool:
+        return n >= self.min_len and (self.max_len is None or n <= self.max_len)
+
+    def match(self, d, scopes, binds: Bindings) -> bool:
+        if not isinstance(d, self.seq_type):
+            return self.pattern == d
+        return self.match_items(d, 0, scopes, binds)
+
+    def match_items(self, d, start: int, scopes, binds: Bindings) -> bool:
+        """Match the elements of ``d`` from index ``start`` on."""
+        n = len(d)
+        if not self.accepts(n - start):
+            return False
+        if self.prefix is None:
+            return self._backtrack(0, d, start, scopes, binds)
+        j = start
+        for m in self.prefix:
+            if not m.match(d[j], scopes, binds):
+                return False
+            j += 1
+        if self.repeat is not None:
+            m = self.repeat
+            for j in range(j, n - len(self.suffix)):
+                if not m.match(d[j], scopes, binds):
+                    return False
+            j = n - len(self.suffix)
+        for m in self.suffix:
+            if not m.match(d[j], scopes, binds):
+                return False
+            j += 1
+        return True
+
+    def _backtrack(self, i: int, d, j: int, scopes, binds: Bindings) -> bool:
+        if i == len(self.items):
+            return j == len(d)
+        m, repeated = self.items[i]
+        if not repeated:
+            if j >= len(d) or not m.match(d[j], scopes, binds):
+                return False
+            return self._backtrack(i + 1, d, j + 1, scopes, binds)
+        # find the longest run the repeated item matches, then try it
+        # greedily from the longest, unwinding one element at a time
+        marks = [binds.mark()]
+        k = j
+        while k < len(d):
+            if not m.match(d[k], scopes, binds):
+                binds.undo(marks[-1])
+                break
+            marks.append(binds.mark())
+            k += 1
+        for k in range(k, j - 1, -1):
+            binds.undo(marks[k - j])
+            if self._backtrack(i + 1, d, k, scopes, binds):
+                return True
+        return False
+
+
+def compile_pattern(pattern, literals: set[str]):
+    """Compile a syntax-rules pattern into a matcher."""
+    if isinstance(pattern, models.Symbol):
+        name = str(pattern)
+        return _Literal(name) if name in literals else _Var(name)
+    if _is_expr(pattern) or _is_list(pattern):
+        items = []
+        p_seq = list(pattern)
+        i = 0
+        while i < len(p_seq):
+            repeated = i + 1 < len(p_seq) and p_seq[i + 1] == ELLIPSIS
+            items.append((compile_pattern(p_seq[i], literals), repeated))
+            i += 2 if repeated else 1
+        seq_type = models.Expression if _is_expr(pattern) else models.List
+        return _Seq(pattern, seq_type, items)
+    return _Atom(pattern)
+
+
 def match(pattern, stx: Syntax, literals: set[str], scopes, binds=None):
     """Return env dict or None.
 
     Supports matching expressions and lists, with ellipses and identifier literals.
     """
-    if binds is None:
-        binds = {}
-    p = pattern
-    d = stx.datum
-
-    # identifier literal or variable
-    if isinstance(p, models.Symbol):
-        ps = str(p)
-        if ps in literals:
-            return binds if (isinstance(d, models.Symbol) and str(d) == ps) else None
-        # variable bind (matches any datum)
-        binds.setdefault(ps, []).append(_to_syntax(d, stx.scopes))
-        return binds
-
-    # helper to match sequences with backtracking for ellipses
-    def _match_seq(p_seq, d_seq, i, j, binds_local):
-        # reached end of pattern
-        if i >= len(p_seq):
-            return binds_local if j == len(d_seq) else None
-        # ellipsis case on next element
-        if i + 1 < len(p_seq) and p_seq[i + 1] == ELLIPSIS:
-            subpat = p_seq[i]
-            # Try greedily from the end to reduce backtracking
-            for k in range(len(d_seq), j - 1, -1):
-                trial = {k2: v.copy() for k2, v in binds_local.items()}
-                ok = True
-                jj = j
-                while jj < k:
-                    r = match(
-                        subpat, Syntax(d_seq[jj], stx.scopes), literals, scopes, trial
-                    )
-                    if r is None:
-                        ok = False
-                        break
-                    jj += 1
-                if not ok:
-                    continue
-                res = _match_seq(p_seq, d_seq, i + 2, jj, trial)
-                if res is not None:
-                    return res
-            return None
-        # regular element
-        if j >= len(d_seq):
-            return None
-        trial = {k2: v.copy() for k2, v in binds_local.items()}
-        r = match(p_seq[i], Syntax(d_seq[j], stx.scopes), literals, scopes, trial)
-        if r is None:
-            return None
-        return _match_seq(p_seq, d_seq, i + 1, j + 1, trial)
-
-    # sequence patterns (Expression or List)
-    if (_is_expr(p) and _is_expr(d)) or (_is_list(p) and _is_list(d)):
-        p_seq = list(p)
-        d_seq = list(d)
-        return _match_seq(p_seq, d_seq, 0, 0, binds)
-
-    # atoms must be equal
-    return binds if p == d else None
+    b = Bindings()
+    if binds:
+        for name, values in binds.items():
+            b.env[name] = list(values)
+    if not compile_pattern(pattern, literals).match(stx.datum, stx.scopes, b):
+        return None
+    return b.env
 
 
 def substitute(template, binds, scopes):
@@ -136,51 +259,85 @@ def substitute(template, binds, scopes):
     return template
 
 
+class _Rule:
+    __slots__ = ("head", "full", "stripped", "template")
+
+    def __init__(self, pattern, template, literals: set[str]):
+        self.template = template
+        self.full = compile_pattern(pattern, literals)
+        # a pattern that repeats the macro name is matched with the head
+        # stripped, so the name is not bound as a variable
+        self.head = None
+        self.stripped = None
+        if (
+            _is_expr(pattern)
+            and len(pattern) > 0
+            and isinstance(pattern[0], models.Symbol)
+        ):
+            self.head = str(pattern[0])
+            self.stripped = compile_pattern(
+                models.Expression(list(pattern[1:])), literals
+            )
+
+
 class SyntaxRulesMacro:
     def __init__(self, literals, rules):
         self.literals = set(str(x) for x in literals)
         # each rule is (pattern_expr, template_expr)
         self.rules = rules
+        self._compiled = [_Rule(pat, tmpl, self.literals) for pat, tmpl in rules]
+        # (head, arity) -> [(matcher, start, template)] of rules that can match
+        self._index: dict[tuple[str | None, int], list] = {}
+        # heads other than these match like no head at all, and arities
+        # past every pattern's minimum length have the same candidates, so
+        # both are folded into the key to keep the index bounded
+        self._heads = {rule.head for rule in self._compiled} - {None}
+        self._max_arity = 1 + max(
+            (
+                start + matcher.min_len
+                for rule in self._compiled
+                for matcher, start in ((rule.full, 0), (rule.stripped, 1))
+                if isinstance(matcher, _Seq)
+            ),
+            default=0,
+        )
+
+    def _candidates(self, form, head):
+        if head not in self._heads:
+            head = None
+        key = (head, min(len(form), self._max_arity))
+        candidates = self._index.get(key)
+        if candidates is None:
+            candidates = []
+            for rule in self._compiled:
+                if head is not None and rule.head == head:
+                    matcher, start = rule.stripped, 1
+                else:
+                    matcher, start = rule.full, 0
+                if isinstance(matcher, _Seq) and not matcher.accepts(len(form) - start):
+                    continue
+                candidates.append((matcher, start, rule.template))
+            self._index[key] = candidates
+        return candidates
 
     def __call__(self, call_stx: Syntax, env):
         form = call_stx.datum
         scopes = call_stx.scopes
-        head = None
-        if (
-            isinstance(form, models.Expression)
-            and len(form) > 0
-            and isinstance(form[0], models.Symbol)
-        ):
-            head = str(form[0])
-        for pat, tmpl in self.rules:
-            # Prefer matching with macro head stripped to avoid binding it as a variable
-            p = pat
-            d = form
-            if (
-                isinstance(pat, models.Expression)
-                and len(pat) > 0
-                and isinstance(pat[0], models.Symbol)
-                and head is not None
-                and str(pat[0]) == head
-            ):
-                p = models.Expression(list(pat[1:]))
-                d = models.Expression(list(form[1:]))
-            binds = match(p, Syntax(d, scopes), self.literals, scopes)
-            # Fallback: if pattern/data are single nested expressions and no binds captured,
-            # try matching inner expressions to support patterns like ((a op b)).
-            if (
-                binds is not None
-                and isinstance(p, models.Expression)
-                and isinstance(d, models.Expression)
-                and len(p) == 1
-                and len(d) == 1
-                and isinstance(p[0], models.Expression)
-                and isinstance(d[0], models.Expression)
-                and (not binds or len(binds.keys()) == 0)
-            ):
-                nested = match(p[0], Syntax(d[0], scopes), self.literals, scopes)
-                if nested is not None:
-                    binds = nested
-            if binds is not None:
-                return substitute(tmpl, binds, scopes)
+        if not _is_expr(form):
+            candidates = [(r.full, 0, r.template) for r in self._compiled]
+        else:
+            head = (
+                str(form[0])
+                if len(form) > 0 and isinstance(form[0], models.Symbol)
+                else None
+            )
+            candidates = self._candidates(form, head)
+        for matcher, start, template in candidates:
+            binds = Bindings()
+            if start:
+                ok = matcher.match_items(form, start, scopes, binds)
+            else:
+                ok = matcher.match(form, scopes, binds)
+            if ok:
+                return substitute(template, binds.env, scopes)
         raise Exception("no syntax-rules pattern matched")
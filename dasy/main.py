@@ -1,15 +1,20 @@
-from dasy import compiler
-from vyper.compiler import OUTPUT_FORMATS as VYPER_OUTPUT_FORMATS
 import argparse
+import json
 import sys
 import logging
 import difflib
+import importlib
+import os
 from importlib.metadata import version as pkg_version, PackageNotFoundError
+from typing import Iterable, List, Optional, Sequence
 
-from dasy.parser.output import get_external_interface
 from dasy.exceptions import DasyUsageError
 
-format_help = """Format to print, one or more of:
+# The compiler (hy, vyper, the parser) is imported only once a compile is
+# actually requested, so --version, --help and --server stay cheap.
+
+format_help = """Format to print, or a comma-separated list of formats to print
+as one JSON object compiled once. One or more of:
 bytecode (default) - Deployable bytecode
 bytecode_runtime   - Bytecode at runtime
 abi                - ABI in JSON format
@@ -18,7 +23,8 @@ source_map         - Vyper source map
 method_identifiers - Dictionary of method signature to method identifier
 userdoc            - Natspec user documentation
 devdoc             - Natspec developer documentation
-combined_json      - All of the above format options combined as single JSON output
+combined_json      - The bytecode, ABI, layout, source map, docs and interface
+                     formats combined as single JSON output
 layout             - Storage layout of a Vyper contract
 ast                - AST in JSON format
 external_interface - External (Dasy) interface of a contract, used for outside contract calls
@@ -31,22 +37,232 @@ hex-ir             - Output IR and assembly constants in hex instead of decimal
 no-optimize        - Do not optimize (don't use this for production code)
 """
 
-OUTPUT_FORMATS = VYPER_OUTPUT_FORMATS.copy()
+TRANSLATE_MAP = {
+    "abi_python": "abi",
+    "json": "abi",
+    "ast": "ast_dict",
+    "ir_json": "ir_dict",
+    "interface": "external_interface",
+}
+
+
+def format_names() -> set:
+    """Names of OUTPUT_FORMATS, without importing the Dasy compiler."""
+    from vyper.compiler import OUTPUT_FORMATS as VYPER_OUTPUT_FORMATS
+
+    return set(VYPER_OUTPUT_FORMATS) | {"vyper_interface", "external_interface"}
+
+
+def __getattr__(name):
+    # OUTPUT_FORMATS used to be defined here; it now lives in dasy.compiler
+    if name == "OUTPUT_FORMATS":
+        from dasy.compiler import OUTPUT_FORMATS
+
+        return OUTPUT_FORMATS
+    raise AttributeError(f"module 'dasy.main' has no attribute '{name}'")
+
+
+def resolve_format(fmt: str) -> str:
+    """Map a user-supplied format name to a key of OUTPUT_FORMATS."""
+    names = format_names()
+    output_format = TRANSLATE_MAP.get(fmt, fmt)
+    if output_format in names:
+        return output_format
+    # Accept aliases and canonical names at input
+    valid_inputs = names | set(TRANSLATE_MAP.keys())
+    # Provide helpful suggestions
+    suggestions = difflib.get_close_matches(fmt, list(valid_inputs), n=3)
+    msg = (
+        f"Unrecognized output format '{fmt}'.\n"
+        f"Valid options: {', '.join(sorted(valid_inputs))}."
+    )
+    if suggestions:
+        msg += f"\nDid you mean: {', '.join(suggestions)}?"
+    raise DasyUsageError(msg)
+
+
+# What -f combined_json expands to: Vyper's combined_json plus the Dasy interface
+COMBINED_JSON_FORMATS = (
+    "bytecode",
+    "bytecode_runtime",
+    "blueprint_bytecode",
+    "abi",
+    "layout",
+    "source_map",
+    "source_map_runtime",
+    "method_identifiers",
+    "userdoc",
+    "devdoc",
+    "settings_dict",
+    "external_interface",
+)
+
+
+def resolve_formats(fmts: Iterable[str]) -> List[str]:
+    """Resolve format names, expanding ``combined_json`` and dropping repeats."""
+    formats = []
+    for fmt in fmts:
+        fmt = fmt.strip()
+        if fmt == "combined_json":
+            formats.extend(COMBINED_JSON_FORMATS)
+        elif fmt:
+            formats.append(resolve_format(fmt))
+    if not formats:
+        raise DasyUsageError("No output format given")
+    return list(dict.fromkeys(formats))
+
+
+def wants_json(fmts: Sequence[str]) -> bool:
+    """Whether the formats given to -f are printed as one JSON object."""
+    names = [f.strip() for f in fmts if f.strip()]
+    return len(names) > 1 or "combined_json" in names
+
+
+def write_outputs(outputs: dict, as_json: bool, path: Optional[str] = None) -> None:
+    """Print ``outputs``, or write them to ``path``."""
+    if as_json:
+        text = json.dumps(outputs, indent=2, default=str)
+    else:
+        # a single format, printed as it always has been
+        (text,) = outputs.values()
+        if not isinstance(text, str):
+            # in the shape the artifact cache returns it, so a cached and a
+            # fresh compile print the same
+            try:
+                text = json.loads(json.dumps(text))
+            except (TypeError, ValueError):
+                pass
+    if path is None:
+        print(text)
+        return
+    with open(path, "w") as f:
+        print(text, file=f)
+
+
+# --max-expansion-* flag dests -> ExpansionLimits fields
+EXPANSION_LIMIT_FLAGS = {
+    "max_expansion_steps": "max_steps",
+    "max_expansion_depth": "max_depth",
+    "max_expansion_size": "max_size",
+}
+
+
+def expansion_overrides(args) -> dict:
+    """The macro expansion limits given on the command line."""
+    return {
+        field: getattr(args, dest)
+        for dest, field in EXPANSION_LIMIT_FLAGS.items()
+        if getattr(args, dest) is not None
+    }
+
+
+# `dasy <command> ...` is routed to the named module's main(argv)
+SUBCOMMANDS = {
+    "build": "dasy.build",
+    "serve": "dasy.server",
+    "watch": "dasy.watch",
+}
+
+
+def compile_via_server(args, fmts):
+    from dasy import server
+
+    payload = {"formats": [f.strip() for f in fmts if f.strip()]}
+    settings = {}
+    if args.evm_version:
+        settings["evm_version"] = args.evm_version
+    overrides = expansion_overrides(args)
+    if overrides:
+        settings["expansion_limits"] = overrides
+    if args.reader:
+        settings["reader"] = args.reader
+    if args.no_cache:
+        settings["no_cache"] = True
+    if settings:
+        payload["settings"] = settings
+    if args.filename != "":
+        payload["path"] = os.path.abspath(args.filename)
+    else:
+        payload["source"] = sys.stdin.read()
+        payload["name"] = "StdIn"
+    response = server.request(payload, args.server or None)
+    if not response["ok"]:
+        sys.exit(f"{response['type']}: {response['error']}")
+    write_outputs(response["outputs"], wants_json(fmts), args.output)
+
+
+def compile_and_print(args, formats, as_json=False):
+    """Compile once and write every format in ``formats``."""
+    from dasy import compiler
+    from dasy.cache import ArtifactCache
+    from dasy.macro.syntax import ExpansionLimits
+
+    overrides = expansion_overrides(args)
+    limits = ExpansionLimits(**overrides) if overrides else None
+
+    src = ""
+    if args.filename != "":
+        with open(args.filename, "r") as f:
+            src = f.read()
+        if args.filename.endswith(".vy"):
+            data = compiler.generate_vyper_compiler_data(src, args.filename)
+            write_outputs(compiler.build_artifacts(data, formats), as_json, args.output)
+            return
+        # Allow CLI to override EVM version via pragma appended last (wins over earlier pragmas)
+        if args.evm_version:
+            src = src + f"\n(pragma :evm-version {args.evm_version})\n"
+        name = args.filename.split(".")[0]
+        # Pass the filepath so macros like include! resolve relative paths correctly
+        filepath = args.filename
+    else:
+        for line in sys.stdin:
+            src += line
+        if args.evm_version:
+            src = src + f"\n(pragma :evm-version {args.evm_version})\n"
+        name = "StdIn"
+        filepath = None
 
-OUTPUT_FORMATS["vyper_interface"] = OUTPUT_FORMATS["external_interface"]
-OUTPUT_FORMATS["external_interface"] = get_external_interface
+    # all formats are rendered from a single CompilerData, or from one
+    # cache entry when they are all cacheable
+    outputs = compiler.compile_artifacts(
+        src,
+        name=name,
+        filepath=filepath,
+        formats=tuple(formats),
+        cache=None if args.no_cache else ArtifactCache(),
+        expansion_limits=limits,
+        reader=args.reader,
+    )
+    write_outputs(outputs, as_json, args.output)
 
 
 def main():
+    if len(sys.argv) > 1 and sys.argv[1] in SUBCOMMANDS:
+        command = importlib.import_module(SUBCOMMANDS[sys.argv[1]])
+        sys.exit(command.main(sys.argv[2:]))
+
     parser = argparse.ArgumentParser(
         prog="dasy",
         description="Lispy Smart Contract Language for the EVM",
+        epilog=(
+            "Commands:\n"
+            "  dasy build PATH... [-o OUT] [-j N]   compile many contracts\n"
+            "  dasy serve [--socket PATH]           run a warm compile server\n"
+            "  dasy watch PATH... [-o OUT]          rebuild contracts as they change"
+        ),
         formatter_class=argparse.RawTextHelpFormatter,
     )
     parser.add_argument("filename", type=str, nargs="?", default="")
     parser.add_argument(
         "-f", "--format", help=format_help, default="bytecode", dest="format"
     )
+    parser.add_argument(
+        "-o",
+        "--output",
+        default=None,
+        metavar="FILE",
+        help="Write the output to FILE instead of stdout",
+    )
     parser.add_argument(
         "--list-formats",
         action="store_true",
@@ -58,6 +274,54 @@ def main():
         default=None,
         help="Override EVM version (e.g., cancun, paris)",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not read or write the artifact cache (location: $DASY_CACHE_DIR)",
+    )
+    parser.add_argument(
+        "--server",
+        nargs="?",
+        const="",
+        default=None,
+        metavar="SOCKET",
+        help="Compile through a running `dasy serve` ($DASY_SERVER_SOCKET)",
+    )
+    parser.add_argument(
+        "--timings",
+        nargs="?",
+        const="table",
+        choices=["table", "json"],
+        default=None,
+        help="Print per-phase compile timings to stderr (table or json)",
+    )
+    parser.add_argument(
+        "--reader",
+        choices=["native", "hy"],
+        default=None,
+        help="Reader for Dasy source (default: $DASY_READER, else native)",
+    )
+    parser.add_argument(
+        "--max-expansion-steps",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Fail if more than N macro calls are expanded (default 100000)",
+    )
+    parser.add_argument(
+        "--max-expansion-depth",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Fail if macro expansions nest deeper than N (default 10000)",
+    )
+    parser.add_argument(
+        "--max-expansion-size",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Fail if expansion visits more than N nodes (default 1000000)",
+    )
     parser.add_argument(
         "--verbose", action="store_true", help="Enable verbose logging (DEBUG)"
     )
@@ -70,8 +334,6 @@ def main():
         ver = "unknown"
     parser.add_argument("--version", action="version", version=f"dasy {ver}")
 
-    src = ""
-
     args = parser.parse_args()
 
     # Configure logging based on verbosity flags
@@ -84,54 +346,31 @@ def main():
 
     # List formats and exit if requested
     if args.list_formats:
-        for key in sorted(OUTPUT_FORMATS.keys()):
+        for key in sorted(format_names()):
             print(key)
         return
 
-    if args.filename != "":
-        with open(args.filename, "r") as f:
-            src = f.read()
-            # Allow CLI to override EVM version via pragma appended last (wins over earlier pragmas)
-            if args.evm_version and not args.filename.endswith(".vy"):
-                src = src + f"\n(pragma :evm-version {args.evm_version})\n"
-            if args.filename.endswith(".vy"):
-                data = compiler.CompilerData(
-                    src, contract_name=args.filename.split("/")[-1].split(".")[0]
-                )
-            else:
-                # Pass the filepath so macros like include! resolve relative paths correctly
-                data = compiler.compile(
-                    src, name=args.filename.split(".")[0], filepath=args.filename
-                )
-    else:
-        for line in sys.stdin:
-            src += line
-        if args.evm_version:
-            src = src + f"\n(pragma :evm-version {args.evm_version})\n"
-        data = compiler.compile(src, name="StdIn")
-
-    translate_map = {
-        "abi_python": "abi",
-        "json": "abi",
-        "ast": "ast_dict",
-        "ir_json": "ir_dict",
-        "interface": "external_interface",
-    }
-    # Accept aliases and canonical names at input
-    valid_inputs = set(OUTPUT_FORMATS.keys()) | set(translate_map.keys())
-    output_format = translate_map.get(args.format, args.format)
-    if output_format in OUTPUT_FORMATS:
-        print(OUTPUT_FORMATS[output_format](data))
-    else:
-        # Provide helpful suggestions
-        suggestions = difflib.get_close_matches(args.format, list(valid_inputs), n=3)
-        msg = (
-            f"Unrecognized output format '{args.format}'.\n"
-            f"Valid options: {', '.join(sorted(valid_inputs))}."
-        )
-        if suggestions:
-            msg += f"\nDid you mean: {', '.join(suggestions)}?"
-        raise DasyUsageError(msg)
+    fmts = args.format.split(",")
+    if args.server is not None:
+        if args.timings is not None:
+            raise DasyUsageError(
+                "--timings cannot be used with --server: the compile runs in "
+                "the server process"
+            )
+        # the server validates the formats; keep the client free of vyper imports
+        return compile_via_server(args, fmts)
+
+    formats = resolve_formats(fmts)
+    as_json = wants_json(fmts)
+
+    if args.timings is None:
+        return compile_and_print(args, formats, as_json)
+    from dasy.timings import collect_timings
+
+    with collect_timings() as timings:
+        compile_and_print(args, formats, as_json)
+    report = timings.to_json() if args.timings == "json" else timings.format_table()
+    print(report, file=sys.stderr)
 
 
 if __name__ == "__main__":
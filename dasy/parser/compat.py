@@ -4,25 +4,29 @@ This module provides versions of parse_node and parse_expr that can be called
 without a context parameter for backwards compatibility.
 """
 
-from .context import ParseContext
+import threading
 from typing import Optional
 
-# Module-level context for backwards compatibility
-_default_context: Optional[ParseContext] = None
+from .context import ParseContext
+
+# Each thread has its own default context, so compilations on separate
+# threads don't see each other's constants, macros or node ids
+_thread_local = threading.local()
 
 
-def set_default_context(context: ParseContext) -> None:
-    """Set the default context for backwards-compatible calls."""
-    global _default_context
-    _default_context = context
+def set_default_context(context: Optional[ParseContext]) -> Optional[ParseContext]:
+    """Set this thread's default context, returning the previous one."""
+    previous = getattr(_thread_local, "context", None)
+    _thread_local.context = context
+    return previous
 
 
 def get_default_context() -> ParseContext:
-    """Get the default context, creating one if necessary."""
-    global _default_context
-    if _default_context is None:
-        _default_context = ParseContext()
-    return _default_context
+    """Get this thread's default context, creating one if necessary."""
+    context = getattr(_thread_local, "context", None)
+    if context is None:
+        context = _thread_local.context = ParseContext()
+    return context
 
 
 def parse_node_compat(node):
@@ -1,17 +1,49 @@
+import itertools
 from pathlib import Path
-from typing import Optional, Dict, Any
+from types import ModuleType
+from typing import TYPE_CHECKING, Optional, Dict, Any, Set
+
+from dasy.macro.syntax import ExpansionLimits
+
+if TYPE_CHECKING:
+    from dasy.parser.incremental import FormCache
 
 
 class ParseContext:
     """Context object that carries compilation state through the parser.
 
-    This replaces global state and makes the parser reentrant.
+    This replaces global state and makes the parser reentrant: everything a
+    compilation accumulates (constants, macros, node ids) lives here, so
+    separate compilations can run on separate threads.
     """
 
-    def __init__(self, source_path: Optional[str] = None, source_code: str = ""):
+    def __init__(
+        self,
+        source_path: Optional[str] = None,
+        source_code: str = "",
+        expansion_limits: Optional[ExpansionLimits] = None,
+        reader: Optional[str] = None,
+        form_cache: Optional["FormCache"] = None,
+    ):
         self.source_path = source_path
         self.source_code = source_code
+        # Macro expansion budget; None uses the ExpansionLimits defaults
+        self.expansion_limits = expansion_limits
+        # "native" or "hy"; None uses reader.default_reader()
+        self.reader = reader
+        # Nodes of unchanged top-level forms, reused across compilations
+        self.form_cache = form_cache
         self.constants: Dict[str, Any] = {}
+        # Settings from (pragma ...) forms
+        self.settings: Dict[str, Any] = {}
+        # Absolute paths of files pulled in via include!/interface!
+        self.dependencies: Set[str] = set()
+        # Nodes walked by the macro expander
+        self.expand_visits = 0
+        # Hy macros from (defmacro ...) forms, in a module created on first use
+        self.macro_module: Optional[ModuleType] = None
+        self.macro_names: Set[str] = set()
+        self._node_ids = itertools.count()
 
         # Base directory for resolving relative paths in macros
         if source_path:
@@ -19,6 +51,22 @@ class ParseContext:
         else:
             self.base_dir = Path.cwd()
 
+    def next_nodeid(self) -> int:
+        """Allocate the next AST node id of this compilation."""
+        return next(self._node_ids)
+
+    def peek_nodeid(self) -> int:
+        """The id the next node will get, without allocating it."""
+        node_id = next(self._node_ids)
+        self._node_ids = itertools.count(node_id)
+        return node_id
+
+    def skip_nodeids(self, count: int) -> None:
+        self._node_ids = itertools.count(self.peek_nodeid() + count)
+
+    def reset_nodeids(self) -> None:
+        self._node_ids = itertools.count()
+
     def resolve_path(self, relative_path: str) -> Path:
         """Resolve a relative path from the current source file's directory."""
         return self.base_dir / relative_path
@@ -2,58 +2,170 @@ from __future__ import annotations
 
 from hy import models
 
+from dasy.exceptions import DasyMacroExpansionError
 from ..macro.syntax import Syntax
-from .macro_context import set_macro_context, clear_macro_context
+from .macro_context import set_macro_context, clear_macro_context, get_macro_context
 
 
-def expand(form, env):
-    # expand macro calls recursively; otherwise, walk into subforms
-    if isinstance(form, models.Expression) and len(form) > 0:
-        head = form[0]
-        if isinstance(head, models.Symbol):
-            name = str(head)
-            # Avoid expanding inside certain Hy-first macros to keep shapes intact
-            # (none currently)
-            m = env.lookup(name)
-            if m is not None:
-                expanded = m(Syntax(form, ()), env)
-                return expand(expanded, env)
-        # otherwise recursively expand subforms
-        return models.Expression([expand(x, env) for x in form])
-    if isinstance(form, models.List):
-        return models.List([expand(x, env) for x in form])
-    return form
-
-
-def _flatten_expanded(val, env):
-    # If a macro returns a list of forms, expand each and flatten
-    if isinstance(val, models.List):
-        result = []
-        for x in val:
-            ex = expand(x, env)
-            if isinstance(ex, models.List):
-                result.extend(_flatten_expanded(ex, env))
+class Expander:
+    """Expands Dasy macro calls in a single walk over a module's forms.
+
+    Subtrees that are fully expanded are remembered, so macro output that
+    embeds them is not walked again, and nodes whose children are unchanged
+    are returned as-is rather than rebuilt. ``visits`` counts nodes walked
+    and ``steps`` macro calls expanded; both are bounded by ``env.limits``.
+    """
+
+    def __init__(self, env, filename: str | None = None):
+        self.env = env
+        self.limits = env.limits
+        self.filename = filename
+        self.visits = 0
+        self.steps = 0
+        # id -> node of expanded sequences; holding the node keeps its id valid
+        self._expanded: dict = {}
+        # innermost macro call being expanded, and the nearest call site
+        # that still has a source position
+        self._macro: str | None = None
+        self._location: tuple | None = None
+
+    def expand(self, form, depth: int = 0):
+        # Walk with an explicit stack of [node, seq_type, depth, children]
+        # frames so deeply nested output cannot exhaust the Python stack.
+        stack = []
+        while True:
+            form, depth = self._expand_head(form, depth)
+            if isinstance(form, models.Expression):
+                seq_type = models.Expression
+            elif isinstance(form, models.List):
+                seq_type = models.List
+            else:
+                seq_type = None
+            if seq_type is not None and id(form) not in self._expanded:
+                if len(form) > 0:
+                    stack.append([form, seq_type, depth, []])
+                    form = form[0]
+                    continue
+                self._expanded[id(form)] = form
+
+            # form is fully expanded; hand it to the enclosing frames
+            while stack:
+                frame = stack[-1]
+                node, seq_type, depth, children = frame
+                children.append(form)
+                if len(children) < len(node):
+                    form = node[len(children)]
+                    break
+                stack.pop()
+                form = node
+                if any(new is not old for new, old in zip(children, node)):
+                    form = seq_type(children)
+                self._expanded[id(form)] = form
             else:
-                result.append(ex)
-        return result
-    return [val]
+                return form
 
+    def _expand_head(self, form, depth: int):
+        """Expand ``form`` while it is a macro call; return it and its depth."""
+        env = self.env
+        limits = self.limits
+        while True:
+            self.visits += 1
+            if self.visits > limits.max_size:
+                raise self.limit_error(f"max_size={limits.max_size}")
+            if id(form) in self._expanded:
+                return form, depth
+            if not (isinstance(form, models.Expression) and len(form) > 0):
+                return form, depth
+            head = form[0]
+            if not isinstance(head, models.Symbol):
+                return form, depth
+            m = env.lookup(str(head))
+            if m is None:
+                return form, depth
+            self._macro = str(head)
+            # Hy reports 1:1 for forms built by macros; only trust real ones
+            if hasattr(form, "_start_line"):
+                self._location = (form.start_line, form.start_column)
+            self.steps += 1
+            depth += 1
+            if self.steps > limits.max_steps:
+                raise self.limit_error(f"max_steps={limits.max_steps}")
+            if depth > limits.max_depth:
+                raise self.limit_error(f"max_depth={limits.max_depth}")
+            form = m(Syntax(form, ()), env)
 
-def expand_module(forms, env, parse_define_syntax_fn, context):
-    out = []
+    def limit_error(self, limit: str) -> DasyMacroExpansionError:
+        where = ""
+        location = None
+        if self._location is not None:
+            line, column = self._location
+            location = (self.filename or "<string>", line, column)
+            where = f" at {location[0]}:{line}:{column}"
+        return DasyMacroExpansionError(
+            f"Macro expansion limit exceeded ({limit}) "
+            f"while expanding '{self._macro}'{where}",
+            macro=self._macro,
+            location=location,
+        )
+
+    def flatten(self, val):
+        """Splice the forms of a list-returning macro into the module."""
+        if isinstance(val, models.List):
+            result = []
+            for x in val:
+                result.extend(self.flatten(x))
+            return result
+        return [val]
+
+
+def expand(form, env):
+    """Expand all macro calls in ``form``."""
+    return Expander(env).expand(form)
+
+
+def expand_top_level(expander, f, parse_define_syntax_fn, context) -> list:
+    """Expand the top-level form ``f``, returning the forms it becomes."""
+    if (
+        isinstance(f, models.Expression)
+        and len(f) > 0
+        and isinstance(f[0], models.Symbol)
+        and str(f[0]) == "define-syntax"
+    ):
+        parse_define_syntax_fn(f, context, expander.env)
+        return []
+    # interface! compiles other files from inside a macro, so restore
+    # the outer module's context rather than clearing it on the way out.
+    # The context is only held while expanding: the consumer runs
+    # between forms.
+    outer_context = get_macro_context()
     set_macro_context(context)
+    visits = expander.visits
     try:
-        for f in forms:
-            if (
-                isinstance(f, models.Expression)
-                and len(f) > 0
-                and isinstance(f[0], models.Symbol)
-                and str(f[0]) == "define-syntax"
-            ):
-                parse_define_syntax_fn(f, context, env)
-                continue
-            expanded = expand(f, env)
-            out.extend(_flatten_expanded(expanded, env))
+        expanded = expander.expand(f)
+    except RecursionError:
+        raise expander.limit_error("Python recursion limit") from None
     finally:
-        clear_macro_context()
-    return out
+        # the memo only spans one form; dropping it lets each top-level form
+        # be released once it is parsed. The budgets still count per module
+        expander._expanded.clear()
+        context.expand_visits += expander.visits - visits
+        if outer_context is not None:
+            set_macro_context(outer_context)
+        else:
+            clear_macro_context()
+    return expander.flatten(expanded)
+
+
+def iter_expand_module(forms, env, parse_define_syntax_fn, context):
+    """Expand ``forms`` one at a time, yielding the expanded top-level forms.
+
+    ``forms`` may be any iterable, e.g. a reader still working through the
+    source; each form is read, expanded and handed on before the next.
+    """
+    expander = Expander(env, filename=context.source_path)
+    for f in forms:
+        yield from expand_top_level(expander, f, parse_define_syntax_fn, context)
+
+
+def expand_module(forms, env, parse_define_syntax_fn, context):
+    return list(iter_expand_module(forms, env, parse_define_syntax_fn, context))
@@ -0,0 +1,190 @@
+"""Reuse of the nodes built for top-level forms that have not changed.
+
+With a ``FormCache`` on the ParseContext, each top-level form is looked up
+as soon as it is read, by its text and starting column plus a digest of
+everything the forms before it added to the parse environment: constants,
+``defmacro`` and ``define-syntax`` macros, and pragma settings. On a hit the
+form is neither expanded nor parsed. A copy of the nodes it produced last
+time is moved to its current lines and node ids instead, so the module is
+the same as a full parse would build.
+
+Forms that change that environment are always parsed, and their text and
+position feed the digest: editing a ``defconst`` invalidates the forms after
+it, and so does moving it, since substituted constants keep the position of
+their definition. Forms that pull in other files (``include!``,
+``interface!``) are never cached; when one changes the environment, the
+contents of those files feed the digest as well.
+"""
+
+import json
+import pickle
+import threading
+from collections import OrderedDict
+from typing import List, NamedTuple, Optional
+
+from dasy.cache import hash_bytes, hash_file
+
+DEFAULT_MAX_FORMS = 4096
+
+
+class FormEntry(NamedTuple):
+    # pickled top-level nodes, before the source text is attached
+    nodes: bytes
+    first_line: int
+    last_line: int
+    first_id: int
+    id_count: int
+
+
+class FormCache:
+    """Bounded, thread-safe map of top-level form keys to their nodes.
+
+    One cache can serve any number of files and compilations; the least
+    recently used forms are dropped past ``max_entries``.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_FORMS):
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[tuple, FormEntry]" = OrderedDict()
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple) -> Optional[FormEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: tuple, entry: FormEntry) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+def _line_starts(src: str) -> List[int]:
+    starts = [0]
+    index = src.find("\n")
+    while index != -1:
+        starts.append(index + 1)
+        index = src.find("\n", index + 1)
+    return starts
+
+
+def _walk(roots):
+    stack = list(roots)
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(node._children)
+
+
+class FormReuse:
+    """Looks up and records the top-level forms of one parse."""
+
+    def __init__(self, cache: FormCache, src: str, context, env):
+        self.cache = cache
+        self.src = src
+        self.context = context
+        self.env = env
+        self._line_starts = _line_starts(src)
+        self.digest = repr(context.expansion_limits)
+        self._pending = None
+
+    def _text(self, form) -> str:
+        starts = self._line_starts
+        begin = starts[form.start_line - 1] + form.start_column - 1
+        return self.src[begin : starts[form.end_line - 1] + form.end_column]
+
+    def _env_state(self) -> tuple:
+        context = self.context
+        module = context.macro_module
+        return (
+            dict(context.constants),
+            dict(context.settings),
+            set(context.macro_names),
+            dict(module._hy_macros) if module is not None else {},
+            [dict(frame) for frame in self.env.frames],
+        )
+
+    def lookup(self, form) -> Optional[list]:
+        """The nodes of ``form`` if it is cached, else None.
+
+        On a miss the form is remembered for the ``record`` call that
+        follows its parse.
+        """
+        key = (self.digest, form.start_column, self._text(form))
+        entry = self.cache.get(key)
+        context = self.context
+        if entry is None:
+            self._pending = (
+                key,
+                form,
+                context.peek_nodeid(),
+                set(context.dependencies),
+                self._env_state(),
+            )
+            return None
+
+        first_id = context.peek_nodeid()
+        id_delta = first_id - entry.first_id
+        id_end = entry.first_id + entry.id_count
+        line_delta = form.start_line - entry.first_line
+        nodes = pickle.loads(entry.nodes)
+        for node in _walk(nodes):
+            if entry.first_id <= node.node_id < id_end:
+                node.node_id += id_delta
+            # positions from elsewhere, e.g. a defconst's, stay put
+            if line_delta and entry.first_line <= (node.lineno or 0) <= entry.last_line:
+                node.lineno += line_delta
+                node.end_lineno += line_delta
+        context.skip_nodeids(entry.id_count)
+        return nodes
+
+    def record(self, nodes: list) -> None:
+        """Cache ``nodes`` as what the pending form parsed to."""
+        key, form, first_id, dependencies, before = self._pending
+        self._pending = None
+        context = self.context
+        pulled_in = sorted(context.dependencies - dependencies)
+        if self._env_state() != before:
+            self.digest = hash_bytes(
+                json.dumps(
+                    [
+                        self.digest,
+                        form.start_line,
+                        *key[1:],
+                        [hash_file(path) for path in pulled_in],
+                    ]
+                ).encode()
+            )
+            return
+        if pulled_in:
+            return
+        try:
+            blob = pickle.dumps(nodes, pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return
+        entry = FormEntry(
+            blob,
+            form.start_line,
+            form.end_line,
+            first_id,
+            context.peek_nodeid() - first_id,
+        )
+        self.cache.put(key, entry)
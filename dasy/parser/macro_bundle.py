@@ -0,0 +1,108 @@
+"""Precompiled bundle of the builtin Hy macros in ``dasy/builtin/macros.hy``.
+
+Reading and compiling macros.hy with Hy dominates the first compile of every
+process. The compiled module is instead marshalled into the user cache
+directory, keyed on the Hy version, the interpreter's bytecode tag and the
+contents of macros.hy, and later processes just exec the cached code object.
+"""
+
+import json
+import logging
+import marshal
+import os
+import sys
+import tempfile
+from pathlib import Path
+from types import CodeType, ModuleType
+from typing import List, Optional, Tuple
+
+import hy
+from hy.compiler import hy_compile
+
+from dasy.cache import default_cache_dir, hash_bytes
+
+logger = logging.getLogger(__name__)
+
+# Bump when the marshalled payload changes shape
+BUNDLE_FORMAT_VERSION = 1
+
+MACRO_FILE = Path(__file__).parent.parent / "builtin" / "macros.hy"
+
+
+def bundle_key(source: bytes) -> str:
+    return hash_bytes(
+        json.dumps(
+            [
+                BUNDLE_FORMAT_VERSION,
+                hy.__version__,
+                sys.implementation.cache_tag,
+                hash_bytes(source),
+            ]
+        ).encode()
+    )
+
+
+def bundle_path(key: str, cache_dir: Optional[os.PathLike] = None) -> Path:
+    base = Path(cache_dir) if cache_dir else default_cache_dir()
+    return base / "macros" / f"builtin-{key[:32]}.bundle"
+
+
+def compile_bundle(source: str, module: ModuleType) -> Tuple[List[str], CodeType]:
+    """Compile macros.hy, returning its defmacro names and module code."""
+    forms = list(hy.read_many(source, filename=str(MACRO_FILE)))
+    names = [
+        str(form[1])
+        for form in forms
+        if isinstance(form, hy.models.Expression)
+        and form[0] == hy.models.Symbol("defmacro")
+    ]
+    tree = hy_compile(forms, module, filename=str(MACRO_FILE), source=source)
+    return names, compile(tree, str(MACRO_FILE), "exec")
+
+
+def _read_bundle(path: Path) -> Optional[Tuple[List[str], CodeType]]:
+    try:
+        names, code = marshal.loads(path.read_bytes())
+    except FileNotFoundError:
+        return None
+    except (OSError, EOFError, ValueError, TypeError) as e:
+        logger.debug(f"Ignoring unreadable macro bundle {path}: {e}")
+        return None
+    if not isinstance(code, CodeType):
+        return None
+    return names, code
+
+
+def _write_bundle(path: Path, data: bytes) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+    except OSError as e:
+        logger.warning(f"Could not write macro bundle {path}: {e}")
+
+
+def load_builtin_macros(
+    module: ModuleType, cache_dir: Optional[os.PathLike] = None
+) -> List[str]:
+    """Install the builtin macros into ``module`` and return their names.
+
+    Hy registers macros in the ``_hy_macros`` dict of the defining globals, so
+    executing the bundle in ``module.__dict__`` makes them visible to
+    ``hy.macroexpand`` calls made from that module.
+    """
+    source = MACRO_FILE.read_bytes()
+    path = bundle_path(bundle_key(source), cache_dir)
+    bundle = _read_bundle(path)
+    if bundle is None:
+        bundle = compile_bundle(source.decode(), module)
+        _write_bundle(path, marshal.dumps(bundle))
+    names, code = bundle
+    exec(code, module.__dict__)
+    return list(names)
@@ -1,12 +1,16 @@
 """Utilities for macro compilation that avoid circular dependencies."""
 
+import copy
+import hashlib
+import os
 from pathlib import Path
-from typing import Optional, Set
+from typing import Dict, Optional, Set, Tuple
 import threading
 from vyper.compiler import CompilerData
 from vyper.compiler.settings import Settings, anchor_settings
 
 from dasy.exceptions import DasyCircularDependencyError
+from dasy.timings import phase
 
 # Thread-local storage for tracking compilation stack
 _thread_local = threading.local()
@@ -19,10 +23,15 @@ def get_compilation_stack() -> Set[str]:
     return _thread_local.compilation_stack
 
 
-def compile_for_interface(filepath: str) -> CompilerData:
+def compile_for_interface(
+    filepath: str, dependencies: Optional[Set[str]] = None
+) -> CompilerData:
     """
     Compile a file just enough to extract its interface.
     This avoids full compilation and helps prevent circular dependencies.
+
+    If ``dependencies`` is given, the files the target itself includes or
+    references through ``interface!`` are added to it.
     """
     path = Path(filepath)
     abs_path = str(path.absolute())
@@ -58,26 +67,28 @@ def compile_for_interface(filepath: str) -> CompilerData:
         # For .dasy files, we need minimal compilation
         # Import here to avoid circular imports
         from dasy.parser import parse_src
+        from dasy.parser.context import ParseContext
 
         # Parse with minimal processing - just enough to get the interface
-        ast, settings = parse_src(src, filepath)
+        context = ParseContext(source_path=filepath, source_code=src)
+        ast, settings = parse_src(src, filepath, context=context)
+        if dependencies is not None:
+            dependencies.update(context.dependencies)
         settings = Settings(**settings)
         with anchor_settings(settings):
             # Create minimal compiler data
             from dasy.compiler import CompilerData as DasyCompilerData
+            from vyper.compiler.input_bundle import FileInput
 
-            data = DasyCompilerData(
-                "",
-                path.stem,
-                None,
-                source_id=0,
-                settings=settings,
+            file_input = FileInput(
+                contents=src, source_id=0, path=path, resolved_path=path.resolve()
             )
-            data.vyper_module = ast
+            data = DasyCompilerData(file_input, settings=settings)
+            data.__dict__["vyper_module"] = ast
 
             # Only process enough to get the external interface
             # This avoids full bytecode generation
-            _ = data.vyper_module_folded  # This is enough for interface extraction
+            _ = data.annotated_vyper_module  # This is enough for interface extraction
 
             return data
     finally:
@@ -85,6 +96,153 @@ def compile_for_interface(filepath: str) -> CompilerData:
         stack.discard(abs_path)
 
 
+def _file_state(path: str) -> Tuple[int, int]:
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+def _file_digest(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+class InterfaceCache:
+    """Process-wide memo of rendered ``interface!`` sources.
+
+    Entries are keyed by resolved path and record the content hash of the
+    target and of every file it depends on. A dependency whose mtime and
+    size are unchanged is trusted without re-hashing; otherwise its contents
+    are hashed again and the entry is dropped if they differ.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # resolved path -> (interface source, {dep: [mtime_ns, size, digest]})
+        self._entries: Dict[str, Tuple[str, Dict[str, list]]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _is_fresh(self, deps: Dict[str, list]) -> bool:
+        for dep, record in deps.items():
+            try:
+                state = _file_state(dep)
+                if state == tuple(record[:2]):
+                    continue
+                if _file_digest(dep) != record[2]:
+                    return False
+            except OSError:
+                return False
+            record[:2] = state
+        return True
+
+    def get(self, path: str) -> Optional[Tuple[str, Set[str]]]:
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and self._is_fresh(entry[1]):
+                self.hits += 1
+                return entry[0], set(entry[1])
+            self._entries.pop(path, None)
+            self.misses += 1
+            return None
+
+    def put(self, path: str, interface_src: str, dependencies: Set[str]) -> None:
+        deps = {}
+        try:
+            for dep in dependencies | {path}:
+                deps[dep] = [*_file_state(dep), _file_digest(dep)]
+        except OSError:
+            return
+        with self._lock:
+            self._entries[path] = (interface_src, deps)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+_interface_cache = InterfaceCache()
+
+
+def get_interface_cache() -> InterfaceCache:
+    return _interface_cache
+
+
+def get_interface_source(filepath: str, dependencies: Optional[Set[str]] = None) -> str:
+    """Return the Dasy external interface of ``filepath``, memoized per process.
+
+    ``dependencies`` receives the target and everything it transitively
+    includes, whether or not the result came from the cache.
+    """
+    from .output import get_external_interface
+
+    abs_path = str(Path(filepath).resolve())
+    cached = _interface_cache.get(abs_path)
+    if cached is not None:
+        interface_src, deps = cached
+    else:
+        from dasy.compiler import VYPER_LOCK
+
+        deps = set()
+        with VYPER_LOCK:
+            data = compile_for_interface(filepath, dependencies=deps)
+            interface_src = get_external_interface(data)
+        _interface_cache.put(abs_path, interface_src, deps)
+        deps.add(abs_path)
+    if dependencies is not None:
+        dependencies.update(deps)
+    return interface_src
+
+
+class IncludeCache:
+    """Process-wide memo of the forms read from ``include!`` targets.
+
+    Entries are keyed by absolute path and tagged with the content hash of
+    the file, so an edited file is simply read again. Callers always receive
+    a deep copy; macro expansion can never alter the cached trees.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # absolute path -> (content digest, forms)
+        self._entries: Dict[str, Tuple[str, tuple]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def read_forms(self, filepath: str, reader: Optional[str] = None) -> list:
+        from .reader import read_many as dasy_read_many
+
+        abs_path = str(Path(filepath).absolute())
+        with open(filepath, "r") as f:
+            src = f.read()
+        digest = hashlib.sha256(src.encode()).hexdigest()
+        with self._lock:
+            entry = self._entries.get(abs_path)
+            if entry is not None and entry[0] == digest:
+                self.hits += 1
+                return copy.deepcopy(list(entry[1]))
+            self.misses += 1
+        with phase("read"):
+            forms = tuple(dasy_read_many(src, filename=str(filepath), reader=reader))
+        with self._lock:
+            self._entries[abs_path] = (digest, forms)
+        return copy.deepcopy(list(forms))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+_include_cache = IncludeCache()
+
+
+def get_include_cache() -> IncludeCache:
+    return _include_cache
+
+
 def clear_compilation_stack():
     """Clear the compilation stack (useful for testing)."""
     if hasattr(_thread_local, "compilation_stack"):
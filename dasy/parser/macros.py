@@ -1,11 +1,34 @@
+import threading
+from types import ModuleType
+
 import dasy
 import hy
 
+from dasy.timings import phase
+
+# Names of the builtin Hy macros; (defmacro ...) forms add to the
+# compilation's ParseContext.macro_names instead
 MACROS = []
 
+_builtins_installed = False
+_install_lock = threading.Lock()
+
+
+def ensure_builtin_macros():
+    """Load the builtin Hy macro bundle the first time a Hy macro is needed."""
+    global _builtins_installed
+    if _builtins_installed:
+        return
+    with _install_lock:
+        if _builtins_installed:
+            return
+        dasy.parser.install_builtin_macros()
+        _builtins_installed = True
+
 
-def is_macro(cmd_str):
-    return cmd_str in MACROS
+def is_macro(cmd_str, context=None):
+    ensure_builtin_macros()
+    return cmd_str in MACROS or (context is not None and cmd_str in context.macro_names)
 
 
 def macroexpand(code_str):
@@ -14,17 +37,29 @@ def macroexpand(code_str):
 
 def handle_macro(expr, context):
     # Make context available to macros through thread-local storage
-    from .macro_context import set_macro_context, clear_macro_context
+    from .macro_context import get_macro_context, set_macro_context
 
+    previous = get_macro_context()
     set_macro_context(context)
     try:
-        new_node = hy.macroexpand(expr)
+        with phase("hy_macros"):
+            # a compilation with defmacros has a module of its own; None
+            # means this module, which holds the builtins
+            new_node = hy.macroexpand(expr, module=context.macro_module)
         return dasy.parser.parse_node(new_node, context)
     finally:
-        clear_macro_context()
+        # interface! may compile another file, which sets its own context
+        set_macro_context(previous)
 
 
 def parse_defmacro(expr, context):
-    hy.eval(expr)
-    MACROS.append(str(expr[1]))
+    # builtins first, so user macros of the same name take precedence
+    ensure_builtin_macros()
+    if context.macro_module is None:
+        module = ModuleType(f"{__name__}.user")
+        # the builtins were exec'd into this module's _hy_macros
+        module._hy_macros = dict(globals()["_hy_macros"])
+        context.macro_module = module
+    hy.eval(expr, module=context.macro_module)
+    context.macro_names.add(str(expr[1]))
     return None
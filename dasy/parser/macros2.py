@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from hy import models
 
+from ..exceptions import DasySyntaxError
 from .context import ParseContext
 from ..macro.syntax_rules import SyntaxRulesMacro, ELLIPSIS
 from ..macro.syntax import Syntax
@@ -9,10 +10,10 @@ from .macro_context import get_macro_context
 from .macro_utils import (
     check_include_recursion,
     get_include_stack,
-    compile_for_interface,
+    get_include_cache,
+    get_interface_source,
 )
 from .reader import read_many as dasy_read_many
-from .output import get_external_interface
 
 
 def parse_define_syntax(expr: models.Expression, context: ParseContext, env) -> None:
@@ -64,32 +65,28 @@ def install_builtin_dasy_macros(env) -> None:
     def lst(*xs):
         return models.List(list(xs))
 
-    # cond
-    cond_rules = [
-        # (cond :else e) => e
-        (exp(sym("cond"), kw("else"), sym("e")), sym("e")),
-        # (cond test expr) => (if test expr)
-        (
-            exp(sym("cond"), sym("test"), sym("expr")),
-            exp(sym("if"), sym("test"), sym("expr")),
-        ),
-        # (cond test expr :else e) => (if test expr e)
-        (
-            exp(sym("cond"), sym("test"), sym("expr"), kw("else"), sym("e")),
-            exp(sym("if"), sym("test"), sym("expr"), sym("e")),
-        ),
-        # (cond test expr rest ...) => (if test expr (cond rest ...))
-        (
-            exp(sym("cond"), sym("test"), sym("expr"), sym("rest"), ELLIPSIS),
-            exp(
-                sym("if"),
-                sym("test"),
-                sym("expr"),
-                exp(sym("cond"), sym("rest"), ELLIPSIS),
-            ),
-        ),
-    ]
-    env.define("cond", SyntaxRulesMacro([kw("else")], cond_rules))
+    # cond as a procedural macro: the recursive syntax-rules version
+    # (cond test expr rest ...) => (if test expr (cond rest ...)) rebinds the
+    # whole tail at every level, which is quadratic in the number of clauses.
+    # (cond :else e)               => e
+    # (cond test expr ...)         => (if test expr (if ...))
+    # (cond test expr ... :else e) => (if test expr (if ... e))
+    def _cond(call_stx: Syntax, _env):
+        clauses = list(call_stx.datum[1:])
+        if not clauses or len(clauses) % 2:
+            raise DasySyntaxError("cond expects test/expression pairs")
+        if clauses[-2] == kw("else"):
+            acc = clauses.pop()
+            clauses.pop()
+        else:
+            test, expr = clauses[-2:]
+            del clauses[-2:]
+            acc = exp(sym("if"), test, expr)
+        for i in range(len(clauses) - 2, -1, -2):
+            acc = exp(sym("if"), clauses[i], clauses[i + 1], acc)
+        return acc
+
+    env.define("cond", _cond)
 
     # keep doto provided by Hy for now, due to reader/shape nuances
 
@@ -344,11 +341,11 @@ def install_builtin_dasy_macros(env) -> None:
         check_include_recursion(str(path))
         include_stack = get_include_stack()
         include_stack.add(abs_path)
+        if ctx:
+            ctx.dependencies.add(abs_path)
         try:
-            with open(path, "r") as f:
-                src = f.read()
-            forms = dasy_read_many(src, filename=str(path))
-            return models.List(list(forms))
+            reader = ctx.reader if ctx else None
+            return models.List(get_include_cache().read_forms(str(path), reader))
         finally:
             include_stack.discard(abs_path)
 
@@ -369,9 +366,10 @@ def install_builtin_dasy_macros(env) -> None:
         base_dir = ctx.base_dir if ctx else Path.cwd()
         p = Path(fname)
         path = p if p.is_absolute() else (base_dir / p)
-        data = compile_for_interface(str(path))
-        interface_str = get_external_interface(data)
-        forms = dasy_read_many(interface_str, filename=str(path))
+        deps = ctx.dependencies if ctx else None
+        interface_str = get_interface_source(str(path), dependencies=deps)
+        reader = ctx.reader if ctx else None
+        forms = dasy_read_many(interface_str, filename=str(path), reader=reader)
         return models.List(list(forms))
 
     env.define("interface!", _interface_bang)
@@ -0,0 +1,213 @@
+"""Scan-based reader for the subset of Hy syntax that Dasy source uses.
+
+``HyReader`` reads one character at a time, dispatches through its reader
+table and, for every form it finishes, rebuilds the form's whole subtree to
+fill in positions, which makes it quadratic in nesting depth. Dasy needs
+none of reader macros, f-strings or bracket strings, so this reader tokenizes
+with a single regular expression and assembles forms on an explicit stack.
+
+It produces the same ``hy.models`` objects, with the same ``start_line``,
+``start_column``, ``end_line`` and ``end_column`` positions, as ``HyReader``.
+For anything outside that subset, or for malformed input, ``iter_forms``
+raises ``Unsupported`` and the caller falls back to ``HyReader``, which also
+keeps Hy's error messages.
+"""
+
+import codecs
+import re
+from typing import Iterator, List
+
+from hy import models
+from hy.reader.hy_reader import as_identifier as hy_as_identifier
+
+
+class Unsupported(Exception):
+    """Source uses syntax this reader leaves to ``HyReader``."""
+
+
+_SPACE = " \t\n\r\f\v"
+# characters that end an identifier: HyReader.NON_IDENT plus whitespace
+_IDENT = r"[^ \t\n\r\f\v()\[\]{};\"'`~]"
+_STRING = r'"(?:[^"\\]|\\.)*"'
+
+_TOKEN = re.compile(
+    rf"""
+    (?P<space>[{_SPACE}]+)
+  | (?P<comment>;[^\n]*\n?)
+  | (?P<open>[(\[{{])
+  | (?P<close>[)\]}}])
+  | (?P<string>{_STRING})
+  | (?P<keyword>:{_IDENT}*)
+  | (?P<prefix>'|`|~@|~)
+  | (?P<ident>(?!\#){_IDENT}+)(?P<prefixed>{_STRING})?
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+_SEQUENCES = {
+    "(": (models.Expression, ")"),
+    "[": (models.List, "]"),
+    "{": (models.Dict, "}"),
+}
+_PREFIXES = {
+    "'": "quote",
+    "`": "quasiquote",
+    "~": "unquote",
+    "~@": "unquote-splice",
+}
+# escapes HyReader accepts in non-raw strings; bytes also lack \N, \u, \U
+_STR_ESCAPES = set("\n\r\\'\"abfnrtv01234567xNuU")
+_BYTES_ESCAPES = set("\n\r\\'\"abfnrtv01234567x")
+_ESCAPE = re.compile(r"\\(.)", re.DOTALL)
+
+
+def _sym(name: str) -> models.Symbol:
+    return models.Symbol(name, from_parser=True)
+
+
+def _set_pos(model, start, end):
+    model.start_line, model.start_column = start
+    model.end_line, model.end_column = end
+    return model
+
+
+def _fill_pos(model, start, end):
+    """Give ``model`` and any unpositioned submodels the span ``start``-``end``.
+
+    This is what HyReader's ``fill_pos`` does, minus rebuilding the subtree:
+    forms read from the source already carry their own positions.
+    """
+    stack = [model]
+    while stack:
+        m = stack.pop()
+        if hasattr(m, "_start_line"):
+            continue
+        _set_pos(m, start, end)
+        if isinstance(m, models.Sequence):
+            stack.extend(m)
+    return model
+
+
+def _string(body: str, prefix: str):
+    if not set(prefix) <= {"b", "r"} or len(set(prefix)) != len(prefix):
+        raise Unsupported(f"string prefix {prefix!r}")
+    if "r" not in prefix:
+        allowed = _BYTES_ESCAPES if "b" in prefix else _STR_ESCAPES
+        for m in _ESCAPE.finditer(body):
+            if m.group(1) not in allowed:
+                raise Unsupported(f"escape sequence \\{m.group(1)}")
+    res = body.replace("\r\n", "\n").replace("\r", "\n")
+    if "b" in prefix:
+        try:
+            res = res.encode("ascii")
+        except UnicodeEncodeError:
+            raise Unsupported("non-ASCII bytes literal")
+    if "r" not in prefix:
+        if "b" in prefix:
+            res = codecs.escape_decode(res)[0]
+        else:
+            res = res.encode("ISO-8859-1", errors="backslashreplace").decode(
+                "unicode_escape"
+            )
+    return models.Bytes(res) if "b" in prefix else models.String(res)
+
+
+def _identifier(ident: str):
+    # DasyReader's Ethereum address rule, kept identical: Symbol() without
+    # from_parser rejects numeric text, so addresses still read as Integer
+    if ident.startswith("0x") and len(ident) == 42:
+        try:
+            int(ident[2:], 16)
+            return models.Symbol(ident)
+        except ValueError:
+            pass
+    # only these can read as numbers or dotted forms; everything else is a
+    # plain symbol, without trying the numeric constructors first
+    if (
+        ident[0] not in "0123456789+-."
+        and "." not in ident
+        and "Inf" not in ident
+        and "NaN" not in ident
+    ):
+        return _sym(ident)
+    try:
+        return hy_as_identifier(ident)
+    except ValueError as e:
+        raise Unsupported(str(e))
+
+
+def read_forms(src: str) -> List[models.Object]:
+    """Read every top-level form in ``src``."""
+    return list(iter_forms(src))
+
+
+def iter_forms(src: str) -> Iterator[models.Object]:
+    """Yield the top-level forms of ``src`` as each one is completed."""
+    # open sequences: [model type, closer, start, items]; and pending reader
+    # prefixes: [None, root symbol, start]
+    stack: list = []
+    # offset -> (line, 1-based column), advanced monotonically
+    line, line_start, seen = 1, 0, 0
+
+    def pos(offset):
+        nonlocal line, line_start, seen
+        newlines = src.count("\n", seen, offset)
+        if newlines:
+            line += newlines
+            line_start = src.rindex("\n", seen, offset) + 1
+        seen = offset
+        return line, offset - line_start + 1
+
+    i, n = 0, len(src)
+    while i < n:
+        m = _TOKEN.match(src, i)
+        if m is None:
+            # '#' dispatch, an unterminated string, ...
+            raise Unsupported(f"unsupported syntax at offset {i}")
+        kind = m.lastgroup
+        start, i = m.start(), m.end()
+        if kind in ("space", "comment"):
+            continue
+        if kind == "prefixed":
+            kind = "ident"
+        if kind == "open":
+            seq_type, closer = _SEQUENCES[m.group()]
+            stack.append([seq_type, closer, pos(start), []])
+            continue
+        if kind == "prefix":
+            stack.append([None, _PREFIXES[m.group()], pos(start)])
+            continue
+
+        begin = pos(start)
+        if kind == "close":
+            if not stack or stack[-1][0] is None or stack[-1][1] != m.group():
+                raise Unsupported(f"unexpected {m.group()!r}")
+            seq_type, _, begin, items = stack.pop()
+            form = seq_type(items)
+        elif kind == "string":
+            form = _string(m.group()[1:-1], "")
+        elif kind == "keyword":
+            name = m.group()[1:]
+            if "." in name:
+                raise Unsupported("dotted keyword")
+            form = models.Keyword(name, from_parser=True)
+        else:
+            body = m.group("prefixed")
+            if body is not None:
+                form = _string(body[1:-1], m.group("ident"))
+            else:
+                form = _identifier(m.group())
+        end = pos(i - 1)
+        form = _fill_pos(form, begin, end)
+
+        # close any reader prefixes waiting on this form
+        while stack and stack[-1][0] is None:
+            _, root, begin = stack.pop()
+            form = _fill_pos(models.Expression((_sym(root), form)), begin, end)
+        if stack:
+            stack[-1][3].append(form)
+        else:
+            yield form
+
+    if stack:
+        raise Unsupported("premature end of input")
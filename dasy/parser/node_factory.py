@@ -0,0 +1,142 @@
+"""Per-class constructors for the Vyper nodes the parser builds.
+
+``VyperNode.__init__`` is written for nodes decoded from a Python AST: it
+pops every source attribute from ``kwargs``, looks each field up through the
+class's translation, decoder and field tables, and runs every value through
+``_to_node``. ``build_node`` then walked the values again to link children.
+For every node class this builds a constructor once, with those tables
+already resolved, that sets the slots, node id and parent links in one pass.
+
+Classes that do extra work in their own ``__init__`` (``Compare``,
+``VariableDecl``, ...) still run it. Their constructor only adds the
+parent links.
+"""
+
+from typing import Any, Callable, Dict
+
+from vyper.ast import nodes as vy_nodes
+from vyper.ast.metadata import NodeMetadata
+from vyper.ast.nodes import NODE_SRC_ATTRIBUTES, ExprNode, VyperNode
+
+Constructor = Callable[[Dict[str, Any], int], VyperNode]
+
+_CONSTRUCTORS: Dict[type, Constructor] = {}
+
+
+def link_children(parent: VyperNode, values) -> VyperNode:
+    """Append every node in ``values``, or in nested lists of it, to ``parent``."""
+    stack = [iter(values)]
+    while stack:
+        for value in stack[-1]:
+            if isinstance(value, list):
+                stack.append(iter(value))
+                break
+            if isinstance(value, VyperNode):
+                parent._children.append(value)
+                value._parent = parent
+        else:
+            stack.pop()
+    return parent
+
+
+def _init_constructor(cls) -> Constructor:
+    """Run the class's own ``__init__``, then link the children."""
+    ast_type = cls.__name__
+
+    def construct(fields, node_id):
+        node = cls(node_id=node_id, ast_type=ast_type, **fields)
+        return link_children(node, fields.values())
+
+    return construct
+
+
+def _adopt(node, child, inherited):
+    # what ``_to_node`` does for a node passed as a field value
+    child._parent = node
+    child._depth = 1
+    for name, value in inherited:
+        if getattr(child, name) is None:
+            setattr(child, name, value)
+    return child
+
+
+def _direct_constructor(cls) -> Constructor:
+    """Set the slots of a ``cls`` node without going through ``__init__``."""
+    ast_type = cls.__name__
+    names = cls.get_fields()
+    translated = cls._translated_fields
+    decoders = cls._special_decoders
+    only_empty = cls._only_empty_fields
+    is_expr = issubclass(cls, ExprNode)
+    new = object.__new__
+
+    def construct(fields, node_id):
+        node = new(cls)
+        node._parent = None
+        node._depth = 0
+        node._children = children = []
+        node._metadata = NodeMetadata()
+        node._original_node = None
+        node._cache_descendants = None
+        if is_expr:
+            node._expr_info = None
+        node.node_id = node_id
+        node.ast_type = ast_type
+
+        inherited = []
+        for name in NODE_SRC_ATTRIBUTES:
+            value = fields.get(name)
+            setattr(node, name, value)
+            if value is not None:
+                inherited.append((name, value))
+
+        for name, value in fields.items():
+            if name in NODE_SRC_ATTRIBUTES:
+                continue
+            name = translated.get(name, name)
+            if name not in names:
+                if value and name in only_empty:
+                    # let __init__ raise its usual syntax error
+                    return _init_constructor(cls)(fields, node_id)
+                if isinstance(value, (VyperNode, list)):
+                    link_children(node, (value,))
+                continue
+            if name in decoders:
+                value = decoders[name](value)
+            elif isinstance(value, VyperNode):
+                children.append(_adopt(node, value, inherited))
+            elif isinstance(value, list):
+                items = []
+                for item in value:
+                    if isinstance(item, VyperNode):
+                        children.append(_adopt(node, item, inherited))
+                    elif isinstance(item, list):
+                        link_children(node, item)
+                    else:
+                        item = vy_nodes._to_node(item, node)
+                    items.append(item)
+                value = items
+            elif isinstance(value, dict):
+                value = vy_nodes._to_node(value, node)
+            setattr(node, name, value)
+        return node
+
+    return construct
+
+
+def node_constructor(cls) -> Constructor:
+    """The cached constructor for ``cls``, built on first use.
+
+    It is called as ``construct(fields, node_id)`` and returns the node with
+    ``fields`` set and every node among them linked as a child.
+    """
+    try:
+        return _CONSTRUCTORS[cls]
+    except KeyError:
+        pass
+    if cls.__init__ in (VyperNode.__init__, ExprNode.__init__):
+        construct = _direct_constructor(cls)
+    else:
+        construct = _init_constructor(cls)
+    _CONSTRUCTORS[cls] = construct
+    return construct
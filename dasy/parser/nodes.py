@@ -16,7 +16,7 @@ from vyper.ast.nodes import (
 )
 from hy import models
 from dasy import parser
-from .utils import process_body, build_node
+from .utils import process_body, build_node, add_src_map
 
 
 def parse_for(expr):
@@ -50,18 +50,16 @@ def parse_for(expr):
     return for_node
 
 
-def parse_if(expr):
-    # used for base case in cond expansion
-    if expr[1] == models.Keyword("else"):
-        if expr[3] == models.Symbol("None"):
-            return parser.parse_node_legacy(expr[2])
+def _is_if_chain(expr):
+    return (
+        isinstance(expr, models.Expression)
+        and len(expr) == 4
+        and expr[0] == models.Symbol("if")
+        and not (expr[1] == models.Keyword("else") and expr[3] == models.Symbol("None"))
+    )
 
-    body_nodes = [parser.parse_node_legacy(expr[2])]
-    body = process_body(body_nodes)
-    else_nodes = [parser.parse_node_legacy(expr[3])] if len(expr) == 4 else []
-    else_ = process_body(else_nodes)
-    test = parser.parse_node_legacy(expr[1])
 
+def _build_if(test, body, else_):
     # if-expressions always have:
     # - one node in body
     # - one node in else
@@ -74,11 +72,37 @@ def parse_if(expr):
         and isinstance(body[0], vy_nodes.ExprNode)
         and isinstance(else_[0], vy_nodes.ExprNode)
     ):
-        body = body[0]
-        else_ = else_[0]
-        if_node = build_node(vy_nodes.IfExp, test=test, body=body, orelse=else_)
-    else:
-        if_node = build_node(vy_nodes.If, test=test, body=body, orelse=else_)
+        return build_node(vy_nodes.IfExp, test=test, body=body[0], orelse=else_[0])
+    return build_node(vy_nodes.If, test=test, body=body, orelse=else_)
+
+
+def parse_if(expr):
+    # a generator like the operator parsers, so if nested in an if branch or
+    # test is parsed on parse_node's stack
+    # used for base case in cond expansion
+    if expr[1] == models.Keyword("else"):
+        if expr[3] == models.Symbol("None"):
+            return (yield expr[2])
+
+    # Else-if chains (e.g. from cond) are walked iteratively rather than
+    # recursing per branch; nodes are parsed in recursive-descent order
+    # (body, else branch, test) so node ids are unchanged.
+    chain = [(expr, process_body([(yield expr[2])]))]
+    while len(chain[-1][0]) == 4 and _is_if_chain(chain[-1][0][3]):
+        nested = chain[-1][0][3]
+        chain.append((nested, process_body([(yield nested[2])])))
+
+    last = chain[-1][0]
+    else_nodes = [(yield last[3])] if len(last) == 4 else []
+    else_ = process_body(else_nodes)
+    for i in reversed(range(len(chain))):
+        level, body = chain[i]
+        test = yield level[1]
+        if_node = _build_if(test, body, else_)
+        if i > 0:
+            # what parse_node would have recorded for this branch
+            add_src_map(level, if_node)
+        else_ = process_body([if_node])
     return if_node
 
 
@@ -1,8 +1,8 @@
-from typing import List, Union
 from hy import models
-from dasy import parser
 from vyper.ast.nodes import BinOp, Compare, UnaryOp, BoolOp
+from dasy.exceptions import DasySyntaxError
 from .builtins import build_node
+from .utils import add_src_map
 
 BIN_FUNCS = {"+", "-", "/", "//", "*", "**", "%"}
 COMP_FUNCS = {"<", "<=", ">", ">=", "==", "!=", "in", "notin"}
@@ -15,7 +15,13 @@ def is_op(cmd_str):
 
 
 def parse_op(expr, alias=None):
+    # each parser is a generator: it yields the sub-forms it needs parsed and
+    # is sent their nodes, so parse_node can nest operators on its own stack
+    # instead of Python's
     cmd_str = alias or str(expr[0])
+    if cmd_str == "-" and len(expr) == 2:
+        # (- x) negates
+        return parse_unary(models.Expression((models.Symbol("usub"), expr[1])))
     if cmd_str in BIN_FUNCS:
         return parse_binop(expr)
     if cmd_str in COMP_FUNCS:
@@ -26,55 +32,74 @@ def parse_op(expr, alias=None):
         return parse_boolop(expr)
 
 
-def chain_comps(expr):
-    new_node = models.Expression()
-    new_expr: List[Union[models.Symbol, models.Expression]] = [models.Symbol("and")]
-    for vals in zip(expr[1:], expr[2:]):
-        new_expr.append(models.Expression((expr[0], vals[0], vals[1])))
-    new_node += tuple(new_expr)
-    return new_node
+def _parse_compare(op_sym, left_expr, right_expr):
+    left = yield left_expr
+    right = yield right_expr
+    op = yield op_sym
+    return build_node(Compare, left=left, ops=[op], comparators=[right])
 
 
 def parse_comparison(comp_tree):
-    if (
-        len(comp_tree[1:]) > 2
-    ):  # comparing more than 2 things; chain comps for (< 2 3 4 )
-        return parser.parse_node_legacy(chain_comps(comp_tree))
-    left = parser.parse_node_legacy(comp_tree[1])
-    right = parser.parse_node_legacy(comp_tree[2])
-    op = parser.parse_node_legacy(comp_tree[0])
-    return build_node(Compare, left=left, ops=[op], comparators=[right])
+    if len(comp_tree) <= 3:
+        return (yield from _parse_compare(comp_tree[0], comp_tree[1], comp_tree[2]))
+    # comparing more than 2 things: (< a b c) lowers to (a < b) and (b < c)
+    op = yield models.Symbol("and")
+    values = []
+    for left, right in zip(comp_tree[1:], comp_tree[2:]):
+        compare = yield from _parse_compare(comp_tree[0], left, right)
+        values.append(add_src_map(comp_tree, compare))
+    return build_node(BoolOp, op=op, values=values)
 
 
 def parse_unary(expr):
-    operand = parser.parse_node_legacy(expr[1])
-    op = parser.parse_node_legacy(expr[0])
+    operand = yield expr[1]
+    op = yield expr[0]
     return build_node(UnaryOp, operand=operand, op=op)
 
 
 def parse_boolop(expr):
-    op = parser.parse_node_legacy(expr[0])
-    values = [parser.parse_node_legacy(e) for e in expr[1:]]
+    op = yield expr[0]
+    values = []
+    for e in expr[1:]:
+        values.append((yield e))
     return build_node(BoolOp, op=op, values=values)
 
 
-def chain_binops(expr):
-    if len(expr) == 3:
-        return expr
-    else:
-        new_node = models.Expression()
-        tmp_expr = tuple([expr[0], *expr[2:]])
-        tmp_node = models.Expression()
-        tmp_node += tmp_expr
-        subtree = chain_binops(tmp_node)
-        new_node += tuple([expr[0], expr[1], subtree])
-        return new_node
+def _is_binop_expr(expr):
+    return (
+        isinstance(expr, models.Expression)
+        and len(expr) >= 3
+        and isinstance(expr[0], models.Symbol)
+        and str(expr[0]) in BIN_FUNCS
+    )
 
 
 def parse_binop(binop_tree):
-    if len(binop_tree) > 3:
-        return parser.parse_node_legacy(chain_binops(binop_tree))
-    left = parser.parse_node_legacy(binop_tree[1])
-    right = parser.parse_node_legacy(binop_tree[2])
-    op = parser.parse_node_legacy(binop_tree[0])
-    return build_node(BinOp, left=left, right=right, op=op)
+    # (+ a b c d) lowers right-nested, a + (b + (c + d)), straight from the
+    # operand list. A last operand that is itself an operator expression
+    # continues the same spine, so nesting depth costs no Python stack.
+    # Nodes are parsed in the order a recursive descent would (operands
+    # left to right, then ops innermost first), keeping node ids stable.
+    # (operator expression, its parsed operands but the last) per level
+    if len(binop_tree) < 3:
+        raise DasySyntaxError(f"{binop_tree[0]} expects at least two operands")
+    levels = []
+    expr = binop_tree
+    while True:
+        lefts = []
+        for x in expr[1:-1]:
+            lefts.append((yield x))
+        levels.append((expr, lefts))
+        if not _is_binop_expr(expr[-1]):
+            break
+        expr = expr[-1]
+    result = yield expr[-1]
+    for i in reversed(range(len(levels))):
+        expr, lefts = levels[i]
+        for j in reversed(range(len(lefts))):
+            op = yield expr[0]
+            result = build_node(BinOp, left=lefts[j], right=result, op=op)
+            if i or j:
+                # parse_node attaches the outermost node's position itself
+                add_src_map(expr, result)
+    return result
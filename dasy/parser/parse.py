@@ -1,6 +1,7 @@
 import ast as py_ast
 
-from typing import Union, Optional
+from types import GeneratorType
+from typing import Callable, Dict, Iterator, Optional, Tuple, Union
 
 from dasy.parser.macros import handle_macro, is_macro
 
@@ -10,20 +11,24 @@ import vyper.ast.nodes as vy_nodes
 from hy import models
 
 from .builtins import parse_builtin, build_node
-from .reader import read_many as dasy_read_many
+from .reader import iter_forms as dasy_iter_forms
 from .ops import BIN_FUNCS, BOOL_OPS, COMP_FUNCS, UNARY_OPS, is_op, parse_op
-from .utils import add_src_map
+from .utils import add_src_map, set_source_code
 from .context import ParseContext
+from .compat import set_default_context
+from dasy.cancellation import check_stop
+from dasy.timings import phase
 from dasy.exceptions import (
     DasyNotImplementedError,
     DasyUnsupportedError,
     DasyParseError,
 )
 
-# namespaces with expression handlers
+# modules providing expression handlers
 from . import nodes, core, macros
 from dasy.builtin import functions
-from .expander import expand_module
+from .expander import Expander, expand_top_level
+from .incremental import FormReuse
 from ..macro.syntax import MacroEnv
 from . import macros2
 
@@ -79,6 +84,14 @@ DONT_REPLACE = ("tuple",)
 
 
 def parse_expr(expr, context: ParseContext):
+    result = _expr_steps(expr, context)
+    if isinstance(result, GeneratorType):
+        return _run_steps(None, result, context)
+    return result
+
+
+def _expr_steps(expr, context: ParseContext):
+    # the node for expr, or a generator from its handler still to be run
     cmd_str = ALIASES.get(str(expr[0]), str(expr[0]))
 
     if cmd_str != str(expr[0]) and cmd_str not in DONT_REPLACE:
@@ -88,25 +101,12 @@ def parse_expr(expr, context: ParseContext):
         # parse_op expects (expr, alias) not context
         return parse_op(expr, cmd_str)
 
-    if cmd_str in nodes.handlers:
-        # nodes.handlers functions don't expect context
-        return nodes.handlers[cmd_str](expr)
-
-    node_fn = f"parse_{cmd_str}"
-
-    for ns in [nodes, core, macros, functions]:
-        if hasattr(ns, node_fn):
-            func = getattr(ns, node_fn)
-            # Try calling with context first, fall back to without for backwards compatibility
-            try:
-                return func(expr, context)
-            except TypeError as e:
-                if "takes 1 positional argument but 2 were given" in str(e):
-                    # Function doesn't support context yet, call without it
-                    return func(expr)
-                raise
-
-    if is_macro(cmd_str):
+    entry = EXPR_HANDLERS.get(cmd_str)
+    if entry is not None:
+        handler, takes_context = entry
+        return handler(expr, context) if takes_context else handler(expr)
+
+    if is_macro(cmd_str, context):
         return handle_macro(expr, context)
 
     if cmd_str.startswith("."):
@@ -117,17 +117,17 @@ def parse_expr(expr, context: ParseContext):
         outer_node = models.Expression((inner_node, *expr[2:]))
         return parse_node(outer_node, context)
 
-    match cmd_str:
-        case "defconst":
-            context.constants[str(expr[1])] = expr[2]
-            return None
-        case "defimmutable" | "defimm":
-            context.constants[str(expr[1])] = None
-            return None
-        case "+=" | "-=" | "*=" | "/=":
-            return parse_augop(expr, context)
-        case _:
-            return parse_call(expr, context)
+    return parse_call(expr, context)
+
+
+def parse_defconst(expr, context: ParseContext):
+    context.constants[str(expr[1])] = expr[2]
+    return None
+
+
+def parse_defimmutable(expr, context: ParseContext):
+    context.constants[str(expr[1])] = None
+    return None
 
 
 def parse_augop(expr, context: ParseContext):
@@ -196,6 +196,52 @@ def parse_call(expr, context: ParseContext, wrap_expr=False):
             return call_node
 
 
+# head symbol -> (handler, takes_context). Handlers written before
+# ParseContext existed take only the expression.
+EXPR_HANDLERS: Dict[str, Tuple[Callable, bool]] = {
+    **{name: (handler, False) for name, handler in nodes.handlers.items()},
+    "for": (nodes.parse_for, False),
+    "if": (nodes.parse_if, False),
+    "assign": (nodes.parse_assign, False),
+    "extcall": (nodes.parse_extcall, False),
+    "staticcall": (nodes.parse_staticcall, False),
+    "uses": (nodes.parse_uses, False),
+    "initializes": (nodes.parse_initializes, False),
+    "exports": (nodes.parse_exports, False),
+    "attribute": (core.parse_attribute, False),
+    "tuple": (core.parse_tuple, False),
+    "quote": (core.parse_quote, False),
+    "defn": (core.parse_defn, False),
+    "defvars": (core.parse_defvars, False),
+    "variabledecl": (core.parse_variabledecl, False),
+    "annassign": (core.parse_annassign, False),
+    "defcontract": (core.parse_defcontract, False),
+    "defstruct": (core.parse_defstruct, False),
+    "definterface": (core.parse_definterface, False),
+    "defevent": (core.parse_defevent, False),
+    "defflag": (core.parse_defflag, False),
+    "do": (core.parse_do, False),
+    "subscript": (core.parse_subscript, False),
+    "vyper": (functions.parse_vyper, False),
+    "splice": (functions.parse_splice, False),
+    "defmacro": (macros.parse_defmacro, True),
+    "defconst": (parse_defconst, True),
+    "defimmutable": (parse_defimmutable, True),
+    "defimm": (parse_defimmutable, True),
+    **{op: (parse_augop, True) for op in ("+=", "-=", "*=", "/=")},
+}
+
+
+def register_expr_handler(head: str, handler: Callable, takes_context: bool = True):
+    """Dispatch expressions headed by ``head`` to ``handler``.
+
+    A handler may be a generator: it yields each sub-form it needs parsed and
+    is sent back its node, then returns its own node. Those are parsed on an
+    explicit stack, so nesting them deeply costs no Python recursion.
+    """
+    EXPR_HANDLERS[head] = (handler, takes_context)
+
+
 def parse_node(
     node: Union[
         models.Expression,
@@ -213,6 +259,38 @@ def parse_node(
     :param node: A node of the parsed model
     :return: Corresponding AST node, if the node type is supported. Raises exception otherwise.
     """
+    result = _node_steps(node, context)
+    if isinstance(result, GeneratorType):
+        return _run_steps(node, result, context)
+    return result
+
+
+def _run_steps(node, steps, context: ParseContext):
+    """Run a generator handler and those of the sub-forms it yields.
+
+    Each frame is (form, generator); a form's finished node gets the form's
+    position, as parse_node would give it.
+    """
+    stack = [(node, steps)]
+    value = None
+    while True:
+        form, steps = stack[-1]
+        try:
+            child = steps.send(value)
+        except StopIteration as done:
+            stack.pop()
+            value = done.value if form is None else add_src_map(form, done.value)
+            if not stack:
+                return value
+            continue
+        value = _node_steps(child, context)
+        if isinstance(value, GeneratorType):
+            stack.append((child, value))
+            value = None
+
+
+def _node_steps(node, context: ParseContext):
+    # the node for ``node``, or a generator from its handler still to be run
     # Initialize ast_node to None
     ast_node = None
 
@@ -226,7 +304,9 @@ def parse_node(
             if node[0] == models.Symbol("pragma"):
                 if node[1] == models.Keyword("evm-version"):
                     return {"evm_version": str(node[2])}
-            ast_node = parse_expr(node, context)
+            ast_node = _expr_steps(node, context)
+            if isinstance(ast_node, GeneratorType):
+                return ast_node
         case models.Integer(node):
             ast_node = build_node(vy_nodes.Int, value=int(node))
         case models.String(node):
@@ -286,83 +366,143 @@ def parse_node(
             raise DasyUnsupportedError(
                 f"No match for node {node}. Unsupported node type."
             )
-    return add_src_map(context.source_code, node, ast_node)
+    return add_src_map(node, ast_node)
+
+
+# single top-level forms that parse_src places in the module body as-is
+TOP_LEVEL_DECLS = (
+    vy_nodes.VariableDecl,
+    vy_nodes.StructDef,
+    vy_nodes.EventDef,
+    vy_nodes.InterfaceDef,
+    vy_nodes.FlagDef,
+    vy_nodes.UsesDecl,
+    vy_nodes.InitializesDecl,
+    vy_nodes.ExportsDecl,
+    vy_nodes.FunctionDef,
+    vy_nodes.Module,
+)
 
 
-def parse_src(src: str, filepath: Optional[str] = None):
-    # Create context instead of using global variables
-    context = ParseContext(source_path=filepath, source_code=src)
+def _timed_iter(name: str, it: Iterator) -> Iterator:
+    """Yield from ``it``, timing each step as phase ``name``."""
+    while True:
+        check_stop()
+        with phase(name):
+            item = next(it, _DONE)
+        if item is _DONE:
+            return
+        yield item
 
-    # Set default context for backwards compatibility
-    from .compat import set_default_context
 
-    set_default_context(context)
+_DONE = object()
 
-    mod_node: vy_nodes.Module = build_node(
-        vy_nodes.Module, body=[], name="", doc_string=""
-    )
 
-    vars = []
-    fs = []
-    settings = {}
-    # Read raw forms
-    forms = list(dasy_read_many(src))
+def parse_src_iter(
+    src: str, filepath: Optional[str] = None, context: Optional[ParseContext] = None
+) -> Iterator[vy_nodes.VyperNode]:
+    """Yield the top-level Vyper nodes of ``src`` in source order.
+
+    Each top-level form is read, macro-expanded and parsed before the next
+    one is read, so callers that only need some declarations can stop early.
+    Top-level ``def``s are yielded as ``VariableDecl``s, as they appear in the
+    module. ``pragma`` settings are not yielded but collected in
+    ``context.settings``.
+    """
+    # Create context instead of using global variables
+    if context is None:
+        context = ParseContext(source_path=filepath, source_code=src)
+
+    # Set default context for backwards compatibility; this thread's
+    # previous one is restored when the source is exhausted
+    previous = set_default_context(context)
+    try:
+        yield from _parse_forms(src, context)
+    finally:
+        set_default_context(previous)
 
+
+def _parse_forms(src: str, context: ParseContext) -> Iterator[vy_nodes.VyperNode]:
     # Macro expansion pass (Dasy-native), with Hy fallback later during parse
-    env = MacroEnv()
+    env = MacroEnv(limits=context.expansion_limits)
     # Register builtin Dasy macros (cond, doto, ->, ->>, when, unless, let)
     macros2.install_builtin_dasy_macros(env)
+    expander = Expander(env, filename=context.source_path)
+    reuse = None
+    if context.form_cache is not None:
+        reuse = FormReuse(context.form_cache, src, context, env)
+
+    for form in _timed_iter("read", dasy_iter_forms(src, reader=context.reader)):
+        nodes = reuse.lookup(form) if reuse else None
+        if nodes is None:
+            check_stop()
+            with phase("expand"):
+                expanded = expand_top_level(
+                    expander, form, macros2.parse_define_syntax, context
+                )
+            nodes = []
+            for element in expanded:
+                # the caller may have compiled something else since the last form
+                set_default_context(context)
+                with phase("ast"):
+                    try:
+                        ast = parse_node(element, context)
+                    except RecursionError:
+                        where = context.source_path or "<string>"
+                        raise DasyParseError(
+                            f"Form at {where}:{form.start_line}:{form.start_column} "
+                            "is nested too deeply to parse"
+                        ) from None
+                nodes.extend(_top_level_nodes(element, ast, context))
+            if reuse:
+                reuse.record(nodes)
+        for node in nodes:
+            yield set_source_code(src, node)
+
+
+def _top_level_nodes(element, ast, context: ParseContext) -> list:
+    """The module-level declarations parsed from ``element``."""
+    if isinstance(ast, dict):
+        context.settings.update(ast)
+        return []
+    if isinstance(ast, list):
+        return [
+            convert_annassign(node) if isinstance(node, vy_nodes.AnnAssign) else node
+            for node in ast
+        ]
+    if not ast:
+        return []
+    if isinstance(ast, vy_nodes.AnnAssign):
+        return [convert_annassign(ast)]
+    if not isinstance(ast, TOP_LEVEL_DECLS):
+        raise DasyParseError(f"Unrecognized top-level form {element} {ast}")
+    return [ast]
+
+
+def parse_src(
+    src: str, filepath: Optional[str] = None, context: Optional[ParseContext] = None
+):
+    if context is None:
+        context = ParseContext(source_path=filepath, source_code=src)
 
-    # Expand module using Dasy macro system and collect expanded forms
-    forms = expand_module(forms, env, macros2.parse_define_syntax, context)
-
-    for element in forms:
-        # parse each top-level form
-        ast = parse_node(element, context)
-
-        if isinstance(ast, list):
-            for v in ast:
-                add_src_map(src, element, v)
-        elif isinstance(ast, dict):
-            settings.update(ast)
-            continue
-        elif ast:
-            add_src_map(src, element, ast)
-        else:
-            continue
+    mod_node: vy_nodes.Module = build_node(
+        vy_nodes.Module,
+        body=[],
+        name="",
+        doc_string="",
+        node_id=context.next_nodeid(),
+    )
 
+    vars = []
+    fs = []
+    for ast in parse_src_iter(src, filepath, context):
         if isinstance(ast, vy_nodes.Module):
             mod_node = ast
-        elif isinstance(
-            ast,
-            (
-                vy_nodes.VariableDecl,
-                vy_nodes.StructDef,
-                vy_nodes.EventDef,
-                vy_nodes.InterfaceDef,
-                vy_nodes.FlagDef,
-                vy_nodes.UsesDecl,
-                vy_nodes.InitializesDecl,
-                vy_nodes.ExportsDecl,
-            ),
-        ):
-            vars.append(ast)
         elif isinstance(ast, vy_nodes.FunctionDef):
             fs.append(ast)
-        elif isinstance(ast, list):
-            for var in ast:
-                var_node = var
-                if isinstance(var, vy_nodes.AnnAssign):
-                    var_node = convert_annassign(var)
-                elif isinstance(var, vy_nodes.FunctionDef):
-                    fs.append(var)
-                    continue
-                vars.append(var_node)
-        elif isinstance(ast, vy_nodes.AnnAssign):
-            new_node = convert_annassign(ast)
-            vars.append(new_node)
         else:
-            raise DasyParseError(f"Unrecognized top-level form {element} {ast}")
+            vars.append(ast)
+    settings = context.settings
 
     # Update module body and set parent relationships
     mod_node.body.extend(vars + fs)
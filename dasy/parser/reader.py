@@ -1,8 +1,15 @@
 """
 DasyReader - Custom Hy reader for Dasy language
 Extends HyReader to handle 0x literals as symbols instead of integers
+
+``read_many`` uses the scan-based reader in ``native_reader`` by default and
+falls back to DasyReader for syntax it does not cover. Pass ``reader="hy"``,
+``dasy --reader hy`` or set ``DASY_READER=hy`` to always use DasyReader.
 """
 
+import os
+from itertools import islice
+
 import hy
 from hy.reader.hy_reader import HyReader, as_identifier as hy_as_identifier
 from hy import models
@@ -46,11 +53,46 @@ class DasyReader(HyReader):
         return hy_as_identifier(ident, reader=self)
 
 
-def read_many(src, filename="<string>"):
+READERS = ("native", "hy")
+
+
+def default_reader() -> str:
+    return os.environ.get("DASY_READER", "native")
+
+
+def iter_forms(src, filename="<string>", reader=None):
     """
-    Read multiple Dasy forms from source text using DasyReader.
+    Yield the top-level Dasy forms of source text as they are read.
+
+    ``reader`` is "native" or "hy"; None uses ``default_reader()``.
+    """
+    reader = reader or default_reader()
+    if reader not in READERS:
+        raise ValueError(f"Unknown reader {reader!r}, expected one of {READERS}")
+    done = 0
+    if reader == "native":
+        from .native_reader import Unsupported, iter_forms as native_forms
+
+        try:
+            for form in native_forms(src):
+                yield form
+                done += 1
+            return
+        except Unsupported:
+            pass
+    # both readers produce the same forms, so skip those already yielded
+    yield from islice(
+        hy.read_many(src, filename=filename, reader=DasyReader()), done, None
+    )
+
+
+def read_many(src, filename="<string>", reader=None):
+    """
+    Read multiple Dasy forms from source text.
+
+    ``reader`` is "native" or "hy"; None uses ``default_reader()``.
     """
-    return list(hy.read_many(src, filename=filename, reader=DasyReader()))
+    return list(iter_forms(src, filename=filename, reader=reader))
 
 
 def read(src, filename="<string>"):
@@ -0,0 +1,251 @@
+"""Long-lived compile server (``dasy serve``) and its client.
+
+The server keeps hy, vyper and the builtin macros imported and answers
+compile requests over a Unix domain socket. Each connection carries one
+newline-terminated JSON request and receives one JSON response:
+
+    {"path": "/abs/file.dasy", "formats": ["abi"], "settings": {...}}
+    {"source": "(defn ...)", "name": "Foo", "filepath": "...", "formats": [...]}
+    -> {"ok": true, "outputs": {"abi": [...]}}
+    -> {"ok": false, "error": "...", "type": "DasySyntaxError"}
+
+``settings`` may hold ``evm_version``, ``expansion_limits``, ``reader`` and
+``no_cache``, as given on the ``dasy`` command line.
+
+``{"command": "ping"}`` and ``{"command": "shutdown"}`` are also accepted.
+This module only imports the compiler on the server side so that the
+client stays cheap to start.
+"""
+
+import argparse
+import json
+import logging
+import os
+import socket
+import socketserver
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence
+
+from dasy.exceptions import DasyUsageError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_IDLE_TIMEOUT = 600.0
+
+
+def default_socket_path() -> str:
+    env_path = os.environ.get("DASY_SERVER_SOCKET")
+    if env_path:
+        return env_path
+    from dasy.cache import default_cache_dir
+
+    return str(default_cache_dir() / "server.sock")
+
+
+def _jsonable(value):
+    try:
+        json.dumps(value)
+        return value
+    except (TypeError, ValueError):
+        return str(value)
+
+
+def warm_up() -> None:
+    """Import the compiler and load the builtin macros ahead of any request."""
+    from dasy import compiler  # noqa: F401
+    from dasy.parser import macros
+
+    macros.ensure_builtin_macros()
+
+
+def compile_request(payload: Dict[str, Any], cache=None) -> Dict[str, Any]:
+    """Run one compile request and build its response. Never raises."""
+    from dasy import compiler
+    from dasy.main import resolve_formats
+
+    try:
+        if "path" in payload:
+            filepath = payload["path"]
+            src = Path(filepath).read_text()
+            name = payload.get("name", Path(filepath).stem)
+        elif "source" in payload:
+            src = payload["source"]
+            filepath = payload.get("filepath")
+            name = payload.get("name", "DasyContract")
+        else:
+            raise DasyUsageError("request needs a 'path' or 'source'")
+
+        settings = payload.get("settings", {})
+        evm_version = settings.get("evm_version")
+        if evm_version and not (filepath or "").endswith(".vy"):
+            src = src + f"\n(pragma :evm-version {evm_version})\n"
+
+        limits = settings.get("expansion_limits")
+        if limits:
+            from dasy.macro.syntax import ExpansionLimits
+
+            limits = ExpansionLimits(**limits)
+
+        formats = resolve_formats(payload.get("formats", ["bytecode"]))
+        outputs = compiler.compile_artifacts(
+            src,
+            name=name,
+            filepath=filepath,
+            formats=tuple(formats),
+            cache=None if settings.get("no_cache") else cache,
+            expansion_limits=limits or None,
+            reader=settings.get("reader"),
+        )
+        return {"ok": True, "outputs": {k: _jsonable(v) for k, v in outputs.items()}}
+    except Exception as e:
+        return {"ok": False, "error": str(e), "type": type(e).__name__}
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        server = self.server
+        server.begin_request()
+        try:
+            line = self.rfile.readline()
+            try:
+                payload = json.loads(line)
+            except ValueError as e:
+                response = {"ok": False, "error": f"bad request: {e}", "type": "Usage"}
+            else:
+                response = server.dispatch(payload)
+            self.wfile.write(json.dumps(response).encode() + b"\n")
+        finally:
+            server.end_request()
+
+
+class CompileServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Threaded Unix socket server that shuts itself down when idle."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        socket_path: str,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+        cache=None,
+    ):
+        self.socket_path = socket_path
+        self.idle_timeout = idle_timeout
+        self.cache = cache
+        self._state_lock = threading.Lock()
+        self._in_flight = 0
+        self._last_activity = time.monotonic()
+        _claim_socket_path(socket_path)
+        super().__init__(socket_path, _Handler)
+
+    def begin_request(self):
+        with self._state_lock:
+            self._in_flight += 1
+            self._last_activity = time.monotonic()
+
+    def end_request(self):
+        with self._state_lock:
+            self._in_flight -= 1
+            self._last_activity = time.monotonic()
+
+    def dispatch(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        command = payload.get("command", "compile")
+        if command == "ping":
+            return {"ok": True, "pid": os.getpid()}
+        if command == "shutdown":
+            threading.Thread(target=self.shutdown, daemon=True).start()
+            return {"ok": True}
+        if command != "compile":
+            return {"ok": False, "error": f"unknown command {command}", "type": "Usage"}
+        return compile_request(payload, self.cache)
+
+    def _watch_idle(self):
+        while True:
+            time.sleep(min(1.0, self.idle_timeout))
+            with self._state_lock:
+                idle = time.monotonic() - self._last_activity
+                if self._in_flight == 0 and idle >= self.idle_timeout:
+                    break
+        logger.info(f"dasy server idle for {idle:.0f}s, shutting down")
+        self.shutdown()
+
+    def serve_forever(self, poll_interval=0.5):
+        if self.idle_timeout:
+            threading.Thread(target=self._watch_idle, daemon=True).start()
+        try:
+            super().serve_forever(poll_interval)
+        finally:
+            self.server_close()
+
+    def server_close(self):
+        super().server_close()
+        try:
+            os.unlink(self.socket_path)
+        except FileNotFoundError:
+            pass
+
+
+def _claim_socket_path(socket_path: str) -> None:
+    """Remove a stale socket file, refusing if a server is still listening."""
+    if not os.path.exists(socket_path):
+        Path(socket_path).parent.mkdir(parents=True, exist_ok=True)
+        return
+    try:
+        request({"command": "ping"}, socket_path, timeout=1.0)
+    except (OSError, ValueError):
+        os.unlink(socket_path)
+        return
+    raise DasyUsageError(f"A dasy server is already listening on {socket_path}")
+
+
+def request(
+    payload: Dict[str, Any],
+    socket_path: Optional[str] = None,
+    timeout: Optional[float] = None,
+) -> Dict[str, Any]:
+    """Send one request to a running server and return its response."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(socket_path or default_socket_path())
+        sock.sendall(json.dumps(payload).encode() + b"\n")
+        chunks = []
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    return json.loads(b"".join(chunks))
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="dasy serve", description="Run a warm dasy compile server"
+    )
+    parser.add_argument(
+        "--socket", default=None, help="Unix socket path ($DASY_SERVER_SOCKET)"
+    )
+    parser.add_argument(
+        "--idle-timeout",
+        type=float,
+        default=DEFAULT_IDLE_TIMEOUT,
+        help="Exit after this many idle seconds (0 to never exit)",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Do not use the artifact cache"
+    )
+    args = parser.parse_args(argv)
+
+    warm_up()
+    from dasy.cache import ArtifactCache
+
+    socket_path = args.socket or default_socket_path()
+    server = CompileServer(
+        socket_path,
+        idle_timeout=args.idle_timeout,
+        cache=None if args.no_cache else ArtifactCache(),
+    )
+    print(f"dasy server listening on {socket_path}")
+    server.serve_forever()
+    return 0
@@ -0,0 +1,108 @@
+"""Per-phase wall-clock timings for the compile pipeline.
+
+Instrumented code wraps its work in ``phase(name)``. Nothing is recorded
+unless a collector is active on the current thread:
+
+    with collect_timings() as timings:
+        dasy.compile(src)
+    print(timings.format_table())
+
+Times are exclusive: a phase nested inside another (e.g. Hy macro expansion
+during AST construction) is not also counted towards its parent.
+"""
+
+import json
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Iterator, List
+
+# Pipeline order, used to sort reports
+PHASES = (
+    "cache",
+    "read",
+    "expand",
+    "hy_macros",
+    "ast",
+    "vyper_imports",
+    "typecheck",
+    "layout",
+    "ir",
+    "assembly",
+    "bytecode",
+    "output",
+)
+
+_thread_local = threading.local()
+_NULL = nullcontext()
+
+
+class Timings:
+    def __init__(self):
+        self.seconds: Dict[str, float] = {}
+        self.calls: Dict[str, int] = {}
+        # [name, start, time spent in nested phases]
+        self._stack: List[list] = []
+
+    def _enter(self, name: str) -> None:
+        self._stack.append([name, time.perf_counter(), 0.0])
+
+    def _exit(self) -> None:
+        name, start, nested = self._stack.pop()
+        elapsed = time.perf_counter() - start
+        self.seconds[name] = self.seconds.get(name, 0.0) + elapsed - nested
+        self.calls[name] = self.calls.get(name, 0) + 1
+        if self._stack:
+            self._stack[-1][2] += elapsed
+
+    @property
+    def total(self) -> float:
+        return sum(self.seconds.values())
+
+    def as_dict(self) -> Dict[str, Dict[str, float]]:
+        order = {p: i for i, p in enumerate(PHASES)}
+        names = sorted(self.seconds, key=lambda n: (order.get(n, len(order)), n))
+        return {n: {"seconds": self.seconds[n], "calls": self.calls[n]} for n in names}
+
+    def to_json(self) -> str:
+        return json.dumps({"phases": self.as_dict(), "total": self.total}, indent=2)
+
+    def format_table(self) -> str:
+        rows = [f"{'phase':<14}{'calls':>8}{'ms':>12}{'%':>8}"]
+        total = self.total or 1.0
+        for name, row in self.as_dict().items():
+            rows.append(
+                f"{name:<14}{row['calls']:>8}{row['seconds'] * 1000:>12.2f}"
+                f"{100 * row['seconds'] / total:>8.1f}"
+            )
+        rows.append(f"{'total':<14}{'':>8}{self.total * 1000:>12.2f}")
+        return "\n".join(rows)
+
+
+@contextmanager
+def _timed(timings: Timings, name: str):
+    timings._enter(name)
+    try:
+        yield
+    finally:
+        timings._exit()
+
+
+def phase(name: str):
+    """Context manager timing ``name`` on the active collector, if any."""
+    timings = getattr(_thread_local, "timings", None)
+    if timings is None:
+        return _NULL
+    return _timed(timings, name)
+
+
+@contextmanager
+def collect_timings() -> Iterator[Timings]:
+    """Record phase timings for compilations run on this thread."""
+    previous = getattr(_thread_local, "timings", None)
+    timings = Timings()
+    _thread_local.timings = timings
+    try:
+        yield timings
+    finally:
+        _thread_local.timings = previous
@@ -84,6 +84,10 @@ def vy_unaryop(op) -> str:
     return "?"
 
 
+def vy_boolop(op) -> str:
+    return {n.And: "and", n.Or: "or"}.get(type(op), "?")
+
+
 def vy_expr_to_str(e: n.AST) -> str:
     if isinstance(e, n.Name):
         return e.id
@@ -128,6 +132,9 @@ def vy_expr_to_str(e: n.AST) -> str:
         return f"extcall {vy_expr_to_str(e.value)}"
     if isinstance(e, n.BinOp):
         return f"({vy_expr_to_str(e.left)} {vy_binop(e.op)} {vy_expr_to_str(e.right)})"
+    if isinstance(e, n.BoolOp):
+        values = [vy_expr_to_str(v) for v in e.values]
+        return "(" + _join(values, sep=f" {vy_boolop(e.op)} ") + ")"
     if isinstance(e, n.UnaryOp):
         _op = vy_unaryop(e.op)
         _expr = vy_expr_to_str(e.operand)
@@ -245,6 +252,9 @@ def dasy_expr_from_vy(e: n.AST) -> str:
     if isinstance(e, n.BinOp):
         op = vy_binop(e.op)
         return f"({op} {dasy_expr_from_vy(e.left)} {dasy_expr_from_vy(e.right)})"
+    if isinstance(e, n.BoolOp):
+        values = _join([dasy_expr_from_vy(v) for v in e.values], sep=" ")
+        return f"({vy_boolop(e.op)} {values})"
     if isinstance(e, n.UnaryOp):
         op = vy_unaryop(e.op)
         if op in ("+", "-"):
@@ -0,0 +1,402 @@
+"""Rebuild contracts as they change (``dasy watch``).
+
+Every contract under the given paths is built once, in this process, and
+the files it pulled in through ``include!`` or ``interface!`` (the
+``ParseContext.dependencies`` of its compile) are recorded in a reverse
+dependency graph. When files change, only the contracts that are themselves
+changed or depend on a changed file are rebuilt. Since the compiler stays
+imported between rebuilds, along with the include/interface caches and a
+FormCache that skips unchanged top-level forms, a rebuild costs little more
+than the parts that changed.
+
+Changes are picked up with inotify on Linux and by polling file states
+elsewhere (or with ``--poll``). A burst of events, such as an editor's
+write-and-rename, is gathered until the files have been quiet for
+``--debounce`` seconds, then handled as one rebuild.
+"""
+
+import argparse
+import ctypes
+import ctypes.util
+import glob
+import os
+import select
+import struct
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set
+
+from dasy.build import (
+    DEFAULT_BUILD_FORMATS,
+    BuildResult,
+    build_one,
+    discover_sources,
+    format_result,
+)
+from dasy.exceptions import DasyUsageError
+
+DEFAULT_DEBOUNCE = 0.2
+DEFAULT_POLL_INTERVAL = 0.5
+
+
+def _abspath(path) -> Path:
+    return Path(os.path.abspath(path))
+
+
+class DependencyGraph:
+    """Which contracts depend on which files, and the reverse."""
+
+    def __init__(self):
+        self._dependencies: Dict[Path, Set[Path]] = {}
+        self._dependents: Dict[Path, Set[Path]] = defaultdict(set)
+
+    def set_dependencies(self, target: Path, dependencies: Iterable[Path]) -> None:
+        self.remove(target)
+        self._dependencies[target] = set(dependencies)
+        for dep in self._dependencies[target]:
+            self._dependents[dep].add(target)
+
+    def remove(self, target: Path) -> None:
+        for dep in self._dependencies.pop(target, ()):
+            self._dependents[dep].discard(target)
+            if not self._dependents[dep]:
+                del self._dependents[dep]
+
+    def dependencies(self, target: Path) -> Set[Path]:
+        return set(self._dependencies.get(target, ()))
+
+    def affected(self, changed: Iterable[Path]) -> Set[Path]:
+        """The targets that are among ``changed`` or depend on one of them.
+
+        Recorded dependencies are already transitive, as an include!'s own
+        includes are expanded in the same compile.
+        """
+        targets = set()
+        for path in changed:
+            if path in self._dependencies:
+                targets.add(path)
+            targets |= self._dependents.get(path, set())
+        return targets
+
+    def files(self) -> Set[Path]:
+        """Every target and every file a target depends on."""
+        return set(self._dependencies) | set(self._dependents)
+
+
+class PollingFileWatcher:
+    """Reports files whose modification time or size changed."""
+
+    def __init__(self, interval: float = DEFAULT_POLL_INTERVAL):
+        self.interval = interval
+        self._states: Dict[Path, Optional[tuple]] = {}
+
+    @staticmethod
+    def _state(path: Path) -> Optional[tuple]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def watch(self, paths: Iterable[Path]) -> None:
+        """Watch exactly ``paths``; files or directories."""
+        self._states = {
+            path: self._states[path] if path in self._states else self._state(path)
+            for path in paths
+        }
+
+    def _scan(self) -> Set[Path]:
+        changed = set()
+        for path, state in self._states.items():
+            current = self._state(path)
+            if current != state:
+                self._states[path] = current
+                changed.add(path)
+        return changed
+
+    def changes(self, timeout: Optional[float] = None) -> Set[Path]:
+        """Wait up to ``timeout`` seconds (None: forever) for changes."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            changed = self._scan()
+            if changed:
+                return changed
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return changed
+            time.sleep(
+                self.interval if remaining is None else min(remaining, self.interval)
+            )
+
+    def close(self) -> None:
+        pass
+
+
+# from <sys/inotify.h>
+IN_MODIFY = 0x2
+IN_ATTRIB = 0x4
+IN_CLOSE_WRITE = 0x8
+IN_MOVED_FROM = 0x40
+IN_MOVED_TO = 0x80
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_Q_OVERFLOW = 0x4000
+IN_IGNORED = 0x8000
+IN_ONLYDIR = 0x1000000
+
+_ENTRY_EVENTS = IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO
+_WATCH_MASK = _ENTRY_EVENTS | IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_ONLYDIR
+_EVENT = struct.Struct("iIII")
+
+
+class InotifyFileWatcher:
+    """Reports changed files through Linux inotify.
+
+    The directories holding the watched files are watched rather than the
+    files themselves, so files replaced by a rename are still seen. A watched
+    directory is reported when an entry in it is created, deleted or moved.
+    """
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32)
+        self._rm_watch = libc.inotify_rm_watch
+        self._fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        self._paths: Set[Path] = set()
+        self._dirs: Dict[int, Path] = {}
+
+    def watch(self, paths: Iterable[Path]) -> None:
+        self._paths = set(paths)
+        wanted = {p if p.is_dir() else p.parent for p in self._paths}
+        for wd, directory in list(self._dirs.items()):
+            if directory not in wanted:
+                self._rm_watch(self._fd, wd)
+                del self._dirs[wd]
+        watched = set(self._dirs.values())
+        for directory in wanted - watched:
+            wd = self._add_watch(self._fd, os.fsencode(directory), _WATCH_MASK)
+            if wd >= 0:
+                self._dirs[wd] = directory
+
+    def _read(self) -> Set[Path]:
+        changed = set()
+        while True:
+            try:
+                data = os.read(self._fd, 65536)
+            except BlockingIOError:
+                return changed
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = _EVENT.unpack_from(data, offset)
+                offset += _EVENT.size
+                name = data[offset : offset + length].rstrip(b"\0")
+                offset += length
+                if mask & IN_Q_OVERFLOW:
+                    # events were dropped; anything may have changed
+                    changed |= self._paths
+                    continue
+                directory = self._dirs.get(wd)
+                if directory is None:
+                    continue
+                if mask & IN_IGNORED:
+                    del self._dirs[wd]
+                path = directory / os.fsdecode(name)
+                if path in self._paths:
+                    changed.add(path)
+                if mask & _ENTRY_EVENTS and directory in self._paths:
+                    changed.add(directory)
+
+    def changes(self, timeout: Optional[float] = None) -> Set[Path]:
+        """Wait up to ``timeout`` seconds (None: forever) for changes."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = (
+                None if deadline is None else max(0, deadline - time.monotonic())
+            )
+            ready, _, _ = select.select([self._fd], [], [], remaining)
+            changed = self._read() if ready else set()
+            if changed or not ready:
+                return changed
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+def file_watcher(poll: bool = False, interval: float = DEFAULT_POLL_INTERVAL):
+    """An inotify watcher where available, else a polling one."""
+    if not poll and sys.platform.startswith("linux"):
+        try:
+            return InotifyFileWatcher()
+        except (OSError, AttributeError, TypeError):
+            pass
+    return PollingFileWatcher(interval)
+
+
+def wait_for_changes(watcher, debounce: float = DEFAULT_DEBOUNCE) -> Set[Path]:
+    """Block for a change, then gather more until ``debounce`` seconds pass quietly."""
+    changed = watcher.changes(None)
+    while True:
+        more = watcher.changes(debounce)
+        if not more:
+            return changed
+        changed |= more
+
+
+class ProjectWatcher:
+    """Builds the contracts found under ``patterns`` and keeps them built."""
+
+    def __init__(
+        self,
+        patterns: Sequence[str],
+        out_dir: str,
+        formats: Sequence[str] = DEFAULT_BUILD_FORMATS,
+        watcher=None,
+        debounce: float = DEFAULT_DEBOUNCE,
+        report: Callable[[BuildResult], None] = None,
+    ):
+        from dasy.parser.incremental import FormCache
+
+        self.patterns = list(patterns)
+        self.out_dir = Path(out_dir)
+        self.formats = tuple(formats)
+        self.watcher = watcher if watcher is not None else file_watcher()
+        self.debounce = debounce
+        self.report = report or (lambda result: print(format_result(result)))
+        self.graph = DependencyGraph()
+        self.form_cache = FormCache()
+        self.sources: Set[Path] = set()
+        # directories given as patterns, watched for new contracts
+        self.roots = {_abspath(p) for p in self.patterns if Path(p).is_dir()}
+        # files named outright, watched even while missing so that they are
+        # rebuilt when they come back
+        self.named = {
+            _abspath(p)
+            for p in self.patterns
+            if not Path(p).is_dir() and not glob.has_magic(p)
+        }
+
+    def discover(self) -> Set[Path]:
+        """Refresh the set of sources, returning the ones not seen before."""
+        found = discover_sources(self.patterns, missing_ok=True)
+        sources = {_abspath(p) for p in found}
+        for gone in sorted(self.sources - sources):
+            self.graph.remove(gone)
+            self.report(BuildResult(str(gone), False, 0.0, error="source removed"))
+        new = sources - self.sources
+        self.sources = sources
+        return new
+
+    def build_one(self, path: Path) -> BuildResult:
+        """Compile ``path``, write its artifacts and record its dependencies."""
+        # always compile: a warm artifact cache entry would not tell us what
+        # the contract depends on
+        dependencies: Set[str] = set()
+        result = build_one(
+            str(path),
+            str(self.out_dir),
+            self.formats,
+            use_cache=False,
+            form_cache=self.form_cache,
+            dependencies=dependencies,
+        )
+        deps = {_abspath(d) for d in dependencies}
+        if not result.ok:
+            # keep watching what it used to depend on, so fixing a broken
+            # include! brings it back
+            deps |= self.graph.dependencies(path)
+        self.graph.set_dependencies(path, deps)
+        return result
+
+    def build(self, targets: Iterable[Path]) -> List[BuildResult]:
+        results = []
+        for path in sorted(targets):
+            result = self.build_one(path)
+            self.report(result)
+            results.append(result)
+        return results
+
+    def watched_paths(self) -> Set[Path]:
+        return self.graph.files() | self.sources | self.roots | self.named
+
+    def start(self) -> List[BuildResult]:
+        """Build every contract and start watching."""
+        self.discover()
+        results = self.build(self.sources)
+        self.watcher.watch(self.watched_paths())
+        return results
+
+    def handle(self, changed: Set[Path]) -> List[BuildResult]:
+        """Rebuild what ``changed`` affects and update the watched files."""
+        new = set()
+        if changed & (self.roots | self.named - self.sources) or any(
+            not p.exists() for p in changed
+        ):
+            new = self.discover()
+        targets = (self.graph.affected(changed) | new) & self.sources
+        results = self.build(targets)
+        self.watcher.watch(self.watched_paths())
+        return results
+
+    def run(self) -> None:
+        self.start()
+        while True:
+            self.handle(wait_for_changes(self.watcher, self.debounce))
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    from dasy.main import resolve_formats
+
+    parser = argparse.ArgumentParser(
+        prog="dasy watch",
+        description="Rebuild contracts when they or their includes change",
+    )
+    parser.add_argument(
+        "paths", nargs="+", help="Directories, files or glob patterns to watch"
+    )
+    parser.add_argument(
+        "-o", "--output-dir", default="out", help="Directory for artifacts"
+    )
+    parser.add_argument(
+        "-f",
+        "--format",
+        default=",".join(DEFAULT_BUILD_FORMATS),
+        help="Comma-separated output formats to write per contract",
+    )
+    parser.add_argument(
+        "--poll", action="store_true", help="Poll for changes instead of inotify"
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=DEFAULT_POLL_INTERVAL,
+        help="Seconds between polls with --poll",
+    )
+    parser.add_argument(
+        "--debounce",
+        type=float,
+        default=DEFAULT_DEBOUNCE,
+        help="Quiet seconds to wait for before rebuilding",
+    )
+    args = parser.parse_args(argv)
+
+    formats = resolve_formats(args.format.split(","))
+    if not discover_sources(args.paths):
+        raise DasyUsageError("No .dasy or .vy sources found")
+    watcher = file_watcher(args.poll, args.interval)
+    project = ProjectWatcher(
+        args.paths, args.output_dir, formats, watcher, args.debounce
+    )
+    print(f"watching {len(args.paths)} path(s) with {type(watcher).__name__}")
+    try:
+        project.run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+    return 0
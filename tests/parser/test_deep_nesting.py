@@ -0,0 +1,102 @@
+import sys
+
+import pytest
+import vyper.ast.nodes as vy_nodes
+
+from dasy.exceptions import DasyParseError
+from dasy.parser import parse_src
+
+
+@pytest.fixture(autouse=True)
+def default_recursion_limit():
+    # the test environment may raise the limit; check against CPython's
+    limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(1000)
+    yield
+    sys.setrecursionlimit(limit)
+
+
+def fn_returning(expr):
+    return f"(defn f [:uint256 x] :uint256 :external (return {expr}))"
+
+
+def returned_value(src):
+    mod, _ = parse_src(src)
+    return mod.body[0].body[-1].value
+
+
+def test_long_operator_chain_parses_without_recursion():
+    n = 5000
+    node = returned_value(fn_returning(f"(+ {' '.join(['x'] * n)})"))
+    # (+ a b c ...) nests to the right: a + (b + (c + ...))
+    depth = 0
+    while isinstance(node, vy_nodes.BinOp):
+        node = node.right
+        depth += 1
+    assert depth == n - 1
+
+
+def test_long_cond_parses_without_recursion():
+    n = 1500
+    clauses = " ".join(f"(== x {i}) {i}" for i in range(n))
+    node = returned_value(fn_returning(f"(cond {clauses} :else 0)"))
+    tests = []
+    while isinstance(node, vy_nodes.IfExp):
+        tests.append(node.test.right.value)
+        node = node.orelse
+    assert tests == list(range(n))
+    assert node.value == 0
+
+
+def test_deep_if_statements_parse_without_recursion():
+    # a flat cond expands to nested ifs without deeply nested source
+    n = 1500
+    clauses = " ".join(f"(== x {i}) (pass)" for i in range(n))
+    mod, _ = parse_src(f"(defn f [:uint256 x] :external (cond {clauses}))")
+    node = mod.body[0].body[0]
+    count = 0
+    while isinstance(node, vy_nodes.If):
+        count += 1
+        node = node.orelse[0] if node.orelse else None
+    assert count == n
+
+
+def test_left_nested_arithmetic_parses_without_recursion():
+    n = 1000
+    node = returned_value(fn_returning("(+ " * n + "x" + " 1)" * n))
+    depth = 0
+    while isinstance(node, vy_nodes.BinOp):
+        node = node.left
+        depth += 1
+    assert depth == n and node.id == "x"
+
+
+def test_nested_unary_ops_parse_without_recursion():
+    n = 1000
+    node = returned_value(fn_returning("(- (not " * (n // 2) + "x" + "))" * (n // 2)))
+    ops = []
+    while isinstance(node, vy_nodes.UnaryOp):
+        ops.append(type(node.op).__name__)
+        node = node.operand
+    assert ops == ["USub", "Not"] * (n // 2) and node.id == "x"
+
+
+def test_cond_nested_in_clause_body_parses_without_recursion():
+    n = 1000
+    inner = "(cond (== x 0) " * n + "1" + " :else 0)" * n
+    node = returned_value(fn_returning(inner))
+    depth = 0
+    while isinstance(node, vy_nodes.IfExp):
+        assert node.orelse.value == 0
+        node = node.body
+        depth += 1
+    assert depth == n and node.value == 1
+
+
+def test_too_deep_nesting_reports_the_form():
+    # calls still recurse; they fail with the form's position, not a
+    # bare RecursionError
+    n = 5000
+    src = "\n" + fn_returning("(f " * n + "x" + ")" * n)
+    with pytest.raises(DasyParseError, match="deep.dasy:2:1"):
+        parse_src(src, filepath="deep.dasy")
@@ -0,0 +1,35 @@
+import pytest
+from hy import models
+
+from dasy.parser import parse
+from dasy.parser.context import ParseContext
+
+
+def test_handlers_cover_parse_namespaces():
+    assert parse.EXPR_HANDLERS["defn"][0] is parse.core.parse_defn
+    assert parse.EXPR_HANDLERS["defmacro"] == (parse.macros.parse_defmacro, True)
+    assert parse.EXPR_HANDLERS["return"][1] is False
+    # helpers that are not forms of their own are not dispatchable
+    for helper in ("expr", "fn_body", "args_list", "declaration"):
+        assert helper not in parse.EXPR_HANDLERS
+
+
+def test_handler_type_errors_propagate(monkeypatch):
+    calls = []
+
+    def broken(expr, context):
+        calls.append(expr)
+        raise TypeError("takes 1 positional argument but 2 were given")
+
+    monkeypatch.setitem(parse.EXPR_HANDLERS, "broken", (broken, True))
+    expr = models.Expression([models.Symbol("broken"), models.Integer(1)])
+    with pytest.raises(TypeError):
+        parse.parse_expr(expr, ParseContext())
+    assert len(calls) == 1
+
+
+def test_register_expr_handler(monkeypatch):
+    monkeypatch.setattr(parse, "EXPR_HANDLERS", dict(parse.EXPR_HANDLERS))
+    parse.register_expr_handler("seven", lambda expr: 7, takes_context=False)
+    expr = models.Expression([models.Symbol("seven")])
+    assert parse.parse_expr(expr, ParseContext()) == 7
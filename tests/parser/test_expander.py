@@ -0,0 +1,130 @@
+import hy
+import pytest
+from hy import models
+
+from dasy.macro.syntax import MacroEnv
+from dasy.parser.context import ParseContext
+from dasy.parser.expander import Expander, expand_module
+from dasy.parser.macros2 import install_builtin_dasy_macros, parse_define_syntax
+
+
+@pytest.fixture
+def env():
+    env = MacroEnv()
+    install_builtin_dasy_macros(env)
+    return env
+
+
+def cond_chain(n):
+    clauses = " ".join(f"(= x {i}) (f {i})" for i in range(n))
+    return hy.read(f"(cond {clauses})")
+
+
+def test_unchanged_forms_are_shared(env):
+    form = hy.read("(defn f [] :external (foo (bar 1) [2 3]))")
+    assert Expander(env).expand(form) is form
+
+
+def test_only_changed_path_is_rebuilt(env):
+    form = hy.read("(do (a 1) (when t (b 2)))")
+    out = Expander(env).expand(form)
+    assert out == hy.read("(do (a 1) (if t (do (b 2))))")
+    assert out[1] is form[1]
+    assert out[2][2][1] is form[2][2]
+
+
+def test_cond_chain_visits_are_linear(env):
+    visits = []
+    for n in (50, 100, 200):
+        expander = Expander(env)
+        expander.expand(cond_chain(n))
+        visits.append(expander.visits)
+    assert visits[2] - visits[1] == 2 * (visits[1] - visits[0])
+
+
+def test_unpaired_cond_clause_is_a_syntax_error(env):
+    from dasy.exceptions import DasySyntaxError
+
+    with pytest.raises(DasySyntaxError, match="test/expression pairs"):
+        Expander(env).expand(hy.read("(cond (= x 1) (f 1) (= x 2))"))
+
+
+def test_list_results_are_spliced(env):
+    def pair(call_stx, _env):
+        return models.List([hy.read("(when a b)"), models.List([hy.read("(c)")])])
+
+    env.define("pair", pair)
+    ctx = ParseContext()
+    out = expand_module([hy.read("(pair)")], env, parse_define_syntax, ctx)
+    assert out == [hy.read("(if a (do b))"), hy.read("(c)")]
+    assert ctx.expand_visits > 0
+
+
+LOOPING = """
+(define-syntax forever
+  (syntax-rules ()
+    ((forever x) (forever x))))
+(defn f [] :uint256 [:external :pure]
+  (forever 1))
+"""
+
+GROWING = """
+(define-syntax grow
+  (syntax-rules ()
+    ((grow x) (+ 1 (grow x)))))
+(defn f [] :uint256 [:external :pure]
+  (grow 1))
+"""
+
+
+def test_self_expanding_macro_hits_step_limit():
+    from dasy import compiler
+    from dasy.exceptions import DasyMacroExpansionError
+    from dasy.macro.syntax import ExpansionLimits
+
+    with pytest.raises(DasyMacroExpansionError) as exc:
+        compiler.compile(
+            LOOPING,
+            filepath="loop.dasy",
+            expansion_limits=ExpansionLimits(max_steps=50),
+        )
+    assert exc.value.macro == "forever"
+    assert exc.value.location == ("loop.dasy", 6, 3)
+    assert "max_steps=50" in str(exc.value)
+    assert "loop.dasy:6:3" in str(exc.value)
+
+
+def test_nested_growth_hits_depth_limit():
+    from dasy.exceptions import DasyMacroExpansionError
+    from dasy.macro.syntax import ExpansionLimits
+    from dasy.parser import parse_src
+
+    ctx = ParseContext(expansion_limits=ExpansionLimits(max_depth=20))
+    with pytest.raises(DasyMacroExpansionError, match="max_depth=20") as exc:
+        parse_src(GROWING, context=ctx)
+    assert exc.value.macro == "grow"
+    # the default budget stops it too
+    with pytest.raises(DasyMacroExpansionError):
+        parse_src(GROWING)
+
+
+def test_size_limit(env):
+    from dasy.exceptions import DasyMacroExpansionError
+    from dasy.macro.syntax import ExpansionLimits, MacroEnv
+
+    env = MacroEnv(limits=ExpansionLimits(max_size=100))
+    install_builtin_dasy_macros(env)
+    Expander(env).expand(cond_chain(5))
+    with pytest.raises(DasyMacroExpansionError, match="max_size=100"):
+        Expander(env).expand(cond_chain(20))
+
+
+def test_cli_expansion_overrides():
+    from argparse import Namespace
+
+    from dasy.main import expansion_overrides
+
+    args = Namespace(
+        max_expansion_steps=10, max_expansion_depth=None, max_expansion_size=5
+    )
+    assert expansion_overrides(args) == {"max_steps": 10, "max_size": 5}
@@ -0,0 +1,87 @@
+import json
+from pathlib import Path
+
+from dasy import compiler
+from dasy.compiler import OUTPUT_FORMATS
+from dasy.parser.incremental import FormCache
+
+ERC20 = Path(__file__).resolve().parents[2] / "examples" / "ERC20.dasy"
+FORMATS = ("bytecode", "abi", "ast_dict", "source_map")
+
+
+def outputs(src, form_cache=None):
+    data = compiler.compile(src, filepath=str(ERC20), form_cache=form_cache)
+    return {
+        fmt: json.dumps(OUTPUT_FORMATS[fmt](data), sort_keys=True, default=str)
+        for fmt in FORMATS
+    }
+
+
+def test_unchanged_source_reuses_every_form():
+    src = ERC20.read_text()
+    cache = FormCache()
+    cold = outputs(src, cache)
+    assert cache.hits == 0 and len(cache) == cache.misses
+    assert outputs(src, cache) == cold == outputs(src)
+    assert cache.hits == len(cache)
+
+
+def test_edited_form_is_the_only_one_parsed_again():
+    src = ERC20.read_text()
+    cache = FormCache()
+    outputs(src, cache)
+    misses = cache.misses
+    # two extra lines in approve shift every form after it
+    edited = src.replace(
+        "(defn approve [:address spender :uint256 val] :bool :external",
+        "(defn approve [:address spender :uint256 val] :bool :external\n\n",
+    )
+    assert edited != src
+    assert outputs(edited, cache) == outputs(edited)
+    assert cache.misses == misses + 1
+
+
+def test_changed_constant_invalidates_later_forms():
+    src = """
+(defconst LIMIT 10)
+(defn limit [] :uint256 [:external :pure] LIMIT)
+"""
+    cache = FormCache()
+    outputs(src, cache)
+    changed = src.replace("10", "11")
+    assert outputs(changed, cache) == outputs(changed)
+    assert outputs(changed, cache)["bytecode"] != outputs(src)["bytecode"]
+
+
+def test_changed_macro_is_expanded_again():
+    src = """
+(defmacro answer [] 42)
+(defn get [] :uint256 [:external :pure] (answer))
+"""
+    cache = FormCache()
+    outputs(src, cache)
+    changed = src.replace("42", "43")
+    assert outputs(changed, cache) == outputs(changed)
+    assert outputs(changed, cache)["bytecode"] != outputs(src)["bytecode"]
+
+
+def test_cache_is_bounded():
+    cache = FormCache(max_entries=3)
+    outputs(ERC20.read_text(), cache)
+    assert len(cache) == 3
+
+
+def test_changed_include_invalidates_later_forms(tmp_path):
+    header = tmp_path / "header.dasy"
+    header.write_text("(defconst LIMIT 10)\n")
+    main = tmp_path / "main.dasy"
+    src = '(include! "header.dasy")\n(defn f [] :uint256 [:external :pure] LIMIT)\n'
+    cache = FormCache()
+
+    def bytecode(form_cache=None):
+        data = compiler.compile(src, filepath=str(main), form_cache=form_cache)
+        return data.bytecode
+
+    before = bytecode(cache)
+    header.write_text("(defconst LIMIT 20)\n")
+    assert bytecode(cache) == bytecode() != before
@@ -0,0 +1,89 @@
+import pytest
+from vyper.ast import nodes as vy_nodes
+
+from dasy.parser import node_factory
+from dasy.parser.utils import build_node
+
+
+def describe_value(value, parent):
+    if isinstance(value, vy_nodes.VyperNode):
+        return describe(value, parent)
+    if isinstance(value, list):
+        return [describe_value(v, parent) for v in value]
+    return value
+
+
+def describe(node, parent=None):
+    """Everything construction sets on ``node``, with children by position."""
+    out = {"type": type(node), "parent": node._parent is parent}
+    for cls in type(node).__mro__:
+        for slot in getattr(cls, "__slots__", ()):
+            if slot in ("_parent", "_children", "_metadata"):
+                continue
+            out[slot] = describe_value(getattr(node, slot, "<unset>"), node)
+    out["children"] = [describe(c, node) for c in node._children]
+    out["metadata"] = dict(node._metadata)
+    return out
+
+
+def name(id_, **kw):
+    return node_factory.node_constructor(vy_nodes.Name)({"id": id_, **kw}, 100)
+
+
+CASES = [
+    (vy_nodes.Name, lambda: {"id": "x"}),
+    (
+        vy_nodes.BinOp,
+        lambda: {"left": name("a"), "op": vy_nodes.Add(), "right": name("b")},
+    ),
+    (vy_nodes.List, lambda: {"elts": [name("a"), name("b")]}),
+    (vy_nodes.Expr, lambda: {"value": name("a"), "lineno": 3, "col_offset": 2}),
+    (vy_nodes.Return, lambda: {"value": None}),
+    (
+        vy_nodes.If,
+        lambda: {"test": name("c"), "body": [[name("a")], name("b")], "orelse": []},
+    ),
+    (
+        vy_nodes.Module,
+        lambda: {"body": [], "name": "", "doc_string": "", "settings": {}},
+    ),
+    (
+        vy_nodes.Call,
+        lambda: {
+            "func": name("f"),
+            "args": [name("a")],
+            "keywords": [],
+            "extra": name("z"),
+        },
+    ),
+]
+
+
+@pytest.mark.parametrize("cls,fields", CASES, ids=[c.__name__ for c, _ in CASES])
+def test_direct_constructor_matches_init(cls, fields):
+    direct = node_factory._direct_constructor(cls)(fields(), 7)
+    init = node_factory._init_constructor(cls)(fields(), 7)
+    assert describe(direct) == describe(init)
+
+
+def test_classes_with_own_init_still_run_it():
+    node = build_node(
+        vy_nodes.Compare, left=name("a"), ops=[vy_nodes.Lt()], comparators=[name("b")]
+    )
+    assert isinstance(node.op, vy_nodes.Lt) and node.right.id == "b"
+    assert [type(c) for c in node._children] == [
+        vy_nodes.Name,
+        vy_nodes.Lt,
+        vy_nodes.Name,
+    ]
+    assert all(c._parent is node for c in node._children)
+
+
+def test_constructors_are_cached():
+    construct = node_factory.node_constructor(vy_nodes.Name)
+    assert node_factory.node_constructor(vy_nodes.Name) is construct
+
+
+def test_only_empty_fields_still_rejected():
+    with pytest.raises(Exception, match="not valid for Vyper"):
+        build_node(vy_nodes.Raise, exc=None, cause=name("c"))
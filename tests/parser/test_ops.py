@@ -0,0 +1,53 @@
+import pytest
+import vyper.ast.nodes as vy_nodes
+
+from dasy.exceptions import DasySyntaxError
+from dasy.parser import parse_src
+
+
+def returned_value(expr):
+    mod, _ = parse_src(
+        "(defn f [:uint256 a b c d] :bool :external\n" f"  (return {expr}))"
+    )
+    return mod.body[0].body[-1].value
+
+
+def test_nary_arithmetic_nests_right():
+    node = returned_value("(- a b c d)")
+    operands = []
+    while isinstance(node, vy_nodes.BinOp):
+        assert isinstance(node.op, vy_nodes.Sub)
+        # every level points at the source expression, not line 1
+        assert (node.lineno, node.col_offset) == (2, 11)
+        operands.append(node.left.id)
+        node = node.right
+    operands.append(node.id)
+    assert operands == ["a", "b", "c", "d"]
+
+
+def test_nested_operators_keep_their_own_op():
+    node = returned_value("(+ a (* b c d))")
+    assert isinstance(node.op, vy_nodes.Add)
+    assert isinstance(node.right.op, vy_nodes.Mult)
+    assert isinstance(node.right.right.op, vy_nodes.Mult)
+    assert node.right.col_offset == 16
+
+
+def test_chained_comparison_lowers_to_and():
+    node = returned_value("(< a b c d)")
+    assert isinstance(node, vy_nodes.BoolOp)
+    assert isinstance(node.op, vy_nodes.And)
+    pairs = [(cmp.left.id, cmp.right.id) for cmp in node.values]
+    assert pairs == [("a", "b"), ("b", "c"), ("c", "d")]
+    assert all(isinstance(cmp.op, vy_nodes.Lt) for cmp in node.values)
+    assert {cmp.lineno for cmp in node.values} == {2}
+    # operands shared by two comparisons are separate nodes
+    assert node.values[0].right is not node.values[1].left
+
+
+def test_single_operand_minus_negates():
+    node = returned_value("(- a)")
+    assert isinstance(node, vy_nodes.UnaryOp)
+    assert isinstance(node.op, vy_nodes.USub) and node.operand.id == "a"
+    with pytest.raises(DasySyntaxError, match="two operands"):
+        returned_value("(+ a)")
@@ -0,0 +1,68 @@
+import tracemalloc
+
+import hy
+import pytest
+from vyper.ast import nodes as vy_nodes
+
+from dasy.parser import parse_src, parse_src_iter
+from dasy.parser.context import ParseContext
+
+SRC = """
+(defvar owner :address)
+(defn get [] :uint256 :external (return 1))
+(defvar total :uint256)
+"""
+
+
+def test_yields_top_level_nodes_in_source_order():
+    nodes = list(parse_src_iter(SRC))
+    assert [type(n) for n in nodes] == [
+        vy_nodes.VariableDecl,
+        vy_nodes.FunctionDef,
+        vy_nodes.VariableDecl,
+    ]
+    assert nodes[0].target.id == "owner"
+
+
+def test_stops_before_reading_later_forms():
+    # the unbalanced tail only fails once the reader gets to it
+    nodes = parse_src_iter(SRC + "(defvar broken")
+    assert isinstance(next(nodes), vy_nodes.VariableDecl)
+    with pytest.raises(hy.PrematureEndOfInput):
+        list(nodes)
+
+
+def test_pragmas_collected_in_context():
+    src = '(pragma :evm-version "paris")\n' + SRC
+    context = ParseContext(source_code=src)
+    nodes = list(parse_src_iter(src, context=context))
+    assert len(nodes) == 3
+    assert context.settings == {"evm_version": "paris"}
+
+    mod, settings = parse_src(src)
+    assert settings == {"evm_version": "paris"}
+    assert [type(n) for n in mod.body] == [
+        vy_nodes.VariableDecl,
+        vy_nodes.VariableDecl,
+        vy_nodes.FunctionDef,
+    ]
+
+
+def test_memory_does_not_grow_with_form_count():
+    form = (
+        "(defn f{i} [:uint256 x] :uint256 :external"
+        " (if (> x {i}) (return (+ x 1)) (return (* x 2))))\n"
+    )
+
+    def peak(count):
+        src = "".join(form.format(i=i) for i in range(count))
+        tracemalloc.start()
+        try:
+            for _ in parse_src_iter(src):
+                pass
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    peak(50)  # warm up imports and per-class caches
+    assert peak(400) < 2 * peak(50)
@@ -0,0 +1,86 @@
+from pathlib import Path
+
+import pytest
+from hy import models
+
+from dasy.parser import native_reader
+from dasy.parser.reader import read_many
+
+EXAMPLES = sorted((Path(__file__).parents[2] / "examples").glob("*.dasy"))
+
+
+def positioned(forms):
+    """Every model in ``forms`` with its type and source span."""
+    out = []
+    stack = list(reversed(forms))
+    while stack:
+        m = stack.pop()
+        span = (m.start_line, m.start_column, m.end_line, m.end_column)
+        out.append((type(m), span, hasattr(m, "_start_line")))
+        if isinstance(m, models.Sequence):
+            stack.extend(reversed(m))
+    return out
+
+
+@pytest.mark.parametrize("path", EXAMPLES, ids=[p.name for p in EXAMPLES])
+def test_native_reader_matches_hy_reader(path):
+    src = path.read_text()
+    expected = read_many(src, reader="hy")
+    forms = native_reader.read_forms(src)
+    assert forms == expected
+    assert positioned(forms) == positioned(expected)
+
+
+@pytest.mark.parametrize(
+    "src",
+    [
+        "(a\r\nb) ; trailing",
+        "x.y .x `(a ~b ~@c) ' ; c\n x",
+        '{:a 1 :b [2 3]} "a\\n\\"q\\"" b"\\x00ab" r"\\d+"',
+        "1 -1 1_000 0x10 1.5 Inf inf self/x a-b? 0xZZ",
+        "0xAb5801a7D398351b8bE11C439e05C5B3259aeC9B",
+    ],
+)
+def test_native_reader_edge_cases(src):
+    forms = native_reader.read_forms(src)
+    expected = read_many(src, reader="hy")
+    assert forms == expected
+    assert positioned(forms) == positioned(expected)
+
+
+@pytest.mark.parametrize("src", ["#(1 2)", 'f"{x}"', "(a", '"\\q"'])
+def test_unsupported_syntax_falls_back_to_hy(src):
+    with pytest.raises(native_reader.Unsupported):
+        native_reader.read_forms(src)
+    try:
+        expected = read_many(src, reader="hy")
+    except Exception as e:
+        with pytest.raises(type(e)):
+            read_many(src, reader="native")
+    else:
+        assert read_many(src, reader="native") == expected
+
+
+def test_reader_selected_by_environment(monkeypatch):
+    calls = []
+    real = native_reader.iter_forms
+    monkeypatch.setattr(
+        native_reader, "iter_forms", lambda src: calls.append(src) or real(src)
+    )
+    monkeypatch.setenv("DASY_READER", "hy")
+    read_many("(a)")
+    assert calls == []
+    monkeypatch.delenv("DASY_READER")
+    read_many("(a)")
+    assert calls == ["(a)"]
+    with pytest.raises(ValueError, match="Unknown reader"):
+        read_many("(a)", reader="other")
+
+
+def test_fallback_resumes_after_native_forms():
+    from dasy.parser.reader import iter_forms
+
+    forms = iter_forms("(a) (b) #(c) (d)")
+    # the first forms come from the native reader before it reaches "#("
+    assert next(forms) == models.Expression([models.Symbol("a")])
+    assert list(forms) == read_many("(b) #(c) (d)", reader="hy")
@@ -7,8 +7,9 @@ from dasy.parser.utils import (
     pairwise,
     filename_to_contract_name,
     has_return,
+    set_source_code,
 )
-from vyper.ast.nodes import Expr
+from vyper.ast.nodes import Add, BinOp, Expr
 import dasy
 
 
@@ -60,14 +61,22 @@ def test_add_src_map():
     src = "(1 2 3)"
     node = dasy.read(src)
     ast_node = build_node(Expr, value=1)
-    ast_node = add_src_map(src, node, ast_node)
-    assert ast_node.full_source_code == src
+    ast_node = add_src_map(node, ast_node)
+    assert ast_node.full_source_code is None
     assert ast_node.lineno == 1
     assert ast_node.end_lineno == 1
     assert ast_node.col_offset == 1
     assert ast_node.end_col_offset == 7
 
 
+def test_set_source_code():
+    src = "(+ 1 2)"
+    root = build_node(Expr, value=build_node(BinOp, left=1, op=Add(), right=2))
+    assert set_source_code(src, root) is root
+    assert all(n.full_source_code == src for n in root.get_descendants())
+    assert root.full_source_code == src
+
+
 def test_process_body():
     body = [dasy.read("(1 2 3)"), dasy.read("(4 5 6)")]
     assert process_body(body) == [
@@ -78,3 +87,16 @@ def test_process_body():
         dasy.read("5"),
         dasy.read("6"),
     ]
+
+
+def test_has_return_deeply_nested():
+    from hy import models
+
+    def nest(src, depth=5000):
+        form = dasy.read(src)
+        for _ in range(depth):
+            form = models.Expression([models.Symbol("do"), form])
+        return form
+
+    assert has_return(nest("(return 1)"))
+    assert not has_return(nest("(pass)"))
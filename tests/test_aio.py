@@ -0,0 +1,124 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from dasy import aio, compiler
+from dasy.cancellation import StopToken, check_stop, stop_token
+from dasy.exceptions import DasyCompileInterrupted
+
+EXAMPLES = Path(__file__).resolve().parent.parent / "examples"
+FORMATS = ("bytecode", "abi")
+
+
+def test_compile_async_matches_sync():
+    src = (EXAMPLES / "hello_world.dasy").read_text()
+    expected = compiler.compile_artifacts(src, formats=FORMATS)
+
+    async def main():
+        async with aio.AsyncCompiler(max_workers=2) as c:
+            return await asyncio.gather(
+                c.compile(src, formats=FORMATS),
+                c.compile_file(EXAMPLES / "hello_world.dasy", formats=FORMATS),
+            )
+
+    assert asyncio.run(main()) == [expected, expected]
+
+
+def test_max_concurrency_bounds_submitted_work(monkeypatch):
+    lock = threading.Lock()
+    running = peak = 0
+
+    def fake_worker(token, src, *args):
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.05)
+        with lock:
+            running -= 1
+        return {"src": src}
+
+    monkeypatch.setattr(aio, "_compile_worker", fake_worker)
+
+    async def main():
+        async with aio.AsyncCompiler(max_workers=8, max_concurrency=2) as c:
+            return await asyncio.gather(*(c.compile(str(i)) for i in range(6)))
+
+    results = asyncio.run(main())
+    assert [r["src"] for r in results] == [str(i) for i in range(6)]
+    assert peak == 2
+
+
+@pytest.fixture
+def endless_compile(monkeypatch):
+    """Make compilation spin until its stop token fires; yields its outcome."""
+    outcome = {}
+    stopped = threading.Event()
+
+    def spin(*args, **kwargs):
+        try:
+            while True:
+                check_stop()
+                time.sleep(0.01)
+        except DasyCompileInterrupted as e:
+            outcome["error"] = e
+            stopped.set()
+            raise
+
+    monkeypatch.setattr(compiler, "generate_compiler_data", spin)
+    outcome["stopped"] = stopped
+    return outcome
+
+
+def test_timeout_stops_the_worker(endless_compile):
+    async def main():
+        async with aio.AsyncCompiler(max_workers=1) as c:
+            with pytest.raises(asyncio.TimeoutError):
+                await c.compile("(defvar x uint256)", timeout=0.2)
+
+    asyncio.run(main())
+    assert endless_compile["stopped"].wait(5)
+    assert isinstance(endless_compile["error"], DasyCompileInterrupted)
+
+
+def test_cancel_stops_the_worker(endless_compile):
+    executor = ThreadPoolExecutor(max_workers=1)
+
+    async def main():
+        c = aio.AsyncCompiler(executor)
+        task = asyncio.create_task(c.compile("(defvar x uint256)"))
+        await asyncio.sleep(0.1)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(main())
+    assert endless_compile["stopped"].wait(5)
+    assert str(endless_compile["error"]) == "compilation cancelled"
+    # the worker is free again
+    assert executor.submit(lambda: 1).result(timeout=5) == 1
+    executor.shutdown()
+
+
+def test_expired_token_interrupts_compile():
+    src = (EXAMPLES / "hello_world.dasy").read_text()
+    with stop_token(StopToken(deadline=time.time() - 1)):
+        with pytest.raises(DasyCompileInterrupted, match="timed out"):
+            compiler.compile_artifacts(src, formats=FORMATS)
+    # no token once the block exits
+    assert compiler.compile_artifacts(src, formats=FORMATS)["abi"]
+
+
+def test_process_executor():
+    async def main():
+        async with aio.AsyncCompiler("process", max_workers=1) as c:
+            return await c.compile_file(
+                EXAMPLES / "hello_world.dasy", formats=FORMATS, timeout=120
+            )
+
+    src = (EXAMPLES / "hello_world.dasy").read_text()
+    assert asyncio.run(main()) == compiler.compile_artifacts(src, formats=FORMATS)
@@ -0,0 +1,106 @@
+import json
+
+import pytest
+
+from dasy import build
+from dasy.build import build_project, compile_many, discover_sources
+from dasy.exceptions import DasyUsageError
+
+GOOD = "(defn answer [] :uint256 [:external :pure] 42)\n"
+BAD = "(defn broken [] :uint256 [:external :pure] undefined_name)\n"
+
+
+def _write_project(root):
+    (root / "contracts").mkdir()
+    (root / "contracts" / "good.dasy").write_text(GOOD)
+    (root / "contracts" / "bad.dasy").write_text(BAD)
+    (root / "contracts" / "notes.txt").write_text("not a contract")
+    return root / "contracts"
+
+
+def test_discover_sources(tmp_path):
+    contracts = _write_project(tmp_path)
+    found = discover_sources([str(contracts), str(contracts / "good.dasy")])
+    assert [p.name for p in found] == ["bad.dasy", "good.dasy"]
+    assert discover_sources([str(contracts / "g*.dasy")]) == [contracts / "good.dasy"]
+    with pytest.raises(DasyUsageError):
+        discover_sources([str(tmp_path / "missing" / "*.dasy")])
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_build_project_reports_each_file(tmp_path, jobs):
+    contracts = _write_project(tmp_path)
+    out = tmp_path / "out"
+    results = {
+        r.path: r
+        for r in build_project(
+            discover_sources([str(contracts)]),
+            str(out),
+            formats=["abi", "bytecode"],
+            jobs=jobs,
+            use_cache=False,
+        )
+    }
+    good = results[str(contracts / "good.dasy")]
+    bad = results[str(contracts / "bad.dasy")]
+    assert good.ok and good.seconds > 0
+    assert not bad.ok and "undefined_name" in bad.error
+    artifact = json.loads((out / "good.dasy.json").read_text())
+    assert artifact["abi"][0]["name"] == "answer"
+    assert artifact["bytecode"].startswith("0x")
+    assert not (out / "bad.dasy.json").exists()
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_compile_many_streams_keyed_results(tmp_path, workers):
+    contracts = _write_project(tmp_path)
+    items = [contracts / "good.dasy", str(contracts / "bad.dasy"), GOOD, ("k", BAD)]
+    results = {
+        r.key: r
+        for r in compile_many(items, workers=workers, formats=["abi"], use_cache=False)
+    }
+    assert set(results) == {
+        contracts / "good.dasy",
+        str(contracts / "bad.dasy"),
+        2,
+        "k",
+    }
+    good = results[contracts / "good.dasy"]
+    assert good.ok and good.outputs["abi"][0]["name"] == "answer"
+    assert results[2].outputs == good.outputs
+    assert "undefined_name" in results[str(contracts / "bad.dasy")].error
+    assert not results["k"].ok and results["k"].outputs is None
+
+
+def test_compile_many_reuses_workers():
+    sources = {i: GOOD for i in range(5)}
+    first = list(compile_many(sources, workers=2, formats=["abi"], use_cache=False))
+    pool = build._pools[2]
+    generated = (GOOD for _ in range(3))
+    second = list(compile_many(generated, workers=2, formats=["abi"], use_cache=False))
+    assert build._pools[2] is pool
+    assert sorted(r.key for r in first) == list(range(5))
+    assert all(r.ok for r in first + second)
+    build.shutdown_workers()
+    assert not build._pools
+
+
+def test_build_one_records_dependencies_even_on_failure(tmp_path):
+    header = tmp_path / "header.dasy"
+    header.write_text("(defconst LIMIT 10)\n")
+    path = tmp_path / "main.dasy"
+    path.write_text(
+        '(include! "header.dasy")\n(defn f [] :uint256 [:external :pure] LIMIT)\n'
+    )
+    deps = set()
+    result = build.build_one(
+        str(path), str(tmp_path / "out"), ["abi"], use_cache=False, dependencies=deps
+    )
+    assert result.ok and str(header) in deps
+
+    header.write_text("(defconst LIMIT\n")
+    deps.clear()
+    result = build.build_one(
+        str(path), str(tmp_path / "out"), ["abi"], use_cache=False, dependencies=deps
+    )
+    assert not result.ok and str(header) in deps
@@ -0,0 +1,106 @@
+import os
+
+import pytest
+
+from dasy import compiler
+from dasy.cache import ArtifactCache
+
+SRC = """
+(defvar x (public :uint256))
+(defn setX [:uint256 v] :external (set self/x v))
+"""
+
+
+def test_warm_hit_skips_compilation(tmp_path, monkeypatch):
+    cache = ArtifactCache(tmp_path / "cache")
+    cold = compiler.compile_artifacts(SRC, name="C", cache=cache)
+    assert cache.misses == 1
+
+    def _fail(*args, **kwargs):
+        raise AssertionError("compiler should not run on a warm hit")
+
+    monkeypatch.setattr(compiler, "generate_compiler_data", _fail)
+    warm = compiler.compile_artifacts(SRC, name="C", cache=cache)
+    assert cache.hits == 1
+    assert warm == cold
+    assert set(warm) == set(compiler.CACHED_FORMATS)
+    assert warm["bytecode"].startswith("0x")
+
+
+def test_include_change_invalidates_entry(tmp_path):
+    header = tmp_path / "header.dasy"
+    header.write_text("(defconst LIMIT 10)\n")
+    main = tmp_path / "main.dasy"
+    main.write_text(
+        '(include! "header.dasy")\n'
+        "(defn limit [] :uint256 [:external :pure] LIMIT)\n"
+    )
+    src = main.read_text()
+    cache = ArtifactCache(tmp_path / "cache")
+
+    first = compiler.compile_artifacts(src, "main", str(main), cache=cache)
+    compiler.compile_artifacts(src, "main", str(main), cache=cache)
+    assert cache.hits == 1
+
+    header.write_text("(defconst LIMIT 20)\n")
+    second = compiler.compile_artifacts(src, "main", str(main), cache=cache)
+    assert cache.hits == 1
+    assert second["bytecode"] != first["bytecode"]
+
+
+def test_lru_eviction(tmp_path):
+    cache = ArtifactCache(tmp_path, max_size=10_000)
+    payload = {"bytecode": "0x" + "00" * 2000}
+    for i in range(10):
+        key = cache.key(f"src{i}")
+        cache.put(key, payload)
+        os.utime(cache._entry_path(key), (i, i))
+    assert cache.size() <= 10_000
+    # the most recently written entry survives, the oldest do not
+    assert cache.get(cache.key("src9")) == payload
+    assert cache.get(cache.key("src0")) is None
+    assert not list(tmp_path.rglob(".tmp-*"))
+
+
+def test_key_depends_on_name_and_path(tmp_path):
+    cache = ArtifactCache(tmp_path)
+    assert cache.key(SRC, "A") != cache.key(SRC, "B")
+    assert cache.key(SRC, "A", "a/x.dasy") != cache.key(SRC, "A", "b/x.dasy")
+    assert cache.key(SRC, "A", settings={"evm_version": "paris"}) != cache.key(SRC, "A")
+
+
+def test_expansion_limits_are_part_of_the_key(tmp_path):
+    from dasy.macro.syntax import ExpansionLimits
+
+    cache = ArtifactCache(tmp_path)
+    compiler.compile_artifacts(SRC, cache=cache)
+    limits = ExpansionLimits(max_steps=1000)
+    compiler.compile_artifacts(SRC, cache=cache, expansion_limits=limits)
+    assert (cache.hits, cache.misses) == (0, 2)
+    compiler.compile_artifacts(SRC, cache=cache, expansion_limits=limits)
+    # the defaults spelled out share the entry built without limits
+    compiler.compile_artifacts(SRC, cache=cache, expansion_limits=ExpansionLimits())
+    assert (cache.hits, cache.misses) == (2, 2)
+
+
+@pytest.mark.parametrize("fmt", ["ir", "opcodes"])
+def test_uncacheable_formats_bypass_cache(tmp_path, fmt):
+    cache = ArtifactCache(tmp_path)
+    out = compiler.compile_artifacts(SRC, formats=(fmt,), cache=cache)
+    assert fmt in out
+    assert cache.size() == 0
+
+
+def test_warm_entry_does_not_bypass_expansion_limits(tmp_path):
+    from dasy.exceptions import DasyMacroExpansionError
+    from dasy.macro.syntax import ExpansionLimits
+
+    src = "(defn f [:uint256 x] :uint256 [:external :pure] (-> (-> x (+ 1)) (+ 2)))\n"
+    cache = ArtifactCache(tmp_path)
+    compiler.compile_artifacts(src, cache=cache)
+    compiler.compile_artifacts(src, cache=cache)
+    assert cache.hits == 1
+    with pytest.raises(DasyMacroExpansionError):
+        compiler.compile_artifacts(
+            src, cache=cache, expansion_limits=ExpansionLimits(max_steps=1)
+        )
@@ -0,0 +1,36 @@
+import json
+import logging
+
+import pytest
+from vyper.exceptions import TypeMismatch
+
+from dasy import compiler
+
+SRC = """
+(defvar owner (public :address))
+(defn double [:uint256 x] :uint256 [:external :pure] (return (* x 2)))
+"""
+
+
+def test_module_shape_logged_at_debug(caplog):
+    with caplog.at_level(logging.DEBUG, logger="dasy.compiler"):
+        compiler.compile(SRC, name="Doubler")
+    (record,) = [r for r in caplog.records if hasattr(r, "module_shape")]
+    shape = record.module_shape
+    assert json.loads(record.getMessage().split(": ", 1)[1]) == shape
+    assert shape["type"] == "Module"
+    assert [n["type"] for n in shape["body"]] == ["VariableDecl", "FunctionDef"]
+    assert shape["body"][1]["name"] == "double"
+    assert shape["body"][1]["body"] == [{"type": "Return", "value": "BinOp"}]
+
+
+def test_no_tracing_work_when_debug_disabled(caplog, monkeypatch):
+    def fail(module):
+        raise AssertionError("module shape built with DEBUG disabled")
+
+    monkeypatch.setattr(compiler, "module_shape", fail)
+    with caplog.at_level(logging.WARNING, logger="dasy.compiler"):
+        compiler.compile(SRC)
+        with pytest.raises(TypeMismatch):
+            compiler.compile('(defn f [] :uint256 :external (return "x"))')
+    assert caplog.records == []
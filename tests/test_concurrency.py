@@ -0,0 +1,82 @@
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+from vyper.exceptions import UndeclaredDefinition
+
+from dasy import compiler
+from dasy.compiler import OUTPUT_FORMATS
+from dasy.parser import parse_src
+
+EXAMPLES = sorted(
+    Path(__file__).resolve().parent.parent.joinpath("examples").glob("*.dasy")
+)
+FORMATS = ("bytecode", "abi", "layout", "ast_dict", "source_map")
+
+
+def outputs(path):
+    data = compiler.compile_file(str(path))
+    return {
+        fmt: json.dumps(OUTPUT_FORMATS[fmt](data), sort_keys=True, default=str)
+        for fmt in FORMATS
+    }
+
+
+def test_concurrent_compiles_match_serial():
+    serial = {path: outputs(path) for path in EXAMPLES}
+    # every example twice, so the same file also compiles on two threads
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        paths = EXAMPLES + EXAMPLES[::-1]
+        concurrent = list(pool.map(outputs, paths))
+    for path, result in zip(paths, concurrent):
+        assert result == serial[path], path.name
+
+
+def parse_on_threads(sources):
+    """parse_src each source on its own thread, all starting together."""
+    barrier = threading.Barrier(len(sources))
+
+    def parse(src):
+        barrier.wait()
+        return parse_src(src)[0]
+
+    with ThreadPoolExecutor(max_workers=len(sources)) as pool:
+        return list(pool.map(parse, sources))
+
+
+def returned_value(mod):
+    (fn,) = mod.body
+    return fn.body[0].value.value
+
+
+def test_constants_stay_with_their_compilation():
+    sources = [
+        f"(defconst LIMIT {i})\n(defn f [] :uint256 :external (return LIMIT))"
+        for i in range(8)
+    ]
+    mods = parse_on_threads(sources)
+    assert [returned_value(m) for m in mods] == list(range(8))
+
+
+def test_defmacro_stays_with_its_compilation():
+    sources = [
+        f"(defmacro answer [] {i})\n(defn f [] :uint256 :external (return (answer)))"
+        for i in range(8)
+    ]
+    mods = parse_on_threads(sources)
+    assert [returned_value(m) for m in mods] == list(range(8))
+
+    # a later compilation doesn't see the macros defined above
+    with pytest.raises(UndeclaredDefinition):
+        compiler.compile("(defn f [] :uint256 :external (return (answer)))")
+
+
+def test_node_ids_numbered_per_compilation():
+    src = EXAMPLES[0].read_text()
+    first = parse_src(src)[0]
+    second = parse_src(src)[0]
+    assert first.node_id == second.node_id == 0
+    ids = [n.node_id for n in second.get_descendants(include_self=True)]
+    assert ids == [n.node_id for n in first.get_descendants(include_self=True)]
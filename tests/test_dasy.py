@@ -61,6 +61,16 @@ def test_chain_binops():
     assert c.plus() == 21
 
 
+def test_chain_comparisons():
+    src = """
+        (defn ordered [:uint256 a b c] :bool :external
+        (< a b c))
+    """
+    c = compile_src(src)
+    assert c.ordered(1, 2, 3)
+    assert not c.ordered(1, 3, 2)
+
+
 def test_defvars():
     src = """
     (defvars x :uint256)
@@ -0,0 +1,57 @@
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+HEAVY = ("hy", "vyper", "dasy.parser", "dasy.compiler")
+
+
+def _loaded_after(code: str) -> list:
+    probe = f"{code}\nimport sys\nprint('loaded:' + ','.join(m for m in {HEAVY!r} if m in sys.modules))"
+    out = subprocess.run(
+        [sys.executable, "-c", probe],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    loaded = out.rsplit("loaded:", 1)[1].strip()
+    return [m for m in loaded.split(",") if m]
+
+
+def test_import_dasy_is_lazy():
+    assert _loaded_after("import dasy") == []
+
+
+def test_read_only_needs_hy():
+    assert _loaded_after("import dasy; dasy.read('(+ 1 2)')") == ["hy"]
+
+
+def test_version_does_not_load_compiler():
+    code = (
+        "import sys; from dasy.main import main; sys.argv = ['dasy', '--version']\n"
+        "try:\n    main()\nexcept SystemExit:\n    pass"
+    )
+    assert _loaded_after(code) == []
+
+
+def test_lazy_attributes_resolve():
+    import dasy
+    from dasy.compiler import compile_file
+    from dasy.parser.compat import parse_node_compat
+
+    assert dasy.compile_file is compile_file
+    assert dasy.parse_node_legacy is parse_node_compat
+    assert "compile" in dir(dasy)
+
+
+def test_submodules_resolve_as_attributes():
+    # a fresh interpreter, where nothing has imported them yet
+    code = (
+        "import dasy\n"
+        "assert dasy.compiler.compile is dasy.compile\n"
+        "assert dasy.parser.parse_src is dasy.parse_src\n"
+        "assert not hasattr(dasy, 'no_such_module')"
+    )
+    assert set(_loaded_after(code)) >= {"dasy.compiler", "dasy.parser"}
@@ -0,0 +1,44 @@
+from types import ModuleType
+
+import hy
+
+from dasy.parser import macro_bundle
+
+
+def _expand(module, src):
+    return hy.macroexpand(hy.read(src), module)
+
+
+def test_bundle_written_then_loaded_from_cache(tmp_path, monkeypatch):
+    first = ModuleType("bundle_probe_1")
+    names = macro_bundle.load_builtin_macros(first, cache_dir=tmp_path)
+    assert {"hash-map", "include!", "interface!", "arrow"} <= set(names)
+    assert list((tmp_path / "macros").glob("builtin-*.bundle"))
+
+    def fail(*args):
+        raise AssertionError("bundle should come from the cache")
+
+    monkeypatch.setattr(macro_bundle, "compile_bundle", fail)
+    second = ModuleType("bundle_probe_2")
+    assert macro_bundle.load_builtin_macros(second, cache_dir=tmp_path) == names
+    assert _expand(second, "(string 10)") == hy.read("(subscript String 10)")
+
+
+def test_corrupt_bundle_is_rebuilt(tmp_path):
+    key = macro_bundle.bundle_key(macro_bundle.MACRO_FILE.read_bytes())
+    path = macro_bundle.bundle_path(key, tmp_path)
+    path.parent.mkdir(parents=True)
+    path.write_bytes(b"not marshal data")
+
+    module = ModuleType("bundle_probe_3")
+    assert "inc" in macro_bundle.load_builtin_macros(module, cache_dir=tmp_path)
+    assert _expand(module, "(inc x)") == hy.read("(+= x 1)")
+    assert path.read_bytes() != b"not marshal data"
+
+
+def test_bundle_key_tracks_hy_version(monkeypatch):
+    source = macro_bundle.MACRO_FILE.read_bytes()
+    key = macro_bundle.bundle_key(source)
+    assert macro_bundle.bundle_key(source + b"\n") != key
+    monkeypatch.setattr(hy, "__version__", "0.0.0")
+    assert macro_bundle.bundle_key(source) != key
@@ -0,0 +1,105 @@
+import pytest
+
+from dasy import compiler
+from dasy.parser.context import ParseContext
+from dasy.parser.macro_utils import get_interface_cache, get_interface_source
+
+TOKEN = """
+(defvar balances (public (hash-map :address :uint256)))
+(defn transfer [:address to :uint256 amount] :external
+  (set-at self/balances to amount))
+"""
+
+USER = """
+(interface! "erc_token.dasy")
+(defvar token (public ErcToken))
+(defn __init__ [:address t] :external (set self/token (ErcToken t)))
+"""
+
+
+@pytest.fixture
+def interface_cache():
+    cache = get_interface_cache()
+    cache.clear()
+    yield cache
+    cache.clear()
+
+
+def test_interface_memoized_across_compiles(tmp_path, interface_cache):
+    (tmp_path / "erc_token.dasy").write_text(TOKEN)
+    user = tmp_path / "user.dasy"
+    user.write_text(USER)
+
+    first = compiler.compile(USER, "user", filepath=str(user)).abi
+    second = compiler.compile(USER, "user", filepath=str(user)).abi
+    assert first == second
+    assert interface_cache.misses == 1
+    assert interface_cache.hits == 1
+
+
+def test_interface_invalidated_when_target_changes(tmp_path, interface_cache):
+    token = tmp_path / "erc_token.dasy"
+    token.write_text(TOKEN)
+    before = get_interface_source(str(token))
+    assert "transfer" in before and "burn" not in before
+
+    token.write_text(TOKEN + "(defn burn [:uint256 amount] :external (pass))\n")
+    after = get_interface_source(str(token))
+    assert "burn" in after
+    assert interface_cache.misses == 2
+
+
+def test_interface_records_transitive_dependencies(tmp_path, interface_cache):
+    header = tmp_path / "header.dasy"
+    header.write_text("(defn ping [] :uint256 [:external :pure] 1)\n")
+    token = tmp_path / "erc_token.dasy"
+    token.write_text('(include! "header.dasy")\n' + TOKEN)
+
+    for _ in range(2):
+        ctx = ParseContext(source_path=str(tmp_path / "user.dasy"))
+        get_interface_source(str(token), dependencies=ctx.dependencies)
+        assert str(header.resolve()) in ctx.dependencies
+        assert str(token.resolve()) in ctx.dependencies
+    assert interface_cache.hits == 1
+
+    header.write_text("(defn pong [] :uint256 [:external :pure] 2)\n")
+    assert "pong" in get_interface_source(str(token))
+
+
+def test_include_forms_cached_and_copied(tmp_path):
+    from dasy.parser.macro_utils import get_include_cache
+
+    cache = get_include_cache()
+    cache.clear()
+    header = tmp_path / "header.dasy"
+    header.write_text("(defconst LIMIT 10)\n(defvar owner (public :address))\n")
+
+    first = cache.read_forms(str(header))
+    # models are tuples, but their position attributes are writable
+    first[0][1].start_line = 99
+    second = cache.read_forms(str(header))
+    assert second[0][1].start_line == 1
+    assert second[0][1] is not first[0][1]
+    assert second == cache.read_forms(str(header))
+    assert (cache.hits, cache.misses) == (2, 1)
+
+    header.write_text("(defconst LIMIT 20)\n")
+    assert int(cache.read_forms(str(header))[0][2]) == 20
+    assert cache.misses == 2
+    cache.clear()
+
+
+def test_include_cache_used_by_compile(tmp_path):
+    from dasy.parser.macro_utils import get_include_cache
+
+    cache = get_include_cache()
+    cache.clear()
+    (tmp_path / "header.dasy").write_text("(defconst LIMIT 10)\n")
+    main = tmp_path / "main.dasy"
+    src = '(include! "header.dasy")\n(defn f [] :uint256 [:external :pure] LIMIT)\n'
+    main.write_text(src)
+    a = compiler.compile(src, "main", filepath=str(main)).bytecode
+    b = compiler.compile(src, "main", filepath=str(main)).bytecode
+    assert a == b
+    assert (cache.hits, cache.misses) == (1, 1)
+    cache.clear()
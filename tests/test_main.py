@@ -0,0 +1,110 @@
+import json
+import sys
+
+import pytest
+
+from dasy import compiler
+from dasy.exceptions import DasyUsageError
+from dasy.main import COMBINED_JSON_FORMATS, main, resolve_formats
+
+SRC = "(defn answer [] :uint256 [:external :pure] 42)\n"
+
+
+@pytest.fixture
+def contract(tmp_path, monkeypatch):
+    path = tmp_path / "answer.dasy"
+    path.write_text(SRC)
+    compiles = []
+    real = compiler.generate_compiler_data
+
+    def counting(*args, **kwargs):
+        compiles.append(args[0])
+        return real(*args, **kwargs)
+
+    monkeypatch.setattr(compiler, "generate_compiler_data", counting)
+
+    def run(*argv):
+        monkeypatch.setattr(sys, "argv", ["dasy", str(path), "--no-cache", *argv])
+        main()
+        return compiles
+
+    return run
+
+
+def test_single_format_printed_as_before(contract, capsys):
+    contract("-f", "bytecode")
+    assert capsys.readouterr().out.startswith("0x")
+
+
+def test_format_list_compiles_once(contract, capsys):
+    compiles = contract("-f", "abi, bytecode,abi")
+    outputs = json.loads(capsys.readouterr().out)
+    assert list(outputs) == ["abi", "bytecode"]
+    assert outputs["abi"][0]["name"] == "answer"
+    assert len(compiles) == 1
+
+
+def test_combined_json_written_to_file(contract, tmp_path, capsys):
+    target = tmp_path / "answer.json"
+    compiles = contract("-f", "combined_json", "-o", str(target))
+    assert capsys.readouterr().out == ""
+    outputs = json.loads(target.read_text())
+    assert list(outputs) == list(COMBINED_JSON_FORMATS)
+    assert outputs["bytecode"].startswith("0x")
+    assert len(compiles) == 1
+
+
+def test_resolve_formats():
+    assert resolve_formats(["json", "abi", " layout "]) == ["abi", "layout"]
+    with pytest.raises(DasyUsageError, match="bytecod"):
+        resolve_formats(["bytecod"])
+    with pytest.raises(DasyUsageError):
+        resolve_formats([""])
+
+
+def test_timings_rejected_with_server(contract):
+    with pytest.raises(DasyUsageError, match="--timings"):
+        contract("--server", "/nonexistent.sock", "--timings")
+
+
+def test_cached_output_printed_like_a_fresh_compile(tmp_path, monkeypatch, capsys):
+    path = tmp_path / "answer.dasy"
+    path.write_text("(defvar total (public :uint256))\n" + SRC)
+    monkeypatch.setenv("DASY_CACHE_DIR", str(tmp_path / "cache"))
+    printed = []
+    for flags in (["--no-cache"], [], []):  # fresh, cold cache, warm cache
+        monkeypatch.setattr(sys, "argv", ["dasy", str(path), "-f", "layout", *flags])
+        main()
+        printed.append(capsys.readouterr().out)
+    assert printed[0] == printed[1] == printed[2]
+    assert "total" in printed[0]
+
+
+def test_reader_flag_selects_the_hy_reader(contract, capsys, monkeypatch):
+    from dasy.parser import native_reader
+
+    contract("-f", "abi")
+    native = capsys.readouterr().out
+
+    def unused(src):
+        raise AssertionError("native reader used")
+
+    monkeypatch.setattr(native_reader, "iter_forms", unused)
+    contract("-f", "abi", "--reader", "hy")
+    assert capsys.readouterr().out == native
+    assert compiler.cache_settings(reader="hy") == {"reader": "hy"}
+
+
+def test_no_cache_forwarded_to_server(contract, capsys, monkeypatch):
+    from dasy import server
+
+    payloads = []
+
+    def fake_request(payload, socket_path=None):
+        payloads.append(payload)
+        return {"ok": True, "outputs": {"bytecode": "0x00"}}
+
+    monkeypatch.setattr(server, "request", fake_request)
+    contract("--server", "-f", "bytecode")  # the fixture passes --no-cache
+    assert payloads[0]["settings"] == {"no_cache": True}
+    assert capsys.readouterr().out == "0x00\n"
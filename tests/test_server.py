@@ -0,0 +1,88 @@
+import subprocess
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from dasy.server import CompileServer, compile_request, request
+
+ROOT = Path(__file__).resolve().parent.parent
+SRC = "(defn answer [] :uint256 [:external :pure] 42)\n"
+
+
+@pytest.fixture
+def server(tmp_path):
+    srv = CompileServer(str(tmp_path / "dasy.sock"), idle_timeout=0)
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield srv
+    srv.shutdown()
+    thread.join(5)
+
+
+def test_compile_source_and_path(server, tmp_path):
+    path = tmp_path / "answer.dasy"
+    path.write_text(SRC)
+    by_src = request(
+        {"source": SRC, "formats": ["abi", "bytecode"]}, server.socket_path
+    )
+    by_path = request({"path": str(path), "formats": ["abi"]}, server.socket_path)
+    assert by_src["ok"] and by_path["ok"]
+    assert by_src["outputs"]["abi"] == by_path["outputs"]["abi"]
+    assert by_src["outputs"]["abi"][0]["name"] == "answer"
+    assert by_src["outputs"]["bytecode"].startswith("0x")
+
+
+def test_errors_are_reported(server):
+    bad = request({"source": "(defn f [] :uint256 :external nope)"}, server.socket_path)
+    assert not bad["ok"] and "nope" in bad["error"]
+    assert not request({"formats": ["abi"]}, server.socket_path)["ok"]
+    unknown = request({"source": SRC, "formats": ["nonsense"]}, server.socket_path)
+    assert unknown["type"] == "DasyUsageError"
+
+
+def test_concurrent_requests(server):
+    def _compile(i):
+        src = f"(defn f{i} [] :uint256 [:external :pure] {i})\n"
+        return request({"source": src, "formats": ["abi"]}, server.socket_path)
+
+    with ThreadPoolExecutor(8) as pool:
+        responses = list(pool.map(_compile, range(8)))
+    assert [r["outputs"]["abi"][0]["name"] for r in responses] == [
+        f"f{i}" for i in range(8)
+    ]
+
+
+def test_idle_timeout_shuts_down(tmp_path):
+    srv = CompileServer(str(tmp_path / "idle.sock"), idle_timeout=0.2)
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    assert request({"command": "ping"}, srv.socket_path)["ok"]
+    thread.join(5)
+    assert not thread.is_alive()
+    assert not (tmp_path / "idle.sock").exists()
+
+
+class RefusingCache:
+    def __getattr__(self, name):
+        raise AssertionError(f"cache.{name} used")
+
+
+def test_no_cache_setting_bypasses_the_server_cache():
+    payload = {"source": SRC, "formats": ["abi"]}
+    assert not compile_request(payload, cache=RefusingCache())["ok"]
+    payload["settings"] = {"no_cache": True}
+    assert compile_request(payload, cache=RefusingCache())["ok"]
+
+
+def test_warm_up_loads_the_builtin_macros():
+    # a fresh interpreter, where no compile has loaded them yet
+    code = (
+        "from dasy import server; from dasy.parser import macros\n"
+        "assert not macros._builtins_installed\n"
+        "server.warm_up()\n"
+        "assert macros._builtins_installed"
+    )
+    subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True)
@@ -0,0 +1,78 @@
+import hy
+import pytest
+from hy import models
+
+from dasy.macro.syntax import MacroEnv, Syntax
+from dasy.macro.syntax_rules import ELLIPSIS, SyntaxRulesMacro, match
+from dasy.parser.macros2 import install_builtin_dasy_macros
+
+
+@pytest.fixture(scope="module")
+def env():
+    env = MacroEnv()
+    install_builtin_dasy_macros(env)
+    return env
+
+
+def expand_once(env, src):
+    form = hy.read(src)
+    return env.lookup(str(form[0]))(Syntax(form, ()), env)
+
+
+def test_nested_pattern_bindings(env):
+    out = expand_once(env, "(let [a 1 b 2] (foo a b))")
+    assert out == hy.read("(do (defvar a 1) (let [b 2] (foo a b)))")
+
+
+def test_ellipsis_followed_by_suffix(env):
+    out = expand_once(env, "(set-at m k1 k2 k3 v)")
+    assert out == hy.read("(set-at (subscript m k1) k2 k3 v)")
+    assert expand_once(env, "(set-at m k v)") == hy.read("(set (subscript m k) v)")
+
+
+def test_literal_keywords_and_rule_order(env):
+    assert expand_once(env, "(cond :else 1)") == hy.read("1")
+    assert expand_once(env, "(cond a 1 :else 2)") == hy.read("(if a 1 2)")
+    assert expand_once(env, "(cond a 1 b 2 c 3)") == hy.read(
+        "(if a 1 (if b 2 (if c 3)))"
+    )
+    assert expand_once(env, "(cond a 1 :else 2 c 3)") == hy.read(
+        "(if a 1 (if :else 2 (if c 3)))"
+    )
+
+
+def test_multiple_ellipses_backtrack():
+    pat = hy.read("(a ... 0 b ...)")
+    binds = match(pat, Syntax(hy.read("(1 2 0 3 0 4)"), ()), set(), ())
+    assert [int(s.datum) for s in binds["a"]] == [1, 2, 0, 3]
+    assert [int(s.datum) for s in binds["b"]] == [4]
+    assert match(pat, Syntax(hy.read("(1 2)"), ()), set(), ()) is None
+
+
+def test_rules_indexed_by_arity():
+    sym = models.Symbol
+    macro = SyntaxRulesMacro(
+        [],
+        [
+            (hy.read("(m a)"), hy.read("one")),
+            (hy.read("(m a b)"), hy.read("two")),
+            (models.Expression([sym("m"), sym("a"), sym("r"), ELLIPSIS]), sym("many")),
+        ],
+    )
+    assert macro(Syntax(hy.read("(m 1 2)"), ()), None) == sym("two")
+    assert len(macro._candidates(hy.read("(m 1 2)"), "m")) == 2
+    assert macro(Syntax(hy.read("(m 1 2 3)"), ()), None) == sym("many")
+    with pytest.raises(Exception, match="no syntax-rules pattern matched"):
+        macro(Syntax(hy.read("(m)"), ()), None)
+    # every longer call shares one entry, whatever its head
+    for n in range(3, 200):
+        args = " ".join(["1"] * n)
+        assert macro(Syntax(hy.read(f"(m {args})"), ()), None) == sym("many")
+        macro(Syntax(hy.read(f"(alias {args})"), ()), None)
+    assert len(macro._index) <= 10
+
+
+def test_long_argument_lists(env):
+    body = " ".join(f"(f {i})" for i in range(5000))
+    out = expand_once(env, f"(when t {body})")
+    assert len(out[2]) == 5001
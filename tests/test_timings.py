@@ -0,0 +1,40 @@
+import json
+import time
+
+import dasy
+from dasy.timings import collect_timings, phase
+
+SRC = """
+(defvar owner (public :address))
+(defn __init__ [] :external (set self/owner msg/sender))
+(defn double [:uint256 x] :uint256 [:external :pure] (* x 2))
+"""
+
+
+def test_compile_records_pipeline_phases():
+    with collect_timings() as timings:
+        dasy.compile(SRC)
+    recorded = timings.as_dict()
+    for name in ("read", "expand", "ast", "typecheck", "ir", "assembly", "bytecode"):
+        assert recorded[name]["calls"] >= 1, name
+    assert list(recorded)[0] == "read"
+    assert json.loads(timings.to_json())["total"] > 0
+    assert "typecheck" in timings.format_table()
+
+
+def test_nested_phases_are_exclusive():
+    with collect_timings() as timings:
+        with phase("ast"):
+            with phase("hy_macros"):
+                time.sleep(0.02)
+    assert timings.calls == {"ast": 1, "hy_macros": 1}
+    assert timings.seconds["hy_macros"] >= 0.02
+    assert timings.seconds["ast"] < 0.01
+
+
+def test_no_collector_records_nothing():
+    with collect_timings() as timings:
+        pass
+    with phase("read"):
+        pass
+    assert timings.as_dict() == {}
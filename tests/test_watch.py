@@ -0,0 +1,156 @@
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+from dasy.watch import (
+    DependencyGraph,
+    InotifyFileWatcher,
+    PollingFileWatcher,
+    ProjectWatcher,
+    wait_for_changes,
+)
+
+USES_HEADER = (
+    '(include! "../lib/header.dasy")\n'
+    "(defn limit [] :uint256 [:external :pure] LIMIT)\n"
+)
+STANDALONE = "(defn answer [] :uint256 [:external :pure] 42)\n"
+
+
+def test_dependency_graph():
+    graph = DependencyGraph()
+    a, b, header, other = (Path(f"/p/{n}") for n in ("a", "b", "header", "other"))
+    graph.set_dependencies(a, {header})
+    graph.set_dependencies(b, set())
+    assert graph.affected({header}) == {a}
+    assert graph.affected({b, other}) == {b}
+    assert graph.files() == {a, b, header}
+    graph.set_dependencies(a, {other})
+    assert graph.affected({header}) == set()
+    graph.remove(a)
+    assert graph.files() == {b}
+
+
+def test_polling_watcher_reports_changed_files(tmp_path):
+    path = tmp_path / "a.dasy"
+    path.write_text("1")
+    watcher = PollingFileWatcher(interval=0.01)
+    watcher.watch({path})
+    assert watcher.changes(0) == set()
+    path.write_text("22")
+    assert watcher.changes(1) == {path}
+    assert watcher.changes(0) == set()
+
+
+class FakeWatcher:
+    """Hands out scripted batches of changes."""
+
+    def __init__(self, batches=()):
+        self.batches = list(batches)
+        self.watched = set()
+
+    def watch(self, paths):
+        self.watched = set(paths)
+
+    def changes(self, timeout=None):
+        return self.batches.pop(0) if self.batches else set()
+
+
+def test_wait_for_changes_debounces_bursts():
+    a, b = Path("/p/a"), Path("/p/b")
+    assert wait_for_changes(FakeWatcher([{a}, {b}, {a}]), 0) == {a, b}
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / "lib").mkdir()
+    header = tmp_path / "lib" / "header.dasy"
+    header.write_text("(defconst LIMIT 10)\n")
+    contracts = tmp_path / "contracts"
+    contracts.mkdir()
+    (contracts / "uses_header.dasy").write_text(USES_HEADER)
+    (contracts / "standalone.dasy").write_text(STANDALONE)
+    watcher = FakeWatcher()
+    built = []
+    project = ProjectWatcher(
+        [str(contracts)],
+        str(tmp_path / "out"),
+        formats=["abi", "bytecode"],
+        watcher=watcher,
+        report=lambda result: built.append(Path(result.path).name),
+    )
+    project.start()
+    assert sorted(built) == ["standalone.dasy", "uses_header.dasy"]
+    assert header in watcher.watched
+    built.clear()
+    return project, built, header, contracts
+
+
+def test_header_change_rebuilds_only_dependents(project):
+    project, built, header, contracts = project
+    out = project.out_dir / "uses_header.dasy.json"
+    before = json.loads(out.read_text())["bytecode"]
+    header.write_text("(defconst LIMIT 20)\n")
+    results = project.handle({header})
+    assert built == ["uses_header.dasy"] and results[0].ok
+    assert json.loads(out.read_text())["bytecode"] != before
+
+
+def test_new_and_broken_sources(project):
+    project, built, header, contracts = project
+    (contracts / "added.dasy").write_text(STANDALONE)
+    project.handle({contracts})
+    assert built == ["added.dasy"]
+
+    header.write_text("(defconst LIMIT\n")
+    assert not project.handle({header})[0].ok
+    # still watched while broken, so fixing the header rebuilds it
+    header.write_text("(defconst LIMIT 30)\n")
+    assert project.handle({header})[0].ok
+    assert built == ["added.dasy", "uses_header.dasy", "uses_header.dasy"]
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify")
+def test_inotify_watcher_sees_writes_and_renames(tmp_path):
+    path = tmp_path / "a.dasy"
+    path.write_text("1")
+    watcher = InotifyFileWatcher()
+    try:
+        watcher.watch({path, tmp_path})
+        assert watcher.changes(0) == set()
+        path.write_text("2")
+        assert path in watcher.changes(1)
+        watcher.changes(0.05)
+        # editors often write a temporary file and rename it into place
+        (tmp_path / "a.tmp").write_text("3")
+        os.replace(tmp_path / "a.tmp", path)
+        assert watcher.changes(1) >= {path, tmp_path}
+    finally:
+        watcher.close()
+
+
+def test_named_file_deleted_and_recreated(tmp_path):
+    path = tmp_path / "a.dasy"
+    path.write_text(STANDALONE)
+    watcher = FakeWatcher()
+    reported = []
+    project = ProjectWatcher(
+        [str(path)],
+        str(tmp_path / "out"),
+        formats=["abi"],
+        watcher=watcher,
+        report=reported.append,
+    )
+    project.start()
+
+    path.unlink()
+    assert project.handle({path}) == []
+    assert [(r.ok, r.error) for r in reported[1:]] == [(False, "source removed")]
+    assert path in watcher.watched and not project.sources
+
+    path.write_text(STANDALONE)
+    results = project.handle({path})
+    assert [Path(r.path) for r in results] == [path] and results[0].ok